@@ -3,6 +3,7 @@ local constants = require("overseer.constants")
 local log = require("overseer.log")
 local task_list = require("overseer.task_list")
 local template = require("overseer.template")
+local trace = require("overseer.trace")
 local window = require("overseer.window")
 
 local M = {}
@@ -74,6 +75,33 @@ M._task_action = function(params)
   M.task_action()
 end
 
+M._profile = function(params)
+  local subcmd, filename = params.fargs[1], params.fargs[2]
+  if subcmd == "start" then
+    trace.start()
+    vim.notify("Overseer trace started")
+  elseif subcmd == "stop" then
+    trace.stop()
+    vim.notify(string.format("Overseer trace stopped (%d events)", trace.num_events()))
+  elseif subcmd == "save" then
+    if trace.num_events() == 0 then
+      vim.notify("No trace events recorded. Run :OverseerProfile start first", vim.log.levels.WARN)
+      return
+    end
+    if not filename then
+      filename = vim.fs.joinpath(
+        vim.fn.stdpath("log"),
+        string.format("overseer_trace_%s.json", os.date("%Y%m%d_%H%M%S"))
+      )
+    end
+    filename = vim.fn.fnamemodify(filename, ":p")
+    trace.save(filename)
+    vim.notify(string.format("Overseer trace saved to %s", filename))
+  else
+    log.error("Unknown OverseerProfile subcommand '%s'. Expected start, stop, or save", subcmd)
+  end
+end
+
 ---@return overseer.SearchParams
 local function get_search_params()
   -- If we have a file open, use its parent dir as the search dir.
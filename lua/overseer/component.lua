@@ -1,4 +1,5 @@
 local config = require("overseer.config")
+local files = require("overseer.files")
 local form_utils = require("overseer.form.utils")
 local log = require("overseer.log")
 local util = require("overseer.util")
@@ -44,8 +45,23 @@ local M = {}
 ---@field serializable boolean
 ---@field editable boolean
 
+---Lightweight metadata about a component that can be read from the manifest without loading it
+---@class (exact) overseer.ComponentInfo
+---@field name string
+---@field desc? string
+---@field params table<string, table>
+---@field editable boolean
+---@field serializable boolean
+---@field deprecated_message? string
+
 local registry = {}
 
+-- This must match the version in scripts/generate.py
+local MANIFEST_VERSION = 2
+local MANIFEST_FILE = "lua/overseer/component/manifest.json"
+---@type nil|table<string, overseer.ComponentInfo>
+local manifest
+
 ---@param name string
 ---@param opts overseer.ComponentDefinition
 ---@return overseer.Component
@@ -143,24 +159,110 @@ M.stringify_alias = function(name)
   return table.concat(strings, ", ")
 end
 
+---Components in subdirectories (e.g. orchestrator.on_status_broadcast) are added internally by
+---other parts of overseer, so they are not listed for users
+---@param name string
+---@return boolean
+local function is_nested(name)
+  return name:find(".", 1, true) ~= nil
+end
+
+---@return table<string, string> map of component name to the file that require() will load
+local function get_component_files()
+  local ret = {}
+  for _, pattern in ipairs({ "lua/overseer/component/*.lua", "lua/overseer/component/*/*.lua" }) do
+    for _, abspath in ipairs(vim.api.nvim_get_runtime_file(pattern, true)) do
+      local module_name = abspath:match("^.*overseer/component/(.*)%.lua$"):gsub("/", ".")
+      if not ret[module_name] then
+        ret[module_name] = abspath
+      end
+    end
+  end
+  return ret
+end
+
 local preloaded = false
 local function preload_components()
   if preloaded then
     return
   end
   preloaded = true
-  local comp_files = vim.api.nvim_get_runtime_file("lua/overseer/component/*.lua", true)
-  for _, abspath in ipairs(comp_files) do
-    local module_name = abspath:match("^.*overseer/component/(.*)%.lua$")
+  for module_name in pairs(get_component_files()) do
     load(module_name)
   end
 end
 
+---Read the component manifest generated by scripts/generate.py
+---An entry is only used if its source file is the one under the manifest's directory, it has the
+---size recorded in the manifest, and it was not modified after the manifest. All other components
+---must be loaded to get their info.
+---@return table<string, overseer.ComponentInfo>
+local function load_manifest()
+  if manifest then
+    return manifest
+  end
+  manifest = {}
+  local manifest_file = vim.api.nvim_get_runtime_file(MANIFEST_FILE, false)[1]
+  if not manifest_file then
+    return manifest
+  end
+  local ok, data = pcall(
+    vim.json.decode,
+    files.read_file(manifest_file) or "",
+    { luanil = { object = true, array = true } }
+  )
+  if not ok or type(data) ~= "table" or data.version ~= MANIFEST_VERSION then
+    log.warn("Ignoring invalid component manifest %s", manifest_file)
+    return manifest
+  end
+  local manifest_dir = vim.fs.dirname(manifest_file)
+  local manifest_stat = vim.uv.fs_stat(manifest_file)
+  if not manifest_stat then
+    return manifest
+  end
+  for name, abspath in pairs(get_component_files()) do
+    local entry = data.components[name]
+    local manifest_path = vim.fs.joinpath(manifest_dir, name:gsub("%.", "/") .. ".lua")
+    if entry and vim.fs.normalize(abspath) == vim.fs.normalize(manifest_path) then
+      local stat = vim.uv.fs_stat(abspath)
+      if stat and stat.size == entry.size and stat.mtime.sec <= manifest_stat.mtime.sec then
+        manifest[name] = {
+          name = name,
+          desc = entry.desc,
+          params = entry.params or {},
+          editable = entry.editable,
+          serializable = entry.serializable,
+          deprecated_message = entry.deprecated_message,
+        }
+      else
+        log.debug("Component manifest entry for %s is stale", name)
+      end
+    end
+  end
+  return manifest
+end
+
+---Get the metadata for a component, using the manifest to avoid loading the module if possible
+---@param name string
+---@return overseer.ComponentInfo?
+M.get_info = function(name)
+  return registry[name] or load_manifest()[name] or M.get(name)
+end
+
 ---@return string[]
 M.list_editable = function()
   local ret = {}
-  preload_components()
-  for k, v in pairs(registry) do
+  local infos = vim.tbl_extend("keep", {}, registry)
+  local manifest_infos = load_manifest()
+  for name in pairs(get_component_files()) do
+    if not infos[name] and not is_nested(name) then
+      if not manifest_infos[name] then
+        load(name)
+      end
+      infos[name] = manifest_infos[name] or registry[name]
+    end
+  end
+  for k, v in pairs(infos) do
     if v.editable and not v.deprecated_message then
       table.insert(ret, k)
     end
@@ -328,6 +430,23 @@ local function simplify_params(params)
   return ret
 end
 
+---Used to generate the component manifest
+---@private
+M.get_manifest_entries = function()
+  local ret = {}
+  preload_components()
+  for name, defn in pairs(registry) do
+    ret[name] = {
+      desc = defn.desc,
+      params = simplify_params(defn.params),
+      editable = defn.editable,
+      serializable = defn.serializable,
+      deprecated_message = defn.deprecated_message,
+    }
+  end
+  return ret
+end
+
 ---Used for documentation generation
 ---@private
 M.get_all_descriptions = function()
@@ -337,7 +456,7 @@ M.get_all_descriptions = function()
   table.sort(names)
   for _, name in ipairs(names) do
     local defn = registry[name]
-    if not defn.deprecated_message then
+    if not defn.deprecated_message and not is_nested(name) then
       table.insert(ret, {
         name = name,
         desc = defn.desc,
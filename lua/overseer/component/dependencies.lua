@@ -1,5 +1,6 @@
 local constants = require("overseer.constants")
 local log = require("overseer.log")
+local scheduler = require("overseer.scheduler")
 local task_list = require("overseer.task_list")
 local util = require("overseer.util")
 local STATUS = constants.STATUS
@@ -56,7 +57,7 @@ return {
                 task_id = task.id,
               })
               new_task.ephemeral = true
-              new_task:start()
+              scheduler.start(new_task)
             end)
             started_any = true
             if params.sequential then
@@ -64,7 +65,7 @@ return {
             end
           else
             if dep_task.status == STATUS.PENDING then
-              dep_task:start()
+              scheduler.start(dep_task)
               started_any = true
               if params.sequential then
                 return false
@@ -78,6 +79,7 @@ return {
       end,
       on_reset = function(self, task)
         for _, task_id in pairs(self.task_lookup) do
+          scheduler.cancel(task_id)
           local dep_task = task_list.get(task_id)
           if dep_task then
             dep_task:reset()
@@ -86,6 +88,7 @@ return {
       end,
       on_dispose = function(self, task)
         for _, task_id in pairs(self.task_lookup) do
+          scheduler.cancel(task_id)
           local dep_task = task_list.get(task_id)
           if dep_task then
             dep_task:stop()
@@ -94,7 +97,7 @@ return {
         end
       end,
       on_dependency_complete = function(self, task)
-        task:start()
+        scheduler.start(task)
       end,
     }
   end,
@@ -1,4 +1,5 @@
-local neotest = require("neotest")
+-- neotest is required lazily so that the component info can be read (e.g. to generate the component
+-- manifest) when neotest is not installed
 
 ---@type overseer.ComponentFileDefinition
 local comp = {
@@ -11,7 +12,7 @@ local comp = {
       on_pre_start = function(self, task)
         if has_reset then
           vim.schedule(function()
-            neotest.overseer.rerun_task_group(task.metadata.neotest_group_id)
+            require("neotest").overseer.rerun_task_group(task.metadata.neotest_group_id)
           end)
           return false
         end
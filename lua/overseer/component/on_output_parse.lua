@@ -2,6 +2,7 @@ local files = require("overseer.files")
 local log = require("overseer.log")
 local parselib = require("overseer.parselib")
 local problem_matcher = require("overseer.vscode.problem_matcher")
+local trace = require("overseer.trace")
 
 ---@param cwd string
 ---@param result table
@@ -99,9 +100,11 @@ return {
         version = parser.result_version
       end,
       on_output_lines = function(self, task, lines)
+        local span = trace.enabled and trace.begin("parse", "parser", { lines = #lines })
         for _, line in ipairs(lines) do
           parser:parse(line)
         end
+        trace.finish(span)
         if version ~= parser.result_version then
           task:set_result(
             fix_relative_filenames(params.relative_file_root or task.cwd, parser:get_result())
@@ -1,6 +1,8 @@
-local log = require("overseer.log")
 local util = require("overseer.util")
 
+-- Number of lines to read from the output store at a time when building the quickfix list
+local STORE_CHUNK_LINES = 10000
+
 ---@param winid integer
 ---@return boolean
 local function is_cursor_at_bottom(winid)
@@ -13,6 +15,12 @@ local function is_cursor_at_bottom(winid)
   return false
 end
 
+---@param item table
+---@return boolean
+local function is_valid(item)
+  return item.valid == 1
+end
+
 ---@param self table The component
 ---@param height nil|integer
 ---@param focus boolean
@@ -101,14 +109,159 @@ return {
       type = "boolean",
       default = false,
     },
+    update_interval = {
+      desc = "When tailing, the minimum time (ms) between updates to the quickfix",
+      type = "integer",
+      default = 100,
+      validate = function(v)
+        return v >= 0
+      end,
+    },
   },
   constructor = function(params)
+    ---Parse the collected output and add it to the quickfix list
+    ---@param self table The component
+    ---@param task overseer.Task
+    local function flush(self, task)
+      local lines = self.pending_lines
+      if vim.tbl_isempty(lines) then
+        return
+      end
+      self.pending_lines = {}
+
+      local cur_qf
+      if self.qf_id ~= 0 then
+        cur_qf = vim.fn.getqflist({ id = self.qf_id, winid = 0 })
+        if cur_qf.id == 0 then
+          -- The list was pushed off of the quickfix stack
+          self.qf_id = 0
+        end
+      end
+      local action = "a"
+      if self.qf_id == 0 then
+        cur_qf = vim.fn.getqflist({ context = 0, winid = 0 })
+        -- qf_id is 0 after a restart. If we're restarting; replace the contents of the list.
+        action = cur_qf.context == task.id and "r" or " "
+      end
+      local scroll_buffer = action ~= "a" or is_cursor_at_bottom(cur_qf.winid)
+
+      local what = {
+        title = task.name,
+        context = task.id,
+        efm = params.errorformat,
+      }
+      if action == "a" then
+        -- Only pass the ID if appending to existing list
+        what.id = self.qf_id
+      end
+      local has_match = false
+      -- Run this in the context of the task cwd so that relative filenames are parsed correctly
+      util.run_in_cwd(params.relative_file_root or task.cwd, function()
+        if params.items_only then
+          local items = vim.fn.getqflist({ lines = lines, efm = params.errorformat }).items
+          what.items = vim.tbl_filter(is_valid, items)
+          has_match = not vim.tbl_isempty(what.items)
+        else
+          -- Passing the raw lines instead of parsed items lets vim continue a multi-line
+          -- errorformat entry that was started by the previous batch
+          what.lines = lines
+          if params.open_on_match and not self.qf_opened then
+            local items = vim.fn.getqflist({ lines = lines, efm = params.errorformat }).items
+            has_match = not vim.tbl_isempty(vim.tbl_filter(is_valid, items))
+          end
+        end
+        vim.fn.setqflist({}, action, what)
+      end)
+      -- Store the quickfix list ID if we don't have one yet
+      if self.qf_id == 0 then
+        self.qf_id = vim.fn.getqflist({ id = 0 }).id
+      end
+
+      local winid = cur_qf.winid
+      if params.open or (has_match and params.open_on_match) then
+        if copen(self, params.open_height, params.focus) then
+          scroll_buffer = true
+          winid = vim.fn.getqflist({ id = self.qf_id, winid = 0 }).winid
+        end
+      end
+      if scroll_buffer and winid ~= 0 and vim.api.nvim_win_is_valid(winid) then
+        local bufnr = vim.api.nvim_win_get_buf(winid)
+        local num_lines = vim.api.nvim_buf_line_count(bufnr)
+        vim.api.nvim_win_set_cursor(winid, { num_lines, 0 })
+      end
+    end
+
+    ---Replace the quickfix list with the complete output of the task. The output is streamed from
+    ---the output store in chunks so that all of it is never in memory at once.
+    ---@param self table The component
+    ---@param task overseer.Task
+    ---@return boolean has_match True if the errorformat matched any lines
+    local function set_from_store(self, task)
+      local prev_context = vim.fn.getqflist({ context = 0 }).context
+      local action = " "
+      -- If we have a quickfix ID, or if the current QF has a matching context, replace the list
+      -- instead of creating a new one
+      if prev_context == task.id or self.qf_id ~= 0 then
+        action = "r"
+      end
+      local what = {
+        title = task.name,
+        context = task.id,
+        efm = params.errorformat,
+      }
+      if self.qf_id ~= 0 then
+        what.id = self.qf_id
+      end
+      -- Checking for matches costs an extra parse, so only do it if we need to know
+      local need_match = params.close or params.open_on_match
+      local has_match = false
+      ---@param lines string[]
+      local function add_lines(lines)
+        if params.items_only then
+          local items = vim.fn.getqflist({ lines = lines, efm = params.errorformat }).items
+          what.items = vim.tbl_filter(is_valid, items)
+          has_match = has_match or not vim.tbl_isempty(what.items)
+        else
+          -- Passing the raw lines lets vim continue a multi-line errorformat entry across chunks
+          what.lines = lines
+          if need_match and not has_match then
+            local items = vim.fn.getqflist({ lines = lines, efm = params.errorformat }).items
+            has_match = not vim.tbl_isempty(vim.tbl_filter(is_valid, items))
+          end
+        end
+        vim.fn.setqflist({}, action, what)
+        if self.qf_id == 0 then
+          self.qf_id = vim.fn.getqflist({ id = 0 }).id
+        end
+        -- Subsequent chunks are appended to the list we just created
+        action = "a"
+        what = { id = self.qf_id, efm = params.errorformat }
+      end
+      -- Run this in the context of the task cwd so that relative filenames are parsed correctly
+      util.run_in_cwd(params.relative_file_root or task.cwd, function()
+        local empty = true
+        -- Read from the output store instead of the buffer so that we see all of the output, even
+        -- if it exceeded the terminal scrollback
+        for lines in task:get_output_store():iter_chunks(STORE_CHUNK_LINES) do
+          empty = false
+          add_lines(lines)
+        end
+        if empty then
+          add_lines({})
+        end
+      end)
+      return has_match
+    end
+
     local comp = {
       qf_id = 0,
       qf_opened = false,
+      pending_lines = {},
+      flush_pending = false,
       on_reset = function(self, task)
         self.qf_id = 0
         self.qf_opened = false
+        self.pending_lines = {}
       end,
       on_exit = function(self, _, code)
         local open = params.open_on_exit == "always"
@@ -118,65 +271,26 @@ return {
         end
       end,
       on_pre_result = function(self, task)
-        local bufnr = task:get_bufnr()
-        local lines = vim.api.nvim_buf_get_lines(bufnr, 0, -1, true)
-
-        local exceeds_scrollback = vim.bo[bufnr].buftype == "terminal"
-          and #lines >= vim.bo[bufnr].scrollback
-        if exceeds_scrollback then
-          if params.tail then
-            -- If we have been tailing the output, we should just keep the quickfix as it is
-            -- because we've exceeded the scrollback limit and will lose the earlier data.
-            log.warn(
-              "Task(%d) '%s' exceeded the output scrollback limit (%d lines). Keeping tail output instead of doing a large replace operation upon completion.",
-              task.id,
-              task.name,
-              vim.bo[bufnr].scrollback
-            )
-            return
-          else
-            log.warn(
-              "Task(%d) '%s' exceeded the output scrollback limit (%d lines). Only the last lines will be processed for the quickfix.",
-              task.id,
-              task.name,
-              vim.bo[bufnr].scrollback
-            )
-          end
-        end
-
-        local prev_context = vim.fn.getqflist({ context = 0 }).context
-        local action = " "
-        -- If we have a quickfix ID, or if the current QF has a matching context, replace the list
-        -- instead of creating a new one
-        if prev_context == task.id or self.qf_id ~= 0 then
-          action = "r"
-        end
         local items
-        -- Run this in the context of the task cwd so that relative filenames are parsed correctly
-        util.run_in_cwd(params.relative_file_root or task.cwd, function()
-          items = vim.fn.getqflist({
-            lines = lines,
-            efm = params.errorformat,
-          }).items
-        end)
-        local valid_items = vim.tbl_filter(function(item)
-          return item.valid == 1
-        end, items)
-        if params.items_only then
-          items = valid_items
+        if params.tail then
+          flush(self, task)
+          if self.qf_id ~= 0 then
+            -- The list has been kept up to date with the output, so there is nothing to parse
+            local cur_qf = vim.fn.getqflist({ id = self.qf_id, items = 0 })
+            if cur_qf.id ~= 0 then
+              items = cur_qf.items
+            end
+          end
         end
 
-        local what = {
-          title = task.name,
-          context = task.id,
-          items = items,
-        }
-        if self.qf_id ~= 0 then
-          what.id = self.qf_id
+        local has_match
+        if items then
+          has_match = not vim.tbl_isempty(vim.tbl_filter(is_valid, items))
+        else
+          has_match = set_from_store(self, task)
         end
-        vim.fn.setqflist({}, action, what)
 
-        if vim.tbl_isempty(valid_items) then
+        if not has_match then
           if params.close then
             vim.cmd("cclose")
           elseif params.open then
@@ -188,7 +302,7 @@ return {
 
         if params.set_diagnostics then
           return {
-            diagnostics = items,
+            diagnostics = items or vim.fn.getqflist({ id = self.qf_id, items = 0 }).items,
           }
         end
       end,
@@ -196,50 +310,16 @@ return {
 
     if params.tail then
       comp.on_output_lines = function(self, task, lines)
-        local cur_qf = vim.fn.getqflist({ context = 0, winid = 0, id = self.qf_id })
-        local action = " "
-        if cur_qf.context == task.id then
-          -- qf_id is 0 after a restart. If we're restarting; replace the contents of the list.
-          -- Otherwise append.
-          action = self.qf_id == 0 and "r" or "a"
-        end
-        local scroll_buffer = action ~= "a" or is_cursor_at_bottom(cur_qf.winid)
-        -- Run this in the context of the task cwd so that relative filenames are parsed correctly
-        local items
-        util.run_in_cwd(params.relative_file_root or task.cwd, function()
-          items = vim.fn.getqflist({
-            lines = lines,
-            efm = params.errorformat,
-          }).items
-        end)
-        local valid_items = vim.tbl_filter(function(item)
-          return item.valid == 1
-        end, items)
-        if params.items_only then
-          items = valid_items
-        end
-        if params.open or (not vim.tbl_isempty(valid_items) and params.open_on_match) then
-          scroll_buffer = copen(self, params.open_height, params.focus) or scroll_buffer
-          cur_qf = vim.fn.getqflist({ context = 0, winid = 0, id = self.qf_id })
-        end
-        local what = {
-          title = task.name,
-          context = task.id,
-          items = items,
-        }
-        if action == "a" then
-          -- Only pass the ID if appending to existing list
-          what.id = self.qf_id
-        end
-        vim.fn.setqflist({}, action, what)
-        -- Store the quickfix list ID if we don't have one yet
-        if self.qf_id == 0 then
-          self.qf_id = vim.fn.getqflist({ id = 0 }).id
-        end
-        if scroll_buffer and cur_qf.winid ~= 0 and vim.api.nvim_win_is_valid(cur_qf.winid) then
-          local bufnr = vim.api.nvim_win_get_buf(cur_qf.winid)
-          local num_lines = vim.api.nvim_buf_line_count(bufnr)
-          vim.api.nvim_win_set_cursor(cur_qf.winid, { num_lines, 0 })
+        vim.list_extend(self.pending_lines, lines)
+        -- Throttle updates so that chatty tasks don't rebuild the quickfix window for every batch
+        if not self.flush_pending then
+          self.flush_pending = true
+          vim.defer_fn(function()
+            self.flush_pending = false
+            if not task:is_disposed() then
+              flush(self, task)
+            end
+          end, params.update_interval)
         end
       end
     end
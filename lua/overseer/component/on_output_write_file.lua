@@ -1,3 +1,5 @@
+local file_writer = require("overseer.file_writer")
+
 ---@type overseer.ComponentFileDefinition
 return {
   desc = "Write task output to a file",
@@ -5,33 +7,55 @@ return {
     filename = {
       desc = "Name of file to write output to",
     },
+    max_size = {
+      desc = "Rotate the file once it grows past this many bytes",
+      long_desc = "The current file is renamed to <filename>.1, the previous <filename>.1 to <filename>.2, and so on.",
+      type = "integer",
+      optional = true,
+      validate = function(v)
+        return v > 0
+      end,
+    },
+    max_files = {
+      desc = "Number of rotated files to keep",
+      type = "integer",
+      default = 3,
+      validate = function(v)
+        return v >= 0
+      end,
+    },
+    compress = {
+      desc = "Compress rotated files with gzip",
+      type = "boolean",
+      default = false,
+    },
   },
   constructor = function(params)
     return {
       on_init = function(self)
         local pardir = vim.fs.dirname(params.filename)
         vim.fn.mkdir(pardir, "p")
-        self.output_file = assert(io.open(params.filename, "w"))
+        self.writer = file_writer.new(params.filename, {
+          max_size = params.max_size,
+          max_files = params.max_files,
+          compress = params.compress,
+        })
       end,
       on_reset = function(self)
-        self.output_file:close()
-        self.output_file = assert(io.open(params.filename, "w"))
+        self.writer:truncate()
       end,
       on_output = function(self, task, data)
-        for i, chunk in ipairs(data) do
-          if i == 0 and chunk == "" then
-            self.output_file:write("\n")
-          elseif i > 0 then
-            self.output_file:write("\n")
-          end
-          self.output_file:write(chunk)
+        if type(data) == "table" then
+          -- jobstart() output is a list of lines where the first item continues the previous line
+          data = table.concat(data, "\n")
         end
+        self.writer:write(data)
       end,
       on_complete = function(self)
-        self.output_file:flush()
+        self.writer:flush()
       end,
       on_dispose = function(self)
-        self.output_file:close()
+        self.writer:close()
       end,
     }
   end,
@@ -1,5 +1,5 @@
+local file_watcher = require("overseer.file_watcher")
 local files = require("overseer.files")
-local log = require("overseer.log")
 
 ---@type overseer.ComponentFileDefinition
 return {
@@ -39,18 +39,6 @@ return {
   constructor = function(opts)
     vim.validate("delay", opts.delay, "number")
 
-    local function is_watching_file(path)
-      if not opts.paths then
-        return true
-      end
-      for _, watch_path in ipairs(opts.paths) do
-        if files.is_subpath(watch_path, path) then
-          return true
-        end
-      end
-      return false
-    end
-
     local restart_after_complete = false
     local restarting = false
     local version = 1
@@ -73,43 +61,14 @@ return {
     end
 
     return {
-      autocmd_id = nil,
-      fs_events = {},
+      watch_id = nil,
       on_init = function(self, task)
         -- This means that the task cannot be auto-disposed while this component
         -- is attached
         task:inc_reference()
-        if opts.mode == "autocmd" then
-          self.autocmd_id = vim.api.nvim_create_autocmd("BufWritePost", {
-            pattern = "*",
-            desc = string.format("Restart task %s on save", task.name),
-            callback = function(params)
-              -- Only care about normal files
-              if vim.bo[params.buf].buftype == "" then
-                local bufname = vim.api.nvim_buf_get_name(params.buf)
-                if is_watching_file(bufname) then
-                  trigger_restart(task)
-                end
-              end
-            end,
-          })
-        elseif opts.mode == "uv" then
-          for _, path in ipairs(opts.paths) do
-            local fs_event = assert(vim.uv.new_fs_event())
-            fs_event:start(
-              path,
-              { recursive = true },
-              vim.schedule_wrap(function(err, filename, events)
-                if err then
-                  log.warn("Overseer[restart_on_save] watch error: %s", err)
-                else
-                  trigger_restart(task)
-                end
-              end)
-            )
-            table.insert(self.fs_events, fs_event)
-          end
-        end
+        self.watch_id = file_watcher.watch({ paths = opts.paths, mode = opts.mode }, function()
+          trigger_restart(task)
+        end)
       end,
       on_reset = function(self, task)
         -- Bump the version to invalidate any pending restarts
@@ -126,14 +85,10 @@ return {
         -- Bump the version to invalidate any pending restarts
         version = version + 1
         task:dec_reference()
-        if self.autocmd_id then
-          vim.api.nvim_del_autocmd(self.autocmd_id)
-          self.autocmd_id = nil
-        end
-        for _, fs_event in ipairs(self.fs_events) do
-          fs_event:stop()
+        if self.watch_id then
+          file_watcher.unwatch(self.watch_id)
+          self.watch_id = nil
         end
-        self.fs_events = {}
       end,
     }
   end,
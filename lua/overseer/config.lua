@@ -7,6 +7,15 @@ local default_config = {
     use_terminal = true,
     -- If true, don't clear the buffer when a task restarts
     preserve_output = false,
+    -- Output is collected and written to the buffer in batches. This is the maximum time (ms) that
+    -- output will be held before it is flushed.
+    batch_ms = 16,
+    -- Flush collected output immediately once it reaches this many bytes
+    batch_bytes = 65536,
+    -- Number of lines of output to keep in memory for each task. Older output is moved to a
+    -- temporary file. Output buffers that are not terminals are also trimmed to this many lines,
+    -- and older lines are loaded back in when the cursor reaches the top of the buffer.
+    max_memory_lines = 10000,
   },
   -- Configure the task list
   task_list = {
@@ -120,7 +129,16 @@ local default_config = {
   -- Cache template provider results if the provider takes longer than this to run.
   -- Set to 0 to disable caching.
   template_cache_threshold_ms = 200,
+  -- Also store cached template provider results on disk so they can be reused after a restart.
+  -- Only used by providers that support it (e.g. make and just).
+  template_cache_persist = false,
+  -- Maximum number of tasks started by orchestrator tasks and the dependencies component that can
+  -- run at the same time. Set to 0 for no limit.
+  max_parallel = 0,
   log_level = vim.log.levels.WARN,
+  -- Record how much time each component spends handling each task event.
+  -- See :help overseer.Task:get_component_timings
+  profile_components = false,
   -- Overseer can wrap any call to vim.system and vim.fn.jobstart as a task.
   experimental_wrap_builtins = {
     enabled = false,
@@ -132,6 +150,13 @@ local default_config = {
 
 local M = {}
 
+---The task_list uses this to detect when tasks are sorted with the default sort function
+---@private
+---@return fun(a: overseer.Task, b: overseer.Task): boolean
+M.get_default_task_list_sort = function()
+  return default_config.task_list.sort
+end
+
 local has_setup = false
 ---@param opts? overseer.SetupOpts
 M.setup = function(opts)
@@ -172,6 +197,7 @@ end
 ---@field setup fun(opts: overseer.SetupOpts)
 ---@field dap boolean
 ---@field log_level integer
+---@field profile_components boolean Record how much time each component spends handling each task event
 ---@field experimental_wrap_builtins overseer.ConfigWrapBuiltins
 ---@field output overseer.ConfigOutput
 ---@field task_list overseer.ConfigTaskList
@@ -183,10 +209,13 @@ end
 ---@field disable_template_modules string[]
 ---@field template_timeout_ms? integer For template providers, how long to wait (in ms) before timing out. Set to 0 to disable timeouts.
 ---@field template_cache_threshold_ms? integer Cache template provider results if the provider takes longer than this to run. Time is in ms. Set to 0 to disable caching.
+---@field template_cache_persist boolean Store cached template provider results on disk so they can be reused after a restart.
+---@field max_parallel integer Maximum number of tasks started by orchestrator tasks and the dependencies component that can run at the same time. Set to 0 for no limit.
 
 ---@class (exact) overseer.SetupOpts
 ---@field dap? boolean Patch nvim-dap to support preLaunchTask and postDebugTask
 ---@field log_level? integer Log level
+---@field profile_components? boolean Record how much time each component spends handling each task event
 ---@field experimental_wrap_builtins? overseer.SetupConfigWrapBuiltins
 ---@field output? overseer.SetupConfigOutput
 ---@field task_list? overseer.SetupConfigTaskList
@@ -198,6 +227,8 @@ end
 ---@field disable_template_modules? string[] List of module names or lua patterns that match modules
 ---@field template_timeout_ms? integer For template providers, how long to wait (in ms) before timing out. Set to 0 to disable timeouts.
 ---@field template_cache_threshold_ms? integer Cache template provider results if the provider takes longer than this to run. Time is in ms. Set to 0 to disable caching.
+---@field template_cache_persist? boolean Store cached template provider results on disk so they can be reused after a restart.
+---@field max_parallel? integer Maximum number of tasks started by orchestrator tasks and the dependencies component that can run at the same time. Set to 0 for no limit.
 
 ---@class (exact) overseer.ConfigWrapBuiltins
 ---@field enabled boolean overseer will hook vim.system and vim.fn.jobstart and display those as tasks
@@ -210,10 +241,16 @@ end
 ---@class (exact) overseer.ConfigOutput
 ---@field preserve_output? boolean
 ---@field use_terminal? boolean
+---@field batch_ms integer
+---@field batch_bytes integer
+---@field max_memory_lines integer
 
 ---@class (exact) overseer.SetupConfigOutput
 ---@field preserve_output? boolean Use a terminal buffer to display output. If false, a normal buffer is used.
 ---@field use_terminal? boolean If true, don't clear the buffer when a task restarts
+---@field batch_ms? integer Maximum time (ms) that output is collected before it is flushed to the buffer
+---@field batch_bytes? integer Flush collected output immediately once it reaches this many bytes
+---@field max_memory_lines? integer Number of lines of output to keep in memory for each task. Older output is moved to a temporary file.
 
 ---@class (exact) overseer.ConfigTaskList : overseer.LayoutOpts
 ---@field direction "left"|"right"|"bottom"
@@ -0,0 +1,150 @@
+-- Memoized directory listings for finding project files (Makefile, package.json, etc) by searching
+-- upward from a directory. All of the template providers search upward from the same directory, so
+-- sharing the listings turns dozens of stat calls per ancestor into a single scandir.
+local M = {}
+
+local case_insensitive = vim.fn.has("win32") == 1 or vim.fn.has("mac") == 1
+
+---@class (exact) overseer.DirListing
+---@field entries table<string, string> map of entry name to type
+---@field folded table<string, string> map of lowercase entry name to original name
+
+---@type table<string, overseer.DirListing>
+local listings = {}
+
+---@type nil|integer
+local augroup
+
+local function create_autocmds()
+  augroup = vim.api.nvim_create_augroup("OverseerDirIndex", {})
+  vim.api.nvim_create_autocmd({ "DirChanged", "FocusGained", "ShellCmdPost", "TermLeave" }, {
+    desc = "Clear overseer directory index when files may have changed",
+    group = augroup,
+    callback = function()
+      M.clear()
+    end,
+  })
+  vim.api.nvim_create_autocmd({ "BufWritePost", "BufFilePost" }, {
+    desc = "Clear overseer directory index for the directory of a written file",
+    group = augroup,
+    callback = function(params)
+      local filename = vim.api.nvim_buf_get_name(params.buf)
+      if filename ~= "" then
+        M.clear(vim.fs.dirname(vim.fs.normalize(filename)))
+      end
+    end,
+  })
+end
+
+---@param dir string
+---@return overseer.DirListing
+local function list_dir(dir)
+  local listing = listings[dir]
+  if listing then
+    return listing
+  end
+  listing = { entries = {}, folded = {} }
+  local fd = vim.uv.fs_scandir(dir)
+  if fd then
+    while true do
+      local name, entry_type = vim.uv.fs_scandir_next(fd)
+      if not name then
+        break
+      end
+      listing.entries[name] = entry_type or "unknown"
+      listing.folded[name:lower()] = name
+    end
+  end
+  listings[dir] = listing
+  return listing
+end
+
+---@param dir string
+---@param name string
+---@param entry_type string
+---@param want_type? string
+---@return boolean
+local function matches_type(dir, name, entry_type, want_type)
+  if not want_type then
+    return true
+  end
+  if entry_type == "link" or entry_type == "unknown" then
+    local stat = vim.uv.fs_stat(vim.fs.joinpath(dir, name))
+    entry_type = stat and stat.type or entry_type
+  end
+  return entry_type == want_type
+end
+
+---@param listing overseer.DirListing
+---@param name string
+---@return nil|string
+local function lookup(listing, name)
+  local entry_type = listing.entries[name]
+  if not entry_type and case_insensitive then
+    local actual = listing.folded[name:lower()]
+    entry_type = actual and listing.entries[actual]
+  end
+  return entry_type
+end
+
+---@class (exact) overseer.DirIndexFindOpts
+---@field path? string The directory to start searching from (default cwd)
+---@field type? "file"|"directory"
+---@field limit? integer Stop after finding this many matches (default 1)
+---@field stop? string Stop searching when this directory is reached. The directory itself is not searched.
+
+---Search upward for files or directories. Equivalent to vim.fs.find with upward = true.
+---@param names string|string[]|fun(name: string, path: string): boolean
+---@param opts overseer.DirIndexFindOpts
+---@return string[]
+M.find = function(names, opts)
+  if not augroup then
+    create_autocmds()
+  end
+  local limit = opts.limit or 1
+  local stop = opts.stop and vim.fs.normalize(opts.stop)
+  local path = vim.fs.normalize(vim.fn.fnamemodify(opts.path or vim.fn.getcwd(), ":p"))
+  if type(names) == "string" then
+    names = { names }
+  end
+  local ret = {}
+  local dir = path
+  while dir and dir ~= stop do
+    local listing = list_dir(dir)
+    local candidates = names
+    if type(names) == "function" then
+      candidates = {}
+      for name in pairs(listing.entries) do
+        if names(name, dir) then
+          table.insert(candidates, name)
+        end
+      end
+      table.sort(candidates)
+    end
+    ---@cast candidates string[]
+    for _, name in ipairs(candidates) do
+      local entry_type = lookup(listing, name)
+      if entry_type and matches_type(dir, name, entry_type, opts.type) then
+        table.insert(ret, vim.fs.joinpath(dir, name))
+        if #ret >= limit then
+          return ret
+        end
+      end
+    end
+    local parent = vim.fs.dirname(dir)
+    dir = parent ~= dir and parent or nil
+  end
+  return ret
+end
+
+---Clear the memoized listing for a directory, or all listings
+---@param dir? string
+M.clear = function(dir)
+  if dir then
+    listings[dir] = nil
+  else
+    listings = {}
+  end
+end
+
+return M
@@ -0,0 +1,273 @@
+-- Central service for watching files for changes. All watchers share a single BufWritePost autocmd
+-- and one libuv fs_event per directory, and subscriptions are stored in a trie keyed on the path
+-- components so that each event is only delivered to the subscribers that are watching that path.
+local files = require("overseer.files")
+local log = require("overseer.log")
+local M = {}
+
+-- Collect events for this long before notifying subscribers
+local DEBOUNCE_MS = 50
+
+---@class (exact) overseer.WatchOpts
+---@field paths? string[] Only notify for changes to files in these paths. If nil, all file writes will notify (autocmd mode only).
+---@field mode "autocmd"|"uv"
+
+---@class (exact) overseer.WatchSubscription
+---@field opts overseer.WatchOpts
+---@field callback fun()
+
+---@class (exact) overseer.WatchTrieNode
+---@field children table<string, overseer.WatchTrieNode>
+---@field subscribers table<integer, boolean>
+
+---@class (exact) overseer.UvWatch
+---@field fs_event uv.uv_fs_event_t
+---@field refcount integer
+
+---@return overseer.WatchTrieNode
+local function new_node()
+  return { children = {}, subscribers = {} }
+end
+
+local next_id = 1
+---@type table<integer, overseer.WatchSubscription>
+local subscriptions = {}
+local tries = {
+  autocmd = new_node(),
+  uv = new_node(),
+}
+---@type table<integer, boolean> Autocmd subscriptions that match every file
+local watch_all = {}
+local num_autocmd = 0
+---@type nil|integer
+local autocmd_id
+---@type table<string, overseer.UvWatch>
+local uv_watches = {}
+---@type table<integer, boolean>
+local pending = {}
+local flush_scheduled = false
+
+---@param path string
+---@return string
+local function normalize(path)
+  path = vim.fs.normalize(files.abspath(path))
+  if files.is_windows then
+    path = path:lower()
+  end
+  -- Trim trailing "/"
+  if path:len() > 1 and path:sub(-1) == "/" then
+    path = path:sub(1, -2)
+  end
+  return path
+end
+
+---@param path string Normalized path
+---@return string[]
+local function split_path(path)
+  return vim.split(path, "/", { plain = true, trimempty = true })
+end
+
+---@param root overseer.WatchTrieNode
+---@param parts string[]
+---@param id integer
+local function trie_insert(root, parts, id)
+  local node = root
+  for _, part in ipairs(parts) do
+    local child = node.children[part]
+    if not child then
+      child = new_node()
+      node.children[part] = child
+    end
+    node = child
+  end
+  node.subscribers[id] = true
+end
+
+---@param root overseer.WatchTrieNode
+---@param parts string[]
+---@param id integer
+local function trie_remove(root, parts, id)
+  local stack = { root }
+  local node = root
+  for _, part in ipairs(parts) do
+    node = node.children[part]
+    if not node then
+      return
+    end
+    table.insert(stack, node)
+  end
+  node.subscribers[id] = nil
+  -- Prune nodes that no longer lead to any subscribers
+  for i = #stack, 2, -1 do
+    local n = stack[i]
+    if next(n.subscribers) or next(n.children) then
+      break
+    end
+    stack[i - 1].children[parts[i - 1]] = nil
+  end
+end
+
+---Find all subscribers watching the path or one of its parents
+---@param root overseer.WatchTrieNode
+---@param parts string[]
+---@param ret table<integer, boolean>
+local function trie_collect(root, parts, ret)
+  local node = root
+  for _, part in ipairs(parts) do
+    for id in pairs(node.subscribers) do
+      ret[id] = true
+    end
+    node = node.children[part]
+    if not node then
+      return
+    end
+  end
+  for id in pairs(node.subscribers) do
+    ret[id] = true
+  end
+end
+
+local function flush()
+  flush_scheduled = false
+  local to_notify = pending
+  pending = {}
+  for id in pairs(to_notify) do
+    local sub = subscriptions[id]
+    if sub then
+      local ok, err = pcall(sub.callback)
+      if not ok then
+        log.error("Error in file watcher callback: %s", err)
+      end
+    end
+  end
+end
+
+---@param ids table<integer, boolean>
+local function notify(ids)
+  if next(ids) == nil then
+    return
+  end
+  for id in pairs(ids) do
+    pending[id] = true
+  end
+  if not flush_scheduled then
+    flush_scheduled = true
+    vim.defer_fn(flush, DEBOUNCE_MS)
+  end
+end
+
+---@param params vim.api.keyset.create_autocmd.callback_args
+local function on_buf_write(params)
+  -- Only care about normal files
+  if vim.bo[params.buf].buftype ~= "" then
+    return
+  end
+  local bufname = vim.api.nvim_buf_get_name(params.buf)
+  if bufname == "" then
+    return
+  end
+  local ids = vim.deepcopy(watch_all)
+  trie_collect(tries.autocmd, split_path(normalize(bufname)), ids)
+  notify(ids)
+end
+
+---@param path string Normalized path
+local function add_uv_watch(path)
+  local watch = uv_watches[path]
+  if watch then
+    watch.refcount = watch.refcount + 1
+    return
+  end
+  local fs_event = assert(vim.uv.new_fs_event())
+  fs_event:start(
+    path,
+    { recursive = true },
+    vim.schedule_wrap(function(err, filename)
+      if err then
+        log.warn("Overseer file watcher error for %s: %s", path, err)
+        return
+      end
+      local changed = path
+      if filename then
+        changed = normalize(vim.fs.joinpath(path, filename))
+      end
+      local ids = {}
+      trie_collect(tries.uv, split_path(changed), ids)
+      notify(ids)
+    end)
+  )
+  uv_watches[path] = { fs_event = fs_event, refcount = 1 }
+end
+
+---@param path string Normalized path
+local function remove_uv_watch(path)
+  local watch = uv_watches[path]
+  if not watch then
+    return
+  end
+  watch.refcount = watch.refcount - 1
+  if watch.refcount == 0 then
+    watch.fs_event:stop()
+    watch.fs_event:close()
+    uv_watches[path] = nil
+  end
+end
+
+---Call a function whenever files in the given paths change
+---@param opts overseer.WatchOpts
+---@param callback fun()
+---@return integer watch_id Pass to unwatch() to stop watching
+M.watch = function(opts, callback)
+  local id = next_id
+  next_id = next_id + 1
+  subscriptions[id] = { opts = opts, callback = callback }
+  if opts.mode == "autocmd" then
+    num_autocmd = num_autocmd + 1
+    if not autocmd_id then
+      autocmd_id = vim.api.nvim_create_autocmd("BufWritePost", {
+        pattern = "*",
+        desc = "Notify overseer file watchers",
+        callback = on_buf_write,
+      })
+    end
+    if not opts.paths then
+      watch_all[id] = true
+    end
+  end
+  for _, path in ipairs(opts.paths or {}) do
+    local normpath = normalize(path)
+    trie_insert(tries[opts.mode], split_path(normpath), id)
+    if opts.mode == "uv" then
+      add_uv_watch(normpath)
+    end
+  end
+  return id
+end
+
+---@param watch_id integer
+M.unwatch = function(watch_id)
+  local sub = subscriptions[watch_id]
+  if not sub then
+    return
+  end
+  subscriptions[watch_id] = nil
+  pending[watch_id] = nil
+  local opts = sub.opts
+  for _, path in ipairs(opts.paths or {}) do
+    local normpath = normalize(path)
+    trie_remove(tries[opts.mode], split_path(normpath), watch_id)
+    if opts.mode == "uv" then
+      remove_uv_watch(normpath)
+    end
+  end
+  if opts.mode == "autocmd" then
+    watch_all[watch_id] = nil
+    num_autocmd = num_autocmd - 1
+    if num_autocmd == 0 and autocmd_id then
+      vim.api.nvim_del_autocmd(autocmd_id)
+      autocmd_id = nil
+    end
+  end
+end
+
+return M
@@ -0,0 +1,243 @@
+-- Buffered file writer that performs all file operations asynchronously with libuv. Writes are
+-- collected in memory and flushed once enough data has accumulated or after a delay, and the file
+-- can optionally be rotated once it grows past a size limit.
+local log = require("overseer.log")
+local uv = vim.uv
+local M = {}
+
+---@class (exact) overseer.FileWriterOpts
+---@field flush_bytes? integer Flush the buffer once it contains this many bytes (default 65536)
+---@field flush_ms? integer Flush the buffer at most this long after a write (default 1000)
+---@field max_size? integer Rotate the file once it grows past this many bytes
+---@field max_files? integer Number of rotated files to keep (default 3)
+---@field compress? boolean Compress rotated files with gzip
+
+---@class overseer.FileWriter
+---@field private filename string
+---@field private flush_bytes integer
+---@field private flush_ms integer
+---@field private max_size? integer
+---@field private max_files integer
+---@field private compress boolean
+---@field private fd? integer
+---@field private file_size integer
+---@field private buffer string[]
+---@field private buffered integer Number of bytes in the buffer
+---@field private timer_pending boolean
+---@field private ops fun(done: fun())[] Queue of file operations, which are run one at a time
+---@field private busy boolean
+local FileWriter = {}
+
+---@param filename string
+---@param opts? overseer.FileWriterOpts
+---@return overseer.FileWriter
+M.new = function(filename, opts)
+  opts = opts or {}
+  local compress = opts.compress or false
+  if compress and vim.fn.executable("gzip") == 0 then
+    log.warn("Cannot compress rotated output files: gzip is not executable")
+    compress = false
+  end
+  local writer = {
+    filename = filename,
+    flush_bytes = opts.flush_bytes or 65536,
+    flush_ms = opts.flush_ms or 1000,
+    max_size = opts.max_size,
+    max_files = opts.max_files or 3,
+    compress = compress,
+    fd = nil,
+    file_size = 0,
+    buffer = {},
+    buffered = 0,
+    timer_pending = false,
+    ops = {},
+    busy = false,
+  }
+  setmetatable(writer, { __index = FileWriter })
+  ---@cast writer overseer.FileWriter
+  writer:open()
+  return writer
+end
+
+---@private
+---@param op fun(done: fun())
+function FileWriter:enqueue(op)
+  table.insert(self.ops, op)
+  if not self.busy then
+    self:run_next()
+  end
+end
+
+---@private
+function FileWriter:run_next()
+  local op = table.remove(self.ops, 1)
+  if not op then
+    self.busy = false
+    return
+  end
+  self.busy = true
+  op(function()
+    self:run_next()
+  end)
+end
+
+---@private
+---Open the file, truncating any existing contents
+function FileWriter:open()
+  self:enqueue(function(done)
+    uv.fs_open(self.filename, "w", 420, function(err, fd)
+      if err then
+        log.error("Could not open output file %s: %s", self.filename, err)
+      end
+      self.fd = fd
+      done()
+    end)
+  end)
+end
+
+---@private
+---@param done fun()
+function FileWriter:close_fd(done)
+  local fd = self.fd
+  self.fd = nil
+  if not fd then
+    return done()
+  end
+  uv.fs_close(fd, function(err)
+    if err then
+      log.error("Error closing output file %s: %s", self.filename, err)
+    end
+    done()
+  end)
+end
+
+---@private
+---@param index integer
+---@return string
+function FileWriter:rotated_name(index)
+  local name = string.format("%s.%d", self.filename, index)
+  if self.compress then
+    name = name .. ".gz"
+  end
+  return name
+end
+
+---@private
+---Move the current file to filename.1, shift the older files down, and start a new file
+function FileWriter:rotate()
+  self:enqueue(function(done)
+    self:close_fd(done)
+  end)
+  if self.max_files > 0 then
+    self:enqueue(function(done)
+      -- Renaming on top of the oldest file discards it
+      local i = self.max_files - 1
+      local function shift()
+        if i < 1 then
+          return done()
+        end
+        local src, dest = self:rotated_name(i), self:rotated_name(i + 1)
+        i = i - 1
+        uv.fs_rename(src, dest, shift)
+      end
+      shift()
+    end)
+    self:enqueue(function(done)
+      local dest = string.format("%s.1", self.filename)
+      uv.fs_rename(self.filename, dest, function(err)
+        if err then
+          log.error("Could not rotate output file %s: %s", self.filename, err)
+          return done()
+        elseif not self.compress then
+          return done()
+        end
+        local handle
+        handle = uv.spawn("gzip", { args = { "-f", dest } }, function(code)
+          handle:close()
+          if code ~= 0 then
+            log.error("Failed to compress rotated output file %s", dest)
+          end
+          done()
+        end)
+        if not handle then
+          log.error("Failed to run gzip on rotated output file %s", dest)
+          done()
+        end
+      end)
+    end)
+  end
+  self:open()
+end
+
+---Add data to the write buffer
+---@param data string
+function FileWriter:write(data)
+  if data == "" then
+    return
+  end
+  table.insert(self.buffer, data)
+  self.buffered = self.buffered + #data
+  if self.buffered >= self.flush_bytes then
+    self:flush()
+  elseif not self.timer_pending then
+    self.timer_pending = true
+    vim.defer_fn(function()
+      self.timer_pending = false
+      self:flush()
+    end, self.flush_ms)
+  end
+end
+
+---Write all buffered data to the file
+function FileWriter:flush()
+  if self.buffered == 0 then
+    return
+  end
+  local data = table.concat(self.buffer)
+  self.buffer = {}
+  self.buffered = 0
+  self:enqueue(function(done)
+    if not self.fd then
+      return done()
+    end
+    uv.fs_write(self.fd, data, -1, function(err)
+      if err then
+        log.error("Error writing to output file %s: %s", self.filename, err)
+      end
+      done()
+    end)
+  end)
+  self.file_size = self.file_size + #data
+  if self.max_size and self.file_size >= self.max_size then
+    self.file_size = 0
+    self:rotate()
+  end
+end
+
+---Discard the contents of the file and start over
+function FileWriter:truncate()
+  self.buffer = {}
+  self.buffered = 0
+  self.file_size = 0
+  self:enqueue(function(done)
+    self:close_fd(done)
+  end)
+  self:open()
+end
+
+---Flush all buffered data and close the file
+---@param callback? fun() Called (in a fast event) once all pending file operations have completed
+function FileWriter:close(callback)
+  self:flush()
+  self:enqueue(function(done)
+    self:close_fd(done)
+  end)
+  if callback then
+    self:enqueue(function(done)
+      callback()
+      done()
+    end)
+  end
+end
+
+return M
@@ -17,6 +17,12 @@ M.check = function()
   end
   vim.health.info(string.format("Log file: %s", log.get_logfile()))
   vim.health.info(string.format("Log level: %s", level_map[config.log_level]))
+  local dropped = log.get_dropped_count()
+  if dropped > 0 then
+    vim.health.warn(
+      string.format("%d log records were dropped because the log file could not keep up", dropped)
+    )
+  end
 
   ---@type overseer.Report
   local info
@@ -67,6 +67,23 @@ local commands = {
       desc = "Select a task to run an action on",
     },
   },
+  {
+    cmd = "OverseerProfile",
+    args = "`start/stop/save [file]`",
+    func = "_profile",
+    def = {
+      desc = "Record a trace of overseer internals that can be viewed in Perfetto",
+      nargs = "+",
+      complete = function(arg, line)
+        if line:match("^%S+%s+%S+%s") then
+          return vim.fn.getcompletion(arg, "file")
+        end
+        return vim.tbl_filter(function(subcmd)
+          return vim.startswith(subcmd, arg)
+        end, { "start", "stop", "save" })
+      end,
+    },
+  },
 }
 
 local function create_commands()
@@ -2,40 +2,96 @@ local M = {}
 
 local json_decode = vim.json.decode
 
----@param string string
----@param idx number
----@return string
----@return number?
-local function get_to_line_end(string, idx)
-  local newline = string:find("\n", idx, true)
-  local to_end = newline and string:sub(idx, newline - 1) or string:sub(idx)
-  return to_end, newline
+---@param content string
+---@param idx integer
+---@return integer lnum
+---@return integer col
+local function get_position(content, idx)
+  local lnum = 1
+  local line_start = 1
+  local newline = content:find("\n", 1, true)
+  while newline and newline < idx do
+    lnum = lnum + 1
+    line_start = newline + 1
+    newline = content:find("\n", line_start, true)
+  end
+  return lnum, idx - line_start + 1
 end
 
----Splice out an inclusive range from a string
----@param string string
----@param start_idx number
----@param end_idx? number
+---@param content string
+---@param idx integer
+---@param msg string
 ---@return string
-local function str_splice(string, start_idx, end_idx)
-  local new_content = string:sub(1, start_idx - 1)
-  if end_idx then
-    return new_content .. string:sub(end_idx + 1)
-  else
-    return new_content
-  end
+local function format_error(content, idx, msg)
+  local lnum, col = get_position(content, idx)
+  return string.format("%s (line %d, column %d)", msg, lnum, col)
 end
 
----@param string string
----@param idx number
----@param needle string
----@return number?
-local function str_rfind(string, idx, needle)
-  for i = idx, 1, -1 do
-    if string:sub(i, i - 1 + needle:len()) == needle then
-      return i
+---Replace comments and trailing commas with whitespace in a single pass
+---The result has the same length and line breaks as the input, so any error positions reported by
+---the decoder will also be valid for the original content.
+---@param content string
+---@return string
+M.strip = function(content)
+  local pieces = {}
+  -- Index into pieces of a comma that will be removed if the next token closes an array or object
+  local pending_comma
+  local i = 1
+  local len = content:len()
+  while i <= len do
+    local idx = content:find('[",/%]}]', i)
+    local between = content:sub(i, idx and idx - 1 or len)
+    if between:find("%S") then
+      pending_comma = nil
+    end
+    table.insert(pieces, between)
+    if not idx then
+      break
+    end
+    local char = content:sub(idx, idx)
+    if char == '"' then
+      local stop = idx + 1
+      while true do
+        stop = content:find('["\\]', stop)
+        if not stop then
+          -- Unterminated string. Leave it for the decoder to report.
+          stop = len
+          break
+        elseif content:sub(stop, stop) == "\\" then
+          stop = stop + 2
+        else
+          break
+        end
+      end
+      table.insert(pieces, content:sub(idx, stop))
+      pending_comma = nil
+      i = stop + 1
+    elseif char == "/" and content:sub(idx + 1, idx + 1) == "/" then
+      local newline = content:find("\n", idx + 2, true)
+      local stop = newline and newline - 1 or len
+      table.insert(pieces, string.rep(" ", stop - idx + 1))
+      i = stop + 1
+    elseif char == "/" and content:sub(idx + 1, idx + 1) == "*" then
+      local _, stop = content:find("*/", idx + 2, true)
+      if not stop then
+        error(format_error(content, idx, "Unterminated block comment"), 0)
+      end
+      table.insert(pieces, (content:sub(idx, stop):gsub("[^\n]", " ")))
+      i = stop + 1
+    else
+      if char == "," then
+        pending_comma = #pieces + 1
+      elseif pending_comma and char ~= "/" then
+        pieces[pending_comma] = " "
+        pending_comma = nil
+      else
+        pending_comma = nil
+      end
+      table.insert(pieces, char)
+      i = idx + 1
     end
   end
+  return table.concat(pieces)
 end
 
 ---Decodes a json string that may contain comments or trailing commas
@@ -49,32 +105,21 @@ M.decode = function(content, opts)
     },
   })
   local ok, data = pcall(json_decode, content, opts)
-  while not ok do
-    local err = assert(data)
-    local char = err:match("invalid token at character (%d+)$")
-    if char then
-      local to_end, newline = get_to_line_end(content, char)
-      if to_end:match("^//") then
-        content = str_splice(content, char, newline)
-        goto continue
-      end
-    end
-
-    char = err:match("Expected object key string but found [^%s]+ at character (%d+)$")
-    char = char or err:match("Expected value but found T_ARR_END at character (%d+)")
-    if char then
-      local comma_idx = str_rfind(content, char, ",")
-      if comma_idx then
-        content = str_splice(content, comma_idx, comma_idx)
-        goto continue
-      end
-    end
-
-    error(err)
-    ::continue::
-    ok, data = pcall(json_decode, content, opts)
+  if ok then
+    return data
+  end
+  -- Only pay for the extra pass when the content is not plain JSON
+  local stripped = M.strip(content)
+  ok, data = pcall(json_decode, stripped, opts)
+  if ok then
+    return data
+  end
+  local err = assert(data)
+  local char = tonumber(err:match("at character (%d+)"))
+  if char then
+    error(format_error(stripped, char, err), 0)
   end
-  return data
+  error(err, 0)
 end
 
 return M
@@ -20,12 +20,52 @@ Log.get_logfile = function()
   return vim.fs.joinpath(stdpath, "overseer.log")
 end
 
----@param level integer
----@param msg string
----@param ... any[]
+-- Maximum number of records waiting to be written. If the log file can't keep up, the oldest
+-- records are dropped.
+local MAX_PENDING = 10000
+-- How long to collect records before writing them to the log file
+local FLUSH_MS = 100
+-- Rotate the log file once it grows past this size
+local MAX_FILE_SIZE = 10 * 1024 * 1024
+
+---@class (exact) overseer.LogRecord
+---@field level integer
+---@field time integer
+---@field msg string
+---@field args table Arguments packed with vim.F.pack_len
+
+---@type overseer.LogRecord[]
+local ring = {}
+local head = 1
+local count = 0
+local dropped = 0
+
+local filepath
+---@type nil|integer
+local fd
+local file_size = 0
+local writing = false
+local disabled = false
+---@type nil|uv.uv_timer_t
+local timer
+
+local last_time
+local last_timestr
+---@param time integer
+---@return string
+local function get_timestr(time)
+  -- Only format the timestamp once per second
+  if time ~= last_time then
+    last_time = time
+    last_timestr = os.date("%Y-%m-%d %H:%M:%S", time)
+  end
+  return last_timestr
+end
+
+---@param record overseer.LogRecord
 ---@return string
-local function format(level, msg, ...)
-  local args = vim.F.pack_len(...)
+local function format(record)
+  local args = record.args
   for i = 1, args.n do
     local v = args[i]
     if type(v) == "table" then
@@ -34,24 +74,111 @@ local function format(level, msg, ...)
       args[i] = "nil"
     end
   end
-  local ok, text = pcall(string.format, msg, vim.F.unpack_len(args))
-  local timestr = vim.fn.strftime("%Y-%m-%d %H:%M:%S")
+  local ok, text = pcall(string.format, record.msg, vim.F.unpack_len(args))
+  local timestr = get_timestr(record.time)
   if ok then
-    local str_level = levels_reverse[level]
+    local str_level = levels_reverse[record.level]
     return string.format("%s[%s] %s", timestr, str_level, text)
   else
     return string.format(
       "%s[ERROR] error formatting log line: '%s' args %s",
       timestr,
-      vim.inspect(msg),
+      vim.inspect(record.msg),
       vim.inspect(args)
     )
   end
 end
 
 ---@param line string
-local function write(line)
-  -- This will be replaced during initialization
+local function handler(line)
+  -- This will be replaced by set_handler
+end
+local has_handler = false
+
+---Format and remove all pending records
+---@return nil|string
+local function take_pending()
+  if count == 0 then
+    return nil
+  end
+  local lines = {}
+  for i = 0, count - 1 do
+    local idx = (head + i - 1) % MAX_PENDING + 1
+    table.insert(lines, format(ring[idx]))
+    ring[idx] = nil
+  end
+  head = 1
+  count = 0
+  table.insert(lines, "")
+  return table.concat(lines, "\n")
+end
+
+local schedule_flush
+
+---Move the log file to a backup and open a new one
+local function rotate()
+  writing = true
+  local backup = filepath .. ".1"
+  vim.uv.fs_close(assert(fd), function()
+    fd = nil
+    vim.uv.fs_unlink(backup, function()
+      vim.uv.fs_rename(filepath, backup, function()
+        vim.uv.fs_open(filepath, "a", 420, function(err, new_fd)
+          writing = false
+          if err then
+            disabled = true
+            return
+          end
+          fd = new_fd
+          file_size = 0
+          schedule_flush()
+        end)
+      end)
+    end)
+  end)
+end
+
+---Write all pending records to the log file. Called from a libuv timer.
+local function flush()
+  if writing or not fd then
+    return
+  end
+  local data = take_pending()
+  if not data then
+    return
+  end
+  writing = true
+  vim.uv.fs_write(fd, data, -1, function(err)
+    writing = false
+    if not err then
+      file_size = file_size + #data
+      if file_size > MAX_FILE_SIZE then
+        rotate()
+        return
+      end
+    end
+    schedule_flush()
+  end)
+end
+
+schedule_flush = function()
+  if count == 0 or disabled then
+    return
+  end
+  if not timer then
+    timer = assert(vim.uv.new_timer())
+  end
+  if not timer:is_active() then
+    timer:start(FLUSH_MS, 0, flush)
+  end
+end
+
+---Synchronously write all pending records, e.g. before exiting
+function Log.flush()
+  local data = fd and take_pending()
+  if data then
+    vim.uv.fs_write(assert(fd), data, -1)
+  end
 end
 
 local initialized = false
@@ -60,52 +187,85 @@ local function initialize()
     return
   end
   initialized = true
-  local filepath = Log.get_logfile()
+  filepath = Log.get_logfile()
 
   local stat = vim.uv.fs_stat(filepath)
-  if stat and stat.size > 10 * 1024 * 1024 then
+  if stat and stat.size > MAX_FILE_SIZE then
     local backup = filepath .. ".1"
     vim.uv.fs_unlink(backup)
     vim.uv.fs_rename(filepath, backup)
+    stat = nil
   end
 
   local parent = vim.fs.dirname(filepath)
   vim.fn.mkdir(parent, "p")
 
-  local logfile, openerr = io.open(filepath, "a+")
-  if not logfile then
+  local new_fd, openerr = vim.uv.fs_open(filepath, "a", 420)
+  if not new_fd then
+    disabled = true
+    ring = {}
+    count = 0
     local err_msg = string.format("Failed to open overseer.nvim log file: %s", openerr)
     vim.notify(err_msg, vim.log.levels.ERROR)
-  else
-    write = function(line)
-      logfile:write(line)
-      logfile:write("\n")
-      logfile:flush()
-    end
+    return
   end
+  fd = new_fd
+  file_size = stat and stat.size or 0
+  vim.api.nvim_create_autocmd("VimLeavePre", {
+    desc = "Flush overseer.nvim log",
+    callback = function()
+      Log.flush()
+    end,
+  })
+  schedule_flush()
 end
 
 ---Override the file handler e.g. for tests
----@param handler fun(line: string)
-function Log.set_handler(handler)
-  write = handler
+---@param new_handler fun(line: string)
+function Log.set_handler(new_handler)
+  handler = new_handler
+  has_handler = true
   initialized = true
 end
 
+---Get the number of log records that were discarded because the log file could not keep up
+---@return integer
+function Log.get_dropped_count()
+  return dropped
+end
+
 function Log.log(level, msg, ...)
-  if config.log_level <= level then
-    initialize()
+  if config.log_level > level or disabled then
+    return
+  end
+  ---@type overseer.LogRecord
+  local record = { level = level, time = os.time(), msg = msg, args = vim.F.pack_len(...) }
+  if has_handler then
     if vim.in_fast_event() then
-      local splat = vim.F.pack_len(...)
       vim.schedule(function()
-        local text = format(level, msg, vim.F.unpack_len(splat))
-        write(text)
+        handler(format(record))
       end)
     else
-      local text = format(level, msg, ...)
-      write(text)
+      handler(format(record))
     end
+    return
+  end
+  if not initialized then
+    if vim.in_fast_event() then
+      vim.schedule(initialize)
+    else
+      initialize()
+    end
+  end
+  if count == MAX_PENDING then
+    ring[head] = record
+    head = head % MAX_PENDING + 1
+    dropped = dropped + 1
+  else
+    ring[(head + count - 1) % MAX_PENDING + 1] = record
+    count = count + 1
   end
+  schedule_flush()
 end
 
 function Log.trace(...)
@@ -0,0 +1,93 @@
+-- Collects the output of a process and flushes it in batches. Chatty processes can produce
+-- thousands of small chunks per second, and updating the buffer and dispatching to components for
+-- each one will freeze the UI.
+local config = require("overseer.config")
+local M = {}
+
+---@class overseer.OutputBatcher
+---@field private on_flush fun(chunks: any[])
+---@field private chunks any[]
+---@field private size integer
+---@field private timer_pending boolean
+---@field private flush_scheduled boolean
+local OutputBatcher = {}
+
+---@param on_flush fun(chunks: any[]) Called with all of the chunks collected since the last flush
+---@return overseer.OutputBatcher
+M.new = function(on_flush)
+  local batcher = {
+    on_flush = on_flush,
+    chunks = {},
+    size = 0,
+    timer_pending = false,
+    flush_scheduled = false,
+  }
+  setmetatable(batcher, { __index = OutputBatcher })
+  ---@type overseer.OutputBatcher
+  return batcher
+end
+
+---Add a chunk of output. This is safe to call from a fast event.
+---@param chunk any
+---@param size integer Size of the chunk in bytes
+function OutputBatcher:push(chunk, size)
+  table.insert(self.chunks, chunk)
+  self.size = self.size + size
+  if self.size >= config.output.batch_bytes then
+    if not self.flush_scheduled then
+      self.flush_scheduled = true
+      vim.schedule(function()
+        self:flush()
+      end)
+    end
+  elseif not self.timer_pending then
+    self.timer_pending = true
+    vim.defer_fn(function()
+      self.timer_pending = false
+      self:flush()
+    end, config.output.batch_ms)
+  end
+end
+
+---Immediately flush all collected output
+function OutputBatcher:flush()
+  self.flush_scheduled = false
+  if vim.tbl_isempty(self.chunks) then
+    return
+  end
+  local chunks = self.chunks
+  self.chunks = {}
+  self.size = 0
+  self.on_flush(chunks)
+end
+
+---Merge a list of jobstart() output chunks into a single chunk
+---@param chunks string[][]
+---@return string[]
+M.merge_job_data = function(chunks)
+  local ret = {}
+  for _, data in ipairs(chunks) do
+    if vim.tbl_isempty(ret) then
+      vim.list_extend(ret, data)
+    else
+      ret[#ret] = ret[#ret] .. (data[1] or "")
+      for i = 2, #data do
+        table.insert(ret, data[i])
+      end
+    end
+  end
+  return ret
+end
+
+---Get the size in bytes of a jobstart() output chunk
+---@param data string[]
+---@return integer
+M.job_data_size = function(data)
+  local size = #data
+  for _, line in ipairs(data) do
+    size = size + #line
+  end
+  return size
+end
+
+return M
@@ -0,0 +1,105 @@
+-- Keeps the output buffer of a task from growing without bound. Lines are trimmed from the top of the
+-- buffer once it gets too long, and are loaded back in from the task's OutputStore when the cursor
+-- is moved to the top of the buffer.
+local M = {}
+
+-- Number of lines to load at a time when the cursor reaches the top of the buffer
+local PAGE_SIZE = 1000
+
+---@class overseer.OutputPager
+---@field private bufnr integer
+---@field private store overseer.OutputStore
+---@field private max_lines integer
+---@field private hidden integer Number of lines at the start of the output that are not in the buffer
+local OutputPager = {}
+
+---@param bufnr integer Buffer that displays the output. Each line must be a line in the store.
+---@param store overseer.OutputStore
+---@param max_lines integer Number of lines to keep in the buffer
+---@return overseer.OutputPager
+M.new = function(bufnr, store, max_lines)
+  local pager = {
+    bufnr = bufnr,
+    store = store,
+    max_lines = math.max(1, max_lines),
+    hidden = 0,
+  }
+  setmetatable(pager, { __index = OutputPager })
+  ---@cast pager overseer.OutputPager
+  vim.api.nvim_create_autocmd("CursorMoved", {
+    desc = "Load earlier task output",
+    buffer = bufnr,
+    callback = function()
+      local lnum = vim.api.nvim_win_get_cursor(0)[1]
+      if lnum == 1 then
+        pager:load_earlier()
+      elseif lnum == vim.api.nvim_buf_line_count(bufnr) then
+        -- Drop the lines that were loaded once the user goes back to the end of the output
+        pager:trim()
+      end
+    end,
+  })
+  return pager
+end
+
+---@private
+---@param fn fun()
+function OutputPager:edit(fn)
+  vim.bo[self.bufnr].modifiable = true
+  fn()
+  vim.bo[self.bufnr].modifiable = false
+  vim.bo[self.bufnr].modified = false
+end
+
+---Remove lines from the top of the buffer so that it has at most max_lines lines. Lines that are
+---visible in a window are never removed, so output can still be read while it is being appended.
+function OutputPager:trim()
+  if not vim.api.nvim_buf_is_valid(self.bufnr) then
+    return
+  end
+  local excess = vim.api.nvim_buf_line_count(self.bufnr) - self.max_lines
+  for _, winid in ipairs(vim.fn.win_findbuf(self.bufnr)) do
+    excess = math.min(excess, vim.fn.line("w0", winid) - 1)
+  end
+  if excess <= 0 then
+    return
+  end
+  self:edit(function()
+    vim.api.nvim_buf_set_lines(self.bufnr, 0, excess, true, {})
+  end)
+  self.hidden = self.hidden + excess
+end
+
+---Load the lines before the start of the buffer back in from the output store
+function OutputPager:load_earlier()
+  local first = self.store:first_line()
+  if self.hidden <= first or not vim.api.nvim_buf_is_valid(self.bufnr) then
+    return
+  end
+  local start = math.max(first, self.hidden - PAGE_SIZE)
+  local lines = self.store:get_lines(start, self.hidden)
+  -- The store may have been cleared if the task was reset
+  if vim.tbl_isempty(lines) then
+    self.hidden = 0
+    return
+  end
+  local cursors = {}
+  for _, winid in ipairs(vim.fn.win_findbuf(self.bufnr)) do
+    cursors[winid] = vim.api.nvim_win_get_cursor(winid)
+  end
+  self:edit(function()
+    vim.api.nvim_buf_set_lines(self.bufnr, 0, 0, true, lines)
+  end)
+  self.hidden = start
+  -- Keep the cursors on the same text
+  for winid, cursor in pairs(cursors) do
+    vim.api.nvim_win_set_cursor(winid, { cursor[1] + #lines, cursor[2] })
+  end
+end
+
+---@return integer
+function OutputPager:get_num_hidden()
+  return self.hidden
+end
+
+return M
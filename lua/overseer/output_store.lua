@@ -0,0 +1,219 @@
+-- Stores the complete output of a task using a bounded amount of memory. The most recent lines are
+-- kept in a ring buffer, and lines that fall out of the ring are appended to a spill file on disk.
+local files = require("overseer.files")
+local log = require("overseer.log")
+local M = {}
+
+-- Record the byte offset of every Nth spilled line so we can seek to old lines without reading the
+-- whole file
+local INDEX_STRIDE = 1024
+
+---@class overseer.OutputStore
+---@field private max_lines integer
+---@field private ring string[]
+---@field private head integer Index in the ring of the oldest line
+---@field private count integer Number of lines in the ring
+---@field private spilled integer Number of lines written to the spill file
+---@field private dropped integer Number of lines at the start of the output that were lost because the spill file could not be opened
+---@field private spill_failed boolean
+---@field private filename? string
+---@field private file? file*
+---@field private file_size integer
+---@field private offsets integer[] Byte offsets of spilled lines 1, 1 + INDEX_STRIDE, 1 + 2 * INDEX_STRIDE, ...
+local OutputStore = {}
+
+---@param max_lines integer Maximum number of lines to keep in memory
+---@return overseer.OutputStore
+M.new = function(max_lines)
+  vim.validate("max_lines", max_lines, "number")
+  local store = {
+    max_lines = math.max(1, max_lines),
+    ring = {},
+    head = 1,
+    count = 0,
+    spilled = 0,
+    dropped = 0,
+    spill_failed = false,
+    filename = nil,
+    file = nil,
+    file_size = 0,
+    offsets = {},
+  }
+  setmetatable(store, { __index = OutputStore })
+  ---@type overseer.OutputStore
+  return store
+end
+
+---@private
+---@param line string
+function OutputStore:spill(line)
+  if self.spill_failed then
+    self.dropped = self.dropped + 1
+    return
+  end
+  if not self.file then
+    self.filename = vim.fn.tempname()
+    local file, err = io.open(self.filename, "w")
+    if not file then
+      -- Don't retry for every line. This only happens before anything has been spilled, so the
+      -- lost lines are always at the start of the output.
+      log.error("Could not open output spill file %s: %s", self.filename, err)
+      self.filename = nil
+      self.spill_failed = true
+      self.dropped = self.dropped + 1
+      return
+    end
+    self.file = file
+  end
+  if self.spilled % INDEX_STRIDE == 0 then
+    table.insert(self.offsets, self.file_size)
+  end
+  self.file:write(line, "\n")
+  self.file_size = self.file_size + #line + 1
+  self.spilled = self.spilled + 1
+end
+
+---@param lines string[]
+function OutputStore:append(lines)
+  for _, line in ipairs(lines) do
+    if self.count < self.max_lines then
+      self.ring[(self.head + self.count - 1) % self.max_lines + 1] = line
+      self.count = self.count + 1
+    else
+      self:spill(self.ring[self.head])
+      self.ring[self.head] = line
+      self.head = self.head % self.max_lines + 1
+    end
+  end
+end
+
+---@return integer
+function OutputStore:line_count()
+  return self.dropped + self.spilled + self.count
+end
+
+---Get the index of the oldest line that is still available. Lines before it were lost.
+---@return integer 0-indexed
+function OutputStore:first_line()
+  return self.dropped
+end
+
+---@private
+---@param start integer 0-indexed
+---@param end_ integer 0-indexed, exclusive
+---@param ret string[]
+function OutputStore:read_spilled(start, end_, ret)
+  if start >= end_ or not self.file then
+    return
+  end
+  self.file:flush()
+  local file = io.open(assert(self.filename), "r")
+  if not file then
+    log.error("Could not read output spill file %s", self.filename)
+    return
+  end
+  local block = math.floor(start / INDEX_STRIDE)
+  file:seek("set", self.offsets[block + 1])
+  local lnum = block * INDEX_STRIDE
+  for line in file:lines() do
+    if lnum >= end_ then
+      break
+    elseif lnum >= start then
+      table.insert(ret, line)
+    end
+    lnum = lnum + 1
+  end
+  file:close()
+end
+
+---Get a range of lines from the output. Lines that are no longer in memory are read from disk, and
+---lines before first_line() are omitted.
+---@param start integer 0-indexed
+---@param end_ integer 0-indexed, exclusive. Negative values count from the end, like nvim_buf_get_lines
+---@return string[]
+function OutputStore:get_lines(start, end_)
+  local total = self:line_count()
+  if end_ < 0 then
+    end_ = total + end_ + 1
+  end
+  -- Line numbers include the lines that were lost so that they stay stable
+  start = math.max(self.dropped, start) - self.dropped
+  end_ = math.min(total, end_) - self.dropped
+  local ret = {}
+  self:read_spilled(start, math.min(end_, self.spilled), ret)
+  for lnum = math.max(start, self.spilled), end_ - 1 do
+    local i = lnum - self.spilled
+    table.insert(ret, self.ring[(self.head + i - 1) % self.max_lines + 1])
+  end
+  return ret
+end
+
+---Iterate over every line of output, streaming older lines from disk
+---@return fun(): nil|string
+function OutputStore:iter()
+  local spilled = self.spilled
+  local lnum = spilled
+  local file
+  if spilled > 0 and self.file then
+    self.file:flush()
+    file = io.open(assert(self.filename), "r")
+    lnum = file and 0 or spilled
+  end
+  return function()
+    if file then
+      local line = lnum < spilled and file:read("*l")
+      if line then
+        lnum = lnum + 1
+        return line
+      end
+      file:close()
+      file = nil
+      lnum = spilled
+    end
+    local i = lnum - spilled
+    if i >= self.count then
+      return nil
+    end
+    lnum = lnum + 1
+    return self.ring[(self.head + i - 1) % self.max_lines + 1]
+  end
+end
+
+---Iterate over every line of output in batches, so that the whole history never has to be in memory
+---@param size integer Maximum number of lines in each batch
+---@return fun(): nil|string[]
+function OutputStore:iter_chunks(size)
+  local iter = self:iter()
+  return function()
+    local chunk = {}
+    for line in iter do
+      table.insert(chunk, line)
+      if #chunk >= size then
+        break
+      end
+    end
+    if not vim.tbl_isempty(chunk) then
+      return chunk
+    end
+  end
+end
+
+---Remove all stored output and delete the spill file
+function OutputStore:clear()
+  if self.file then
+    self.file:close()
+    files.delete_file(assert(self.filename))
+  end
+  self.ring = {}
+  self.head = 1
+  self.count = 0
+  self.spilled = 0
+  self.dropped = 0
+  self.spill_failed = false
+  self.filename = nil
+  self.file = nil
+  self.file_size = 0
+  self.offsets = {}
+end
+
+return M
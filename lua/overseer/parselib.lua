@@ -1,3 +1,4 @@
+local regex = require("overseer.regex")
 local M = {}
 
 ---@class (exact) overseer.OutputParser
@@ -26,6 +27,33 @@ local function default_postprocess_field(value, _, field)
   end
 end
 
+---@param line string
+---@param literals string[]
+---@return boolean
+local function has_literals(line, literals)
+  for _, literal in ipairs(literals) do
+    if not line:find(literal, 1, true) then
+      return false
+    end
+  end
+  return true
+end
+
+-- Shared by all parsers so that when several of them check the same line, we only do this once
+local last_line, last_ignorecase, last_search_line
+---matchlist() respects 'ignorecase', so if it is set we have to search the lowercase line
+---@param line string
+---@return boolean ignorecase
+---@return string search_line
+local function get_search_line(line)
+  if line ~= last_line then
+    last_line = line
+    last_ignorecase = vim.o.ignorecase
+    last_search_line = last_ignorecase and line:lower() or line
+  end
+  return last_ignorecase, last_search_line
+end
+
 ---Create a match function from a lua pattern
 ---@param pattern string lua pattern
 ---@return overseer.MatchFn
@@ -34,7 +62,11 @@ end
 --- local parse_fn = parselib.make_parse_fn(match_fn, {"filename", "lnum", "col", "text"})
 --- local parser = parselib.make_parser(parse_fn)
 M.make_lua_match_fn = function(pattern)
+  local literals = regex.lua_pattern_literals(pattern)
   return function(line)
+    if not has_literals(line, literals) then
+      return nil
+    end
     local ret = { line:match(pattern) }
     if vim.tbl_isempty(ret) then
       return nil
@@ -49,7 +81,11 @@ end
 ---@example
 --- local test_fn = parselib.make_lua_test_fn("^File change detected")
 M.make_lua_test_fn = function(pattern)
+  local literals = regex.lua_pattern_literals(pattern)
   return function(line)
+    if not has_literals(line, literals) then
+      return false
+    end
     local matched = line:match(pattern)
     return matched ~= nil
   end
@@ -63,12 +99,36 @@ end
 --- local parse_fn = parselib.make_parse_fn(match_fn, {"filename", "lnum", "col", "text"})
 --- local parser = parselib.make_parser(parse_fn)
 M.make_regex_match_fn = function(pattern)
+  -- Reject lines that are missing a required substring before running the regex, and use an
+  -- equivalent lua pattern when there is one because it is much faster than matchlist()
+  local literals = regex.vim_regex_literals(pattern)
+  -- string.lower only folds ASCII, while matchlist() also folds other characters. Only use the
+  -- ASCII literals when 'ignorecase' is set.
+  local lower_literals = vim.tbl_map(
+    string.lower,
+    vim.tbl_filter(function(literal)
+      return not literal:find("[\128-\255]")
+    end, literals)
+  )
+  local lua_pattern = regex.vim_regex_to_lua(pattern)
   return function(line)
-    local result = vim.fn.matchlist(line, pattern)
-    if vim.tbl_isempty(result) then
+    local ignorecase, search_line = get_search_line(line)
+    if not has_literals(search_line, ignorecase and lower_literals or literals) then
       return nil
     end
-    table.remove(result, 1)
+    local result
+    if lua_pattern and not ignorecase then
+      result = { line:match(lua_pattern) }
+      if vim.tbl_isempty(result) then
+        return nil
+      end
+    else
+      result = vim.fn.matchlist(line, pattern)
+      if vim.tbl_isempty(result) then
+        return nil
+      end
+      table.remove(result, 1)
+    end
     -- matchlist() will use "" if an optional submatch does not match, and it also throws a
     -- bunch of "" on the end of the list just for funzies.
     for i, v in ipairs(result) do
@@ -0,0 +1,451 @@
+-- Analysis of vim regexes and lua patterns, used to make output parsing cheaper. Most lines of
+-- output don't match anything, so we extract the literal substrings that every match must contain
+-- and reject lines with a plain string.find before running the full match.
+local M = {}
+
+---@class (exact) overseer.RegexToken
+---@field type "lit"|"class"|"any"|"group"|"quant"|"bol"|"eol"|"alt"
+---@field text? string For "lit" the literal text, for "class" the lua pattern (if one exists), for "quant" the quantifier
+---@field negated? boolean For "class", true if the class matches any character not in a set
+---@field capture? boolean For "group", true if this is a capturing group
+---@field tokens? overseer.RegexToken[] For "group", the tokens inside the group
+
+-- Backslash classes in vim regexes that we know how to express as lua patterns
+local vim_classes = {
+  s = { "[ \t]", false },
+  S = { "[^ \t]", true },
+  d = { "%d", false },
+  D = { "%D", true },
+  w = { "[%w_]", false },
+  W = { "[^%w_]", true },
+  a = { "%a", false },
+  A = { "%A", true },
+}
+
+-- POSIX character classes that may appear inside of [] in vim regexes
+local posix_classes = {
+  alnum = "%w",
+  alpha = "%a",
+  digit = "%d",
+  lower = "%l",
+  punct = "%p",
+  space = "%s",
+  upper = "%u",
+  xdigit = "%x",
+}
+
+---Get the end index of the (possibly multibyte) character starting at i
+---@param str string
+---@param i integer
+---@return integer
+local function char_end(str, i)
+  local byte = str:byte(i)
+  if byte >= 0xF0 then
+    return i + 3
+  elseif byte >= 0xE0 then
+    return i + 2
+  elseif byte >= 0xC0 then
+    return i + 1
+  end
+  return i
+end
+
+---@param c string
+---@return string
+local function escape_lua(c)
+  if c:match("^[%w%s]$") or c:byte() >= 0x80 then
+    return c
+  end
+  return "%" .. c
+end
+
+---Parse a vim [] collection
+---@param pat string
+---@param i integer index of the opening [
+---@return nil|overseer.RegexToken
+---@return integer index after the closing ]
+local function parse_vim_collection(pat, i)
+  i = i + 1
+  local negated = false
+  if pat:sub(i, i) == "^" then
+    negated = true
+    i = i + 1
+  end
+  local items = {}
+  local first = true
+  local translatable = true
+  while i <= #pat do
+    local c = pat:sub(i, i)
+    if c == "]" and not first then
+      local token = { type = "class", negated = negated }
+      if translatable and not vim.tbl_isempty(items) then
+        token.text = "[" .. (negated and "^" or "") .. table.concat(items) .. "]"
+      end
+      return token, i + 1
+    elseif c == "[" and pat:sub(i + 1, i + 1) == ":" then
+      local name, stop = pat:match("^%[:(%a+):%]()", i)
+      if not name then
+        return nil, i
+      end
+      if posix_classes[name] then
+        table.insert(items, posix_classes[name])
+      else
+        translatable = false
+      end
+      i = stop
+    elseif c == "\\" then
+      local nc = pat:sub(i + 1, i + 1)
+      if nc == "t" then
+        table.insert(items, "\t")
+      elseif nc == "\\" or nc == "]" or nc == "^" or nc == "-" then
+        table.insert(items, escape_lua(nc))
+      else
+        -- Vim treats other backslash sequences in a collection in ways that are hard to replicate
+        translatable = false
+      end
+      i = i + 2
+    elseif c == "-" and not first and pat:sub(i + 1, i + 1) ~= "]" then
+      local nc = pat:sub(i + 1, i + 1)
+      if nc:match("^[%w]$") and items[#items] and items[#items]:match("^%w$") then
+        table.insert(items, "-" .. nc)
+      else
+        translatable = false
+      end
+      i = i + 2
+    else
+      local stop = char_end(pat, i)
+      local char = pat:sub(i, stop)
+      if #char > 1 then
+        -- Lua patterns match bytes, not characters
+        translatable = false
+      end
+      table.insert(items, escape_lua(char))
+      i = stop + 1
+    end
+    first = false
+  end
+  return nil, i
+end
+
+---Parse a sequence of tokens from a very magic (\v) vim regex
+---@param pat string
+---@param i integer
+---@param in_group boolean
+---@return nil|overseer.RegexToken[]
+---@return integer
+local function parse_vim_seq(pat, i, in_group)
+  local tokens = {}
+  local seq_start = i
+  while i <= #pat do
+    local c = pat:sub(i, i)
+    if c == "\\" then
+      local nc = pat:sub(i + 1, i + 1)
+      if nc == "" then
+        return nil, i
+      elseif vim_classes[nc] then
+        table.insert(
+          tokens,
+          { type = "class", text = vim_classes[nc][1], negated = vim_classes[nc][2] }
+        )
+      elseif nc == "t" then
+        table.insert(tokens, { type = "lit", text = "\t" })
+      elseif nc:match("^%w$") or nc == "_" then
+        -- \zs, \c, backreferences, other character classes, \_s and friends, etc
+        return nil, i
+      else
+        table.insert(tokens, { type = "lit", text = nc })
+      end
+      i = i + 2
+    elseif c == "%" then
+      if pat:sub(i + 1, i + 1) ~= "(" then
+        return nil, i
+      end
+      local inner
+      inner, i = parse_vim_seq(pat, i + 2, true)
+      if not inner then
+        return nil, i
+      end
+      table.insert(tokens, { type = "group", capture = false, tokens = inner })
+    elseif c == "(" then
+      local inner
+      inner, i = parse_vim_seq(pat, i + 1, true)
+      if not inner then
+        return nil, i
+      end
+      table.insert(tokens, { type = "group", capture = true, tokens = inner })
+    elseif c == ")" then
+      if not in_group then
+        return nil, i
+      end
+      return tokens, i + 1
+    elseif c == "[" then
+      local token
+      token, i = parse_vim_collection(pat, i)
+      if not token then
+        return nil, i
+      end
+      table.insert(tokens, token)
+    elseif c == "." then
+      table.insert(tokens, { type = "any" })
+      i = i + 1
+    elseif c == "*" or c == "+" or c == "=" or c == "?" then
+      if vim.tbl_isempty(tokens) then
+        return nil, i
+      end
+      table.insert(tokens, { type = "quant", text = c == "=" and "?" or c })
+      i = i + 1
+    elseif c == "{" then
+      local stop = pat:find("}", i, true)
+      if not stop or vim.tbl_isempty(tokens) then
+        return nil, i
+      end
+      table.insert(tokens, { type = "quant", text = pat:sub(i, stop) })
+      i = stop + 1
+    elseif c == "^" then
+      if i ~= seq_start then
+        return nil, i
+      end
+      table.insert(tokens, { type = "bol" })
+      i = i + 1
+    elseif c == "$" then
+      local nc = pat:sub(i + 1, i + 1)
+      if nc ~= "" and nc ~= "|" and nc ~= ")" then
+        return nil, i
+      end
+      table.insert(tokens, { type = "eol" })
+      i = i + 1
+    elseif c == "|" then
+      table.insert(tokens, { type = "alt" })
+      i = i + 1
+    elseif c:match("^[<>@~&]$") then
+      -- Word boundaries, lookarounds, and other features that we don't handle
+      return nil, i
+    else
+      local stop = char_end(pat, i)
+      table.insert(tokens, { type = "lit", text = pat:sub(i, stop) })
+      i = stop + 1
+    end
+  end
+  if in_group then
+    return nil, i
+  end
+  return tokens, i
+end
+
+---@param pattern string
+---@return nil|overseer.RegexToken[]
+local function parse_vim_regex(pattern)
+  -- Only very magic regexes are supported
+  if pattern:sub(1, 2) ~= "\\v" then
+    return nil
+  end
+  return (parse_vim_seq(pattern, 3, false))
+end
+
+---@param tokens overseer.RegexToken[]
+---@return string[]
+local function tokens_to_literals(tokens)
+  local literals = {}
+  local current = {}
+  local function flush()
+    if not vim.tbl_isempty(current) then
+      local literal = table.concat(current)
+      if not vim.tbl_contains(literals, literal) then
+        table.insert(literals, literal)
+      end
+      current = {}
+    end
+  end
+  for i, token in ipairs(tokens) do
+    local next_token = tokens[i + 1]
+    if token.type == "alt" then
+      -- Any of the alternatives could match, so nothing is required
+      return {}
+    elseif token.type == "lit" then
+      local quant = next_token and next_token.type == "quant" and next_token.text
+      if not quant then
+        table.insert(current, token.text)
+      elseif quant == "+" then
+        table.insert(current, token.text)
+        flush()
+      else
+        flush()
+      end
+    elseif token.type ~= "quant" then
+      flush()
+    end
+  end
+  flush()
+  return literals
+end
+
+---Get the literal substrings that must appear in any line that matches a vim regex
+---@param pattern string
+---@return string[]
+M.vim_regex_literals = function(pattern)
+  local tokens = parse_vim_regex(pattern)
+  if not tokens then
+    return {}
+  end
+  return tokens_to_literals(tokens)
+end
+
+---Get the literal substrings that must appear in any line that matches a lua pattern
+---@param pattern string
+---@return string[]
+M.lua_pattern_literals = function(pattern)
+  local tokens = {}
+  local i = 1
+  while i <= #pattern do
+    local c = pattern:sub(i, i)
+    if c == "%" then
+      local nc = pattern:sub(i + 1, i + 1)
+      if nc == "b" then
+        table.insert(tokens, { type = "class" })
+        i = i + 4
+      elseif nc == "f" then
+        table.insert(tokens, { type = "class" })
+        i = i + 2
+      elseif nc:match("^%w$") then
+        table.insert(tokens, { type = "class" })
+        i = i + 2
+      elseif nc == "" then
+        return {}
+      else
+        table.insert(tokens, { type = "lit", text = nc })
+        i = i + 2
+      end
+    elseif c == "[" then
+      -- Skip to the end of the set
+      local j = i + 1
+      if pattern:sub(j, j) == "^" then
+        j = j + 1
+      end
+      if pattern:sub(j, j) == "]" then
+        j = j + 1
+      end
+      while j <= #pattern and pattern:sub(j, j) ~= "]" do
+        j = j + (pattern:sub(j, j) == "%" and 2 or 1)
+      end
+      if j > #pattern then
+        return {}
+      end
+      table.insert(tokens, { type = "class" })
+      i = j + 1
+    elseif c == "*" or c == "+" or c == "-" or c == "?" then
+      table.insert(tokens, { type = "quant", text = c })
+      i = i + 1
+    elseif c == "." or c == "(" or c == ")" then
+      table.insert(tokens, { type = "any" })
+      i = i + 1
+    elseif c == "^" and i == 1 then
+      table.insert(tokens, { type = "bol" })
+      i = i + 1
+    elseif c == "$" and i == #pattern then
+      table.insert(tokens, { type = "eol" })
+      i = i + 1
+    else
+      -- Quantifiers in lua patterns only apply to a single byte
+      table.insert(tokens, { type = "lit", text = c })
+      i = i + 1
+    end
+  end
+  return tokens_to_literals(tokens)
+end
+
+---@param tokens overseer.RegexToken[]
+---@param top_level boolean
+---@return nil|string
+local function tokens_to_lua(tokens, top_level)
+  local ret = {}
+  local i = 1
+  while i <= #tokens do
+    local token = tokens[i]
+    local next_token = tokens[i + 1]
+    local quant = next_token and next_token.type == "quant" and next_token.text
+    local atom
+    if token.type == "lit" then
+      if quant and #token.text > 1 then
+        return nil
+      end
+      atom = escape_lua(token.text)
+    elseif token.type == "class" then
+      atom = token.text
+      -- Lua patterns match bytes, so a negated class could match part of a multibyte character
+      if not atom or (token.negated and (not quant or quant == "?")) then
+        return nil
+      end
+    elseif token.type == "any" then
+      if not quant or quant == "?" then
+        return nil
+      end
+      atom = "."
+    elseif token.type == "group" then
+      -- Lua patterns cannot apply quantifiers to groups or nest captures
+      if quant or not top_level then
+        return nil
+      end
+      local inner = tokens_to_lua(assert(token.tokens), false)
+      if not inner or inner == "" then
+        return nil
+      end
+      atom = token.capture and ("(" .. inner .. ")") or inner
+    elseif token.type == "bol" then
+      if i ~= 1 or not top_level then
+        return nil
+      end
+      atom = "^"
+    elseif token.type == "eol" then
+      if i ~= #tokens or not top_level then
+        return nil
+      end
+      atom = "$"
+    else
+      -- alternation, or a quantifier with nothing to apply to
+      return nil
+    end
+
+    if quant then
+      if quant == "*" or quant == "{}" then
+        atom = atom .. "*"
+      elseif quant == "+" then
+        atom = atom .. "+"
+      elseif quant == "?" then
+        atom = atom .. "?"
+      elseif quant == "{-}" then
+        atom = atom .. "-"
+      elseif quant == "{-1,}" then
+        atom = atom .. atom .. "-"
+      else
+        return nil
+      end
+      i = i + 1
+    end
+    table.insert(ret, atom)
+    i = i + 1
+  end
+  return table.concat(ret)
+end
+
+---Translate a very magic vim regex into an equivalent lua pattern, if possible
+---@param pattern string
+---@return nil|string
+M.vim_regex_to_lua = function(pattern)
+  local tokens = parse_vim_regex(pattern)
+  if not tokens then
+    return nil
+  end
+  -- With no captures, string.match returns the whole match instead of the submatches
+  local has_capture = false
+  for _, token in ipairs(tokens) do
+    if token.type == "group" and token.capture then
+      has_capture = true
+    end
+  end
+  if not has_capture then
+    return nil
+  end
+  return tokens_to_lua(tokens, true)
+end
+
+return M
@@ -0,0 +1,125 @@
+-- Shared pool of slots for tasks that are started on behalf of another task (orchestrator subtasks
+-- and dependencies). Works like the make jobserver: once config.max_parallel tasks are running,
+-- the rest wait in a queue and are started as running tasks finish. Orchestrator tasks don't use a
+-- slot, because they only wait on their own subtasks. If they did, nested orchestrators could use up
+-- all of the slots and leave none for the subtasks that they are waiting on.
+local config = require("overseer.config")
+local task_list = require("overseer.task_list")
+local M = {}
+
+---@class (exact) overseer.SchedulerEntry
+---@field task_id integer
+---@field priority integer
+
+---@type overseer.SchedulerEntry[]
+local queue = {}
+---@type table<integer, boolean>
+local running = {}
+local num_running = 0
+local process_scheduled = false
+
+---@return boolean
+local function has_slot()
+  return config.max_parallel <= 0 or num_running < config.max_parallel
+end
+
+---@param task overseer.Task
+---@return boolean
+local function uses_slot(task)
+  return task.strategy.name ~= "orchestrator"
+end
+
+---@param task_id integer
+local function release(task_id)
+  if running[task_id] then
+    running[task_id] = nil
+    num_running = num_running - 1
+    M.process()
+  end
+end
+
+---@param task overseer.Task
+local function start_task(task)
+  task:start()
+  -- The task may not actually start (e.g. if it is waiting on its own dependencies)
+  if not task:is_running() or not uses_slot(task) then
+    return
+  end
+  running[task.id] = true
+  num_running = num_running + 1
+  task:subscribe("on_status", function()
+    if task:is_running() then
+      return
+    end
+    release(task.id)
+    return true
+  end)
+end
+
+---Start queued tasks until there are no more free slots
+M.process = function()
+  if process_scheduled then
+    return
+  end
+  process_scheduled = true
+  -- Defer so that we don't start tasks from inside the event handlers of the task that finished
+  vim.schedule(function()
+    process_scheduled = false
+    local i = 1
+    while i <= #queue do
+      local task = task_list.get(queue[i].task_id)
+      if not task or not task:is_pending() then
+        table.remove(queue, i)
+      elseif not uses_slot(task) or has_slot() then
+        table.remove(queue, i)
+        start_task(task)
+      else
+        i = i + 1
+      end
+    end
+  end)
+end
+
+---Start a task once a slot is free
+---@param task overseer.Task
+---@param priority? integer When multiple tasks are waiting, the ones with the highest priority are started first
+M.start = function(task, priority)
+  if M.is_queued(task.id) or not task:is_pending() then
+    return
+  end
+  priority = priority or 0
+  -- Insert after all entries of the same or higher priority so that equal priorities are FIFO
+  local idx = #queue + 1
+  for i, entry in ipairs(queue) do
+    if entry.priority < priority then
+      idx = i
+      break
+    end
+  end
+  table.insert(queue, idx, { task_id = task.id, priority = priority })
+  M.process()
+end
+
+---Remove a task from the queue if it has not been started yet
+---@param task_id integer
+M.cancel = function(task_id)
+  for i, entry in ipairs(queue) do
+    if entry.task_id == task_id then
+      table.remove(queue, i)
+      return
+    end
+  end
+end
+
+---@param task_id integer
+---@return boolean
+M.is_queued = function(task_id)
+  for _, entry in ipairs(queue) do
+    if entry.task_id == task_id then
+      return true
+    end
+  end
+  return false
+end
+
+return M
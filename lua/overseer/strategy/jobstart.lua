@@ -1,4 +1,7 @@
+local config = require("overseer.config")
 local log = require("overseer.log")
+local output_batcher = require("overseer.output_batcher")
+local output_pager = require("overseer.output_pager")
 local overseer = require("overseer")
 local util = require("overseer.util")
 
@@ -43,6 +46,8 @@ end
 ---@field bufnr nil|integer
 ---@field job_id nil|integer
 ---@field term_id nil|integer
+---@field output_batcher nil|overseer.OutputBatcher
+---@field pager nil|overseer.OutputPager
 ---@field opts overseer.JobstartStrategyOpts
 local JobstartStrategy = {}
 
@@ -76,6 +81,7 @@ function JobstartStrategy:reset()
     util.soft_delete_buf(self.bufnr)
     self.bufnr = nil
     self.term_id = nil
+    self.pager = nil
   end
   if self.job_id and self.job_id > 0 then
     vim.fn.jobstop(self.job_id)
@@ -187,11 +193,23 @@ function JobstartStrategy:start(task)
   end
   if not self.bufnr then
     self:_init_buffer()
+    -- With preserve_output the buffer also holds the output of previous runs, which is not in the
+    -- output store, so it can't be trimmed
+    if not self.opts.use_terminal and not self.opts.preserve_output then
+      self.pager =
+        output_pager.new(self.bufnr, task:get_output_store(), config.output.max_memory_lines)
+    end
   end
 
   local stdout_iter = util.get_stdout_line_iter()
 
-  local function on_stdout(data)
+  local batcher
+  ---@param chunks string[][]
+  local function on_output(chunks)
+    if self.output_batcher ~= batcher then
+      return
+    end
+    local data = output_batcher.merge_job_data(chunks)
     -- Update the buffer
     if wrap_term then
       -- don't do anything
@@ -204,7 +222,7 @@ function JobstartStrategy:start(task)
       else
         table.insert(self.pending_output, data)
       end
-    else
+    elseif self.bufnr and vim.api.nvim_buf_is_valid(self.bufnr) then
       -- Track which wins we will need to scroll
       local trail_wins = {}
       local line_count = vim.api.nvim_buf_line_count(self.bufnr)
@@ -222,9 +240,12 @@ function JobstartStrategy:start(task)
       vim.api.nvim_buf_set_lines(self.bufnr, -2, -1, true, end_lines)
       vim.bo[self.bufnr].modifiable = false
       vim.bo[self.bufnr].modified = false
+      if self.pager then
+        self.pager:trim()
+      end
 
       -- Scroll to end of updated windows so we can tail output
-      local lnum = line_count + #end_lines - 1
+      local lnum = vim.api.nvim_buf_line_count(self.bufnr)
       local col = vim.api.nvim_strwidth(end_lines[#end_lines])
       for _, winid in ipairs(trail_wins) do
         vim.api.nvim_win_set_cursor(winid, { lnum, col })
@@ -233,11 +254,23 @@ function JobstartStrategy:start(task)
 
     -- Send output to task
     task:dispatch("on_output", data)
-    local lines = stdout_iter(data)
+    -- Run each chunk through the line iterator individually so that it sees the same chunks it
+    -- would without batching
+    local lines = {}
+    for _, chunk in ipairs(chunks) do
+      vim.list_extend(lines, stdout_iter(chunk))
+    end
     if not vim.tbl_isempty(lines) then
       task:dispatch("on_output_lines", lines)
     end
   end
+  batcher = output_batcher.new(on_output)
+  self.output_batcher = batcher
+
+  ---@param data string[]
+  local function on_stdout(data)
+    batcher:push(data, output_batcher.job_data_size(data))
+  end
 
   local function coalesce(a, b)
     if a == nil then
@@ -283,6 +316,7 @@ function JobstartStrategy:start(task)
       log.debug("Task %s exited with code %s", task.name, c)
       -- Feed one last line end to flush the output
       on_stdout({ "" })
+      batcher:flush()
       if self.opts.use_terminal then
         if self.term_id then
           pcall(
@@ -3,6 +3,7 @@
 local Task = require("overseer.task")
 local constants = require("overseer.constants")
 local log = require("overseer.log")
+local scheduler = require("overseer.scheduler")
 local task_list = require("overseer.task_list")
 local template = require("overseer.template")
 local util = require("overseer.util")
@@ -31,6 +32,13 @@ local function is_named_task(task)
   end
 end
 
+---Check if this is a task wrapped with dependency info, e.g. {task = "make", after = {"clean"}}
+---@param entry any
+---@return boolean
+local function is_dag_entry(entry)
+  return type(entry) == "table" and entry[1] == nil and entry.task ~= nil and entry.cmd == nil
+end
+
 ---@param tasks table
 ---@param cb fun(task: overseer.Task)
 local function for_each_task(tasks, cb)
@@ -44,16 +52,29 @@ local function for_each_task(tasks, cb)
   end
 end
 
+---@class (exact) overseer.OrchestratorNode
+---@field section integer Index of the section in the tasks table
+---@field index integer Index of the task in the section
+---@field deps overseer.OrchestratorNode[] Tasks that must succeed before this one can start
+---@field priority integer Length of the longest chain of tasks that depend on this one
+
 ---@class overseer.OrchestratorStrategy : overseer.Strategy
 ---@field bufnr integer
 ---@field task_defns table[][]
 ---@field tasks integer[][]
+---@field nodes overseer.OrchestratorNode[]
+---@field max_parallel? integer
 local OrchestratorStrategy = {}
 
 ---Strategy for a meta-task that manage a sequence of other tasks
 ---@param opts table
 ---    tasks table A list of task definitions to run. Can include sub-lists that will be run in parallel
+---    max_parallel nil|integer Maximum number of tasks to run at the same time
 ---@return overseer.Strategy
+---@note
+--- By default, a task will start once every task in the previous section has succeeded. To start
+--- it as soon as specific tasks have succeeded, wrap it in a table with a `task` key and list the
+--- `id`s of the tasks it depends on in `after`. `after` can only refer to earlier sections.
 ---@example
 --- overseer.new_task({
 ---   name = "Build and serve app",
@@ -69,19 +90,83 @@ local OrchestratorStrategy = {}
 ---     },
 ---   },
 --- })
+---
+--- -- Test each package as soon as it is built, with at most 4 tasks running at once
+--- overseer.new_task({
+---   name = "Build and test packages",
+---   strategy = {
+---     "orchestrator",
+---     max_parallel = 4,
+---     tasks = {
+---       {
+---         { task = "make core", id = "core" },
+---         { task = "make ui", id = "ui" },
+---       },
+---       {
+---         { task = "test core", after = { "core" } },
+---         { task = "test ui", after = { "ui" } },
+---       },
+---     },
+---   },
+--- })
 function OrchestratorStrategy.new(opts)
   vim.validate("opts", opts, "table")
   vim.validate("opts.tasks", opts.tasks, "table")
+  vim.validate("opts.max_parallel", opts.max_parallel, function(n)
+    return type(n) == "number" and n >= 1
+  end, true, "number >= 1")
   -- Each entry in tasks can be either a task definition, OR a list of task definitions.
   -- Convert it to each entry being a list of task definitions.
   local task_defns = {}
+  local nodes = {}
+  local dependents = {}
+  local prev_section = {}
+  local nodes_by_id = {}
   for i, v in ipairs(opts.tasks) do
-    if is_named_task(v) then
-      task_defns[i] = { v }
-    elseif vim.islist(v) then
-      task_defns[i] = v
-    else
-      task_defns[i] = { v }
+    local section = v
+    if is_named_task(v) or not vim.islist(v) then
+      section = { v }
+    end
+    task_defns[i] = {}
+    local section_nodes = {}
+    local section_ids = {}
+    for j, entry in ipairs(section) do
+      ---@type overseer.OrchestratorNode
+      local node = { section = i, index = j, deps = prev_section, priority = 1 }
+      if is_dag_entry(entry) then
+        if entry.after then
+          node.deps = {}
+          for _, id in ipairs(entry.after) do
+            local dep = nodes_by_id[id]
+            if not dep then
+              error(
+                string.format("Orchestrator task '%s' must be defined in an earlier section", id)
+              )
+            end
+            table.insert(node.deps, dep)
+          end
+        end
+        if entry.id then
+          section_ids[entry.id] = node
+        end
+        entry = entry.task
+      end
+      task_defns[i][j] = entry
+      for _, dep in ipairs(node.deps) do
+        dependents[dep] = dependents[dep] or {}
+        table.insert(dependents[dep], node)
+      end
+      table.insert(nodes, node)
+      table.insert(section_nodes, node)
+    end
+    prev_section = section_nodes
+    nodes_by_id = vim.tbl_extend("error", nodes_by_id, section_ids)
+  end
+  -- Dependencies always come before the task, so iterate backwards to calculate the priorities
+  for i = #nodes, 1, -1 do
+    local node = nodes[i]
+    for _, dependent in ipairs(dependents[node] or {}) do
+      node.priority = math.max(node.priority, dependent.priority + 1)
     end
   end
   local strategy = {
@@ -89,6 +174,8 @@ function OrchestratorStrategy.new(opts)
     bufnr = vim.api.nvim_create_buf(false, true),
     task_defns = task_defns,
     tasks = {},
+    nodes = nodes,
+    max_parallel = opts.max_parallel,
   }
   setmetatable(strategy, { __index = OrchestratorStrategy })
   ---@type overseer.OrchestratorStrategy
@@ -143,6 +230,7 @@ end
 function OrchestratorStrategy:reset()
   self.task = nil
   for_each_task(self.tasks, function(task)
+    scheduler.cancel(task.id)
     task:reset()
   end)
 end
@@ -151,46 +239,89 @@ function OrchestratorStrategy:get_bufnr()
   return self.bufnr
 end
 
----@param task_ids integer[]
-local function get_status(task_ids)
-  for _, v in ipairs(task_ids) do
-    local task = task_list.get(v)
-    local status = task and task.status or STATUS.FAILURE
-    if status ~= STATUS.SUCCESS then
-      return status
+---@private
+---@param node overseer.OrchestratorNode
+---@return nil|overseer.Task
+---@return boolean built False if the task has not been created yet
+function OrchestratorStrategy:get_node_task(node)
+  local id = self.tasks[node.section] and self.tasks[node.section][node.index]
+  if not id or id == -1 then
+    return nil, false
+  end
+  return task_list.get(id), true
+end
+
+---@private
+---@param node overseer.OrchestratorNode
+---@return boolean
+function OrchestratorStrategy:deps_succeeded(node)
+  for _, dep in ipairs(node.deps) do
+    local task = self:get_node_task(dep)
+    if not task or task.status ~= STATUS.SUCCESS then
+      return false
     end
   end
-  return STATUS.SUCCESS
+  return true
+end
+
+---@private
+---@param status overseer.Status
+function OrchestratorStrategy:finalize(status)
+  for_each_task(self.tasks, function(task)
+    scheduler.cancel(task.id)
+  end)
+  if self.task and self.task:is_running() then
+    ---@diagnostic disable-next-line: invisible
+    self.task:finalize(status)
+  end
 end
 
 function OrchestratorStrategy:start_next()
   if self.task and not self.task:is_complete() then
     local all_success = true
-    for i, section in ipairs(self.tasks) do
-      all_success = false
-      local status = get_status(section)
-      if status == STATUS.PENDING then
-        for _, id in ipairs(section) do
-          local task = task_list.get(id)
-          if task and task:is_pending() then
-            task:start()
-          end
+    local in_flight = 0
+    local ready = {}
+    for _, node in ipairs(self.nodes) do
+      local task, built = self:get_node_task(node)
+      local status = task and task.status or STATUS.FAILURE
+      if not built then
+        all_success = false
+      elseif status == STATUS.PENDING then
+        all_success = false
+        if scheduler.is_queued(task.id) then
+          in_flight = in_flight + 1
+        elseif self:deps_succeeded(node) then
+          table.insert(ready, node)
         end
-        break
       elseif status == STATUS.RUNNING then
-        break
-      elseif status == STATUS.FAILURE or status == STATUS.CANCELED then
-        if self.task and self.task:is_running() then
-          ---@diagnostic disable-next-line: invisible
-          self.task:finalize(status)
-        end
-        break
+        all_success = false
+        in_flight = in_flight + 1
+      elseif status ~= STATUS.SUCCESS then
+        self:finalize(status == STATUS.CANCELED and status or STATUS.FAILURE)
+        self:render_buf()
+        return
       end
-      all_success = i == #self.tasks
     end
+
     if all_success then
-      ---@diagnostic disable-next-line: invisible
-      self.task:finalize(STATUS.SUCCESS)
+      self:finalize(STATUS.SUCCESS)
+    else
+      -- Start the tasks on the longest chain first so that they don't end up waiting on a slot
+      table.sort(ready, function(a, b)
+        if a.priority ~= b.priority then
+          return a.priority > b.priority
+        elseif a.section ~= b.section then
+          return a.section < b.section
+        end
+        return a.index < b.index
+      end)
+      for _, node in ipairs(ready) do
+        if self.max_parallel and in_flight >= self.max_parallel then
+          break
+        end
+        scheduler.start(assert(self:get_node_task(node)), node.priority)
+        in_flight = in_flight + 1
+      end
     end
   end
   self:render_buf()
@@ -210,9 +341,7 @@ function OrchestratorStrategy:build_task(defn, i, j)
   local function finalize_subtask(task)
     task:add_component("orchestrator.on_status_broadcast")
     self.tasks[i][j] = task.id
-    if self:section_complete(1) then
-      self:start_next()
-    end
+    self:start_next()
   end
 
   if type(defn) == "table" and defn[1] == nil then
@@ -228,8 +357,7 @@ function OrchestratorStrategy:build_task(defn, i, j)
   template.get_by_name(name, search, function(tmpl)
     if not tmpl then
       log.error("Orchestrator could not find task '%s'", name)
-      ---@diagnostic disable-next-line: invisible
-      self.task:finalize(STATUS.FAILURE)
+      self:finalize(STATUS.FAILURE)
       return
     end
     local build_opts = {
@@ -242,8 +370,7 @@ function OrchestratorStrategy:build_task(defn, i, j)
       vim.schedule_wrap(function(err, task_defn)
         if err then
           log.warn("Canceled building task '%s' with error '%s'", name, err)
-          ---@diagnostic disable-next-line: invisible
-          self.task:finalize(STATUS.FAILURE)
+          self:finalize(STATUS.FAILURE)
           return
         end
         if params.cwd then
@@ -260,25 +387,11 @@ function OrchestratorStrategy:build_task(defn, i, j)
   end)
 end
 
----Check if we have fully created all of the tasks in a section
----@private
----@param idx integer
-function OrchestratorStrategy:section_complete(idx)
-  if self.task_defns[idx] == nil then
-    return true
-  end
-  for _, v in ipairs(self.tasks[idx]) do
-    if v == -1 then
-      return false
-    end
-  end
-  return vim.tbl_count(self.tasks[idx]) == vim.tbl_count(self.task_defns[idx])
-end
-
 ---@param task overseer.Task
 function OrchestratorStrategy:start(task)
   self.task = task
   task:add_component("orchestrator.on_broadcast_update_orchestrator")
+  -- Build all of the tasks up front so that the template lookups run concurrently
   for i, section in ipairs(self.task_defns) do
     self.tasks[i] = self.tasks[i] or {}
     for j, def in ipairs(section) do
@@ -289,21 +402,21 @@ function OrchestratorStrategy:start(task)
     end
   end
 
-  if self:section_complete(1) then
-    vim.schedule(function()
-      self:start_next()
-    end)
-  end
+  vim.schedule(function()
+    self:start_next()
+  end)
 end
 
 function OrchestratorStrategy:stop()
   for_each_task(self.tasks, function(task)
+    scheduler.cancel(task.id)
     task:stop()
   end)
 end
 
 function OrchestratorStrategy:dispose()
   for_each_task(self.tasks, function(task)
+    scheduler.cancel(task.id)
     task:dispose()
   end)
   util.soft_delete_buf(self.bufnr)
@@ -1,4 +1,7 @@
+local config = require("overseer.config")
 local log = require("overseer.log")
+local output_batcher = require("overseer.output_batcher")
+local output_pager = require("overseer.output_pager")
 local overseer = require("overseer")
 local util = require("overseer.util")
 
@@ -60,6 +63,8 @@ end
 ---@class overseer.SystemStrategy : overseer.Strategy
 ---@field bufnr nil|integer
 ---@field handle nil|vim.SystemObj
+---@field output_batcher nil|overseer.OutputBatcher
+---@field pager nil|overseer.OutputPager
 ---@field opts overseer.SystemStrategyOpts
 local SystemStrategy = {}
 
@@ -85,6 +90,7 @@ function SystemStrategy:reset()
   if self.bufnr then
     util.soft_delete_buf(self.bufnr)
     self.bufnr = nil
+    self.pager = nil
   end
   if self.handle then
     graceful_kill(self.handle)
@@ -103,15 +109,34 @@ function SystemStrategy:start(task)
   if not self.bufnr then
     self.bufnr = vim.api.nvim_create_buf(false, true)
     vim.bo[self.bufnr].modifiable = false
+    self.pager =
+      output_pager.new(self.bufnr, task:get_output_store(), config.output.max_memory_lines)
   end
 
   local stdout_iter = util.get_stdout_line_iter()
 
-  ---@param data string
-  local on_output = vim.schedule_wrap(function(data)
-    if not self.bufnr or not vim.api.nvim_buf_is_valid(self.bufnr) then
+  local batcher
+  ---@param chunks string[]
+  local function on_output(chunks)
+    if
+      self.output_batcher ~= batcher or not self.bufnr or not vim.api.nvim_buf_is_valid(self.bufnr)
+    then
       return
     end
+    -- Split each chunk individually so the line iterator sees the same chunks it would without
+    -- batching
+    local split_chunks = {}
+    local iter_lines = {}
+    for _, data in ipairs(chunks) do
+      if not wrap.text then
+        data = data:gsub("\r", "")
+      end
+      local chunk_data = vim.split(data, "\n")
+      table.insert(split_chunks, chunk_data)
+      vim.list_extend(iter_lines, stdout_iter(chunk_data))
+    end
+    local raw_data = output_batcher.merge_job_data(split_chunks)
+
     -- Update the buffer
     -- Track which wins we will need to scroll
     local trail_wins = {}
@@ -124,19 +149,18 @@ function SystemStrategy:start(task)
       end
     end
     local end_line = vim.api.nvim_buf_get_lines(self.bufnr, -2, -1, true)[1] or ""
-    if not wrap.text then
-      data = data:gsub("\r", "")
-    end
-    local raw_data = vim.split(data, "\n")
-    local lines = raw_data
+    local lines = vim.list_extend({}, raw_data)
     lines[1] = end_line .. lines[1]
     vim.bo[self.bufnr].modifiable = true
     vim.api.nvim_buf_set_lines(self.bufnr, -2, -1, true, lines)
     vim.bo[self.bufnr].modifiable = false
     vim.bo[self.bufnr].modified = false
+    if self.pager then
+      self.pager:trim()
+    end
 
     -- Scroll to end of updated windows so we can tail output
-    local lnum = line_count + #lines - 1
+    local lnum = vim.api.nvim_buf_line_count(self.bufnr)
     local col = vim.api.nvim_strwidth(lines[#lines])
     for _, winid in ipairs(trail_wins) do
       vim.api.nvim_win_set_cursor(winid, { lnum, col })
@@ -144,11 +168,12 @@ function SystemStrategy:start(task)
 
     -- Send output to task
     task:dispatch("on_output", raw_data)
-    local iter_lines = stdout_iter(raw_data)
     if not vim.tbl_isempty(iter_lines) then
       task:dispatch("on_output_lines", iter_lines)
     end
-  end)
+  end
+  batcher = output_batcher.new(on_output)
+  self.output_batcher = batcher
 
   local handle
   local outputs = {}
@@ -178,7 +203,7 @@ function SystemStrategy:start(task)
         end)
       end
       if self.handle == handle and data then
-        on_output(data)
+        batcher:push(data, #data)
       end
     end
   end
@@ -215,7 +240,8 @@ function SystemStrategy:start(task)
         return
       end
       -- Feed one last line end to flush the output
-      on_output("\n")
+      batcher:push("\n", 1)
+      batcher:flush()
       vim.bo[self.bufnr].modifiable = true
       vim.api.nvim_buf_set_lines(
         self.bufnr,
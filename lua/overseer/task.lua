@@ -3,9 +3,11 @@ local config = require("overseer.config")
 local constants = require("overseer.constants")
 local layout = require("overseer.layout")
 local log = require("overseer.log")
+local output_store = require("overseer.output_store")
 local shell = require("overseer.shell")
 local strategy = require("overseer.strategy")
 local task_list = require("overseer.task_list")
+local trace = require("overseer.trace")
 local util = require("overseer.util")
 
 local STATUS = constants.STATUS
@@ -30,13 +32,24 @@ local STATUS = constants.STATUS
 ---@field parent_id? integer ID of parent task. Used only to visually group tasks in the task list
 ---@field time_start? integer Timestamp when the task was started (os.time())
 ---@field time_end? integer Timestamp when the task ended (os.time())
+---@field revision integer Incremented every time the task changes. Used to invalidate cached renders
 ---@field private from_template? overseer.TemplateSource
 ---@field private prev_bufnr? integer
+---@field private output_store overseer.OutputStore
 ---@field private _subscribers table<string, overseer.TaskEventHandler[]>
+---@field private _handlers table<string, overseer.Component[]> Components that implement each event, in order
+---@field private _timings table<string, table<string, overseer.ComponentTiming>>
 local Task = {}
 
 ---@alias overseer.TaskEventHandler fun(task: overseer.Task, ...: any): nil|boolean
 
+---@class (exact) overseer.ComponentTiming
+---@field calls integer Number of times the handler was called
+---@field time_ms number Total time spent in the handler
+
+-- Returned by dispatch() when no handler returns a value. Do not modify.
+local NO_RESULTS = {}
+
 local next_id = 1
 
 ---@class (exact) overseer.TaskDefinition
@@ -121,7 +134,10 @@ function Task.new(opts)
     _references = 0,
     ephemeral = opts.ephemeral == true,
     _subscribers = {},
+    _handlers = {},
+    _timings = {},
     status = STATUS.PENDING,
+    revision = 0,
     cmd = opts.cmd,
     cwd = opts.cwd or vim.fn.getcwd(),
     env = opts.env,
@@ -130,6 +146,7 @@ function Task.new(opts)
     name = name,
     exit_code = nil,
     prev_bufnr = nil,
+    output_store = output_store.new(config.output.max_memory_lines),
     components = {},
     -- for internal use
     ---@diagnostic disable-next-line: invisible
@@ -152,6 +169,13 @@ function Task.new(opts)
     end)
   end
   task:subscribe("on_status", task_list.on_task_updated)
+  task:subscribe("on_output_lines", function(_, lines)
+    task.output_store:append(lines)
+    if trace.enabled then
+      local key = string.format("%s (%d)", task.name, task.id)
+      trace.counter("output_lines", { [key] = task.output_store:line_count() })
+    end
+  end)
   return task
 end
 
@@ -195,6 +219,7 @@ function Task:add_components(components)
   local new_comps = component.resolve(components, self.components)
   for _, v in ipairs(component.load(new_comps, self.default_component_params)) do
     table.insert(self.components, v)
+    self._handlers = {}
     -- Only call on_init if the task is initialized
     if self.id and v.on_init then
       v:on_init(self)
@@ -231,6 +256,7 @@ function Task:set_components(components)
       if not replaced then
         table.insert(self.components, new_comp)
       end
+      self._handlers = {}
       if new_comp.on_init then
         new_comp:on_init(self)
       end
@@ -276,6 +302,7 @@ function Task:remove_components(names)
   for i = #indexes, 1, -1 do
     local idx = indexes[i]
     local comp = table.remove(self.components, idx)
+    self._handlers = {}
     if comp.on_dispose then
       comp:on_dispose(self)
     end
@@ -291,6 +318,13 @@ function Task:has_component(name)
   return vim.tbl_isempty(new_comps)
 end
 
+---Get the time spent by each component handling each event. Only recorded when the
+---profile_components config option is enabled.
+---@return table<string, table<string, overseer.ComponentTiming>> timings Mapping of component name to event name to timing
+function Task:get_component_timings()
+  return self._timings
+end
+
 ---Subscribe to events on this task
 ---@param event string
 ---@param callback fun(task: overseer.Task, ...: any): nil|boolean Callback can return a truthy value to unsubscribe itself
@@ -308,13 +342,18 @@ end
 ---@param event string
 ---@param callback fun(task: overseer.Task, ...: any)
 function Task:unsubscribe(event, callback)
-  if self._subscribers[event] then
-    for i, v in ipairs(self._subscribers[event]) do
+  local subscribers = self._subscribers[event]
+  if subscribers then
+    for i, v in ipairs(subscribers) do
       if v == callback then
-        table.remove(self._subscribers[event], i)
-        return
+        table.remove(subscribers, i)
+        break
       end
     end
+    -- Remove empty lists so that dispatch can skip events with no handlers
+    if vim.tbl_isempty(subscribers) then
+      self._subscribers[event] = nil
+    end
   end
 end
 
@@ -351,6 +390,13 @@ function Task:get_bufnr()
   end
 end
 
+---Get the complete output of the task. Unlike the output buffer, this is not limited by the
+---terminal scrollback. Only the most recent lines are kept in memory; older lines are read from disk.
+---@return overseer.OutputStore
+function Task:get_output_store()
+  return self.output_store
+end
+
 ---Open the task output in a window
 ---@param direction? "float"|"tab"|"vertical"|"horizontal"
 ---@note
@@ -430,6 +476,7 @@ function Task:reset()
   self.status = STATUS.PENDING
   self:dispatch("on_status", self.status)
   self.strategy:reset()
+  self.output_store:clear()
   self:dispatch("on_reset")
 end
 
@@ -447,30 +494,57 @@ end
 ---@param name string
 ---@return any[]
 function Task:dispatch(name, ...)
-  local ret = {}
-  for _, comp in ipairs(self.components) do
-    if type(comp[name]) == "function" then
-      local ok, err = pcall(comp[name], comp, self, ...)
-      if not ok then
-        log.error("Task %s dispatch %s.%s: %s", self.name, comp.name, name, err)
-      elseif err ~= nil then
-        table.insert(ret, err)
+  local handlers = self._handlers[name]
+  if not handlers then
+    handlers = {}
+    for _, comp in ipairs(self.components) do
+      if type(comp[name]) == "function" then
+        table.insert(handlers, comp)
       end
     end
+    self._handlers[name] = handlers
+  end
+  local subscribers = self._subscribers[name]
+
+  local ret = NO_RESULTS
+  local profile = config.profile_components
+  local tracing = trace.enabled
+  for _, comp in ipairs(handlers) do
+    local start = profile and vim.uv.hrtime()
+    local span
+    if tracing then
+      span = trace.begin(comp.name .. "." .. name, "component", { task = self.name })
+    end
+    local ok, err = pcall(comp[name], comp, self, ...)
+    trace.finish(span)
+    if start then
+      self:record_timing(comp.name, name, start)
+    end
+    if not ok then
+      log.error("Task %s dispatch %s.%s: %s", self.name, comp.name, name, err)
+    elseif err ~= nil then
+      if ret == NO_RESULTS then
+        ret = {}
+      end
+      table.insert(ret, err)
+    end
   end
-  if self._subscribers[name] then
-    local to_unsub = {}
-    for _, cb in ipairs(self._subscribers[name]) do
+  if subscribers then
+    local to_unsub
+    for _, cb in ipairs(subscribers) do
       local ok, err = pcall(cb, self, ...)
       if not ok then
         log.error("Task %s dispatch callback %s: %s", self.name, name, err)
       elseif err then
         -- A truthy return value means unsubscribe
+        to_unsub = to_unsub or {}
         table.insert(to_unsub, cb)
       end
     end
-    for _, unsub_cb in ipairs(to_unsub) do
-      util.tbl_remove(self._subscribers[name], unsub_cb)
+    if to_unsub then
+      for _, unsub_cb in ipairs(to_unsub) do
+        self:unsubscribe(name, unsub_cb)
+      end
     end
   end
   if self.id and not self:is_disposed() then
@@ -479,6 +553,26 @@ function Task:dispatch(name, ...)
   return ret
 end
 
+---@private
+---@param comp_name string
+---@param event string
+---@param start integer Start time from vim.uv.hrtime()
+function Task:record_timing(comp_name, event, start)
+  local elapsed_ms = (vim.uv.hrtime() - start) / 1e6
+  local comp_timings = self._timings[comp_name]
+  if not comp_timings then
+    comp_timings = {}
+    self._timings[comp_name] = comp_timings
+  end
+  local timing = comp_timings[event]
+  if timing then
+    timing.calls = timing.calls + 1
+    timing.time_ms = timing.time_ms + elapsed_ms
+  else
+    comp_timings[event] = { calls = 1, time_ms = elapsed_ms }
+  end
+end
+
 ---@private
 ---@param status overseer.Status
 function Task:finalize(status)
@@ -560,6 +654,7 @@ function Task:dispose(force)
   self:dispatch("on_status", self.status)
   log.debug("Disposing task %s", self.name)
   self.strategy:dispose()
+  self.output_store:clear()
   self:dispatch("on_dispose")
   task_list.remove(self)
   util.soft_delete_buf(bufnr)
@@ -624,7 +719,9 @@ function Task:start()
     return false
   end
   log.debug("Starting task %s", self.name)
+  local span = trace.begin(self.strategy.name, "strategy", { task = self.name })
   local ok, err = pcall(self.strategy.start, self.strategy, self)
+  trace.finish(span)
   if not ok then
     log.error("Strategy '%s' failed to start for task '%s': %s", self.strategy.name, self.name, err)
     return false
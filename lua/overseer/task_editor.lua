@@ -307,7 +307,7 @@ function Editor:add_new_component(insert_position)
     kind = "overseer_new_component",
     format_item = function(item)
       local name = util.align(item, longest_option, "left")
-      local comp = component.get(item)
+      local comp = component.get_info(item)
       if comp then
         if comp.desc then
           return string.format("%s %s", name, comp.desc)
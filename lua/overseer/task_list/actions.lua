@@ -175,21 +175,18 @@ M = {
   ["open output in quickfix"] = {
     desc = "open the entire task output in quickfix",
     condition = function(task)
-      local bufnr = task:get_bufnr()
-      return task:is_complete()
-        and bufnr ~= nil
-        and vim.api.nvim_buf_is_valid(bufnr)
-        and vim.api.nvim_buf_is_loaded(bufnr)
-    end,
-    run = function(task)
-      local lines = vim.api.nvim_buf_get_lines(assert(task:get_bufnr()), 0, -1, true)
-      vim.fn.setqflist({}, " ", {
-        title = task.name,
-        lines = lines,
-        -- Peep into the default component params to fetch the errorformat
-        ---@diagnostic disable-next-line: invisible
-        efm = task.default_component_params.errorformat,
-      })
+      return task:is_complete() and task:get_output_store():line_count() > 0
+    end,
+    run = function(task)
+      -- Peep into the default component params to fetch the errorformat
+      ---@diagnostic disable-next-line: invisible
+      local efm = task.default_component_params.errorformat
+      vim.fn.setqflist({}, " ", { title = task.name })
+      local qf_id = vim.fn.getqflist({ id = 0 }).id
+      -- Add the output in chunks so that all of it is never in memory at once
+      for lines in task:get_output_store():iter_chunks(10000) do
+        vim.fn.setqflist({}, "a", { id = qf_id, lines = lines, efm = efm })
+      end
       vim.cmd("botright copen")
     end,
   },
@@ -1,3 +1,4 @@
+local config = require("overseer.config")
 local util = require("overseer.util")
 local M = {}
 
@@ -5,8 +6,36 @@ local M = {}
 local tasks = {}
 ---@type table<integer, overseer.Task>
 local lookup = {}
----@type table<function, overseer.Task[]>
-local sorted_cache = {}
+---The fields of each task that the indexes were built from
+---@type table<integer, overseer.TaskIndexKey>
+local indexed = {}
+---@type table<overseer.Status, table<integer, overseer.Task>>
+local by_status = {}
+---Tasks with the same name, ordered by ID
+---@type table<string, overseer.Task[]>
+local by_name = {}
+---Sorted views of the tasks that are kept up to date as tasks change. There is at most one for each
+---of the built-in sort functions.
+---@type table<function, overseer.TaskListView>
+local views = {}
+
+---@class (exact) overseer.TaskIndexKey
+---@field status overseer.Status
+---@field name string
+---@field parent_id? integer
+---@field wrapped boolean
+---@field time_start? integer
+---@field time_end? integer
+
+---@class (exact) overseer.TaskListView
+---@field sort fun(a: overseer.Task, b: overseer.Task): boolean
+---@field top_level overseer.Task[] Sorted top-level tasks
+---@field children table<integer, overseer.Task[]> Sorted child tasks, grouped by parent ID
+---@field flat table<boolean, overseer.TaskListFlat> Built lazily. Keyed by whether wrapped tasks are included.
+
+---@class (exact) overseer.TaskListFlat
+---@field tasks overseer.Task[] Sorted tasks, with child tasks placed after their parent
+---@field position table<overseer.Task, integer>
 
 ---@return integer
 M.get_or_create_bufnr = function()
@@ -15,52 +44,194 @@ M.get_or_create_bufnr = function()
 end
 
 local function dispatch()
-  sorted_cache = {}
   vim.api.nvim_exec_autocmds("User", { pattern = "OverseerListUpdate", modeline = false })
 end
 
+---@param a overseer.Task
+---@param b overseer.Task
+---@return boolean
+local function sort_by_id(a, b)
+  return a.id < b.id
+end
+
+---Insert a task into a sorted list, after any tasks that compare equal to it
+---@param list overseer.Task[]
+---@param task overseer.Task
+---@param sort fun(a: overseer.Task, b: overseer.Task): boolean
+local function sorted_insert(list, task, sort)
+  local lo, hi = 1, #list + 1
+  while lo < hi do
+    local mid = math.floor((lo + hi) / 2)
+    if sort(task, list[mid]) then
+      hi = mid
+    else
+      lo = mid + 1
+    end
+  end
+  table.insert(list, lo, task)
+end
+
+---@param view overseer.TaskListView
+---@param task overseer.Task
+---@param parent_id? integer
+local function view_add(view, task, parent_id)
+  if parent_id then
+    local group = view.children[parent_id]
+    if not group then
+      group = {}
+      view.children[parent_id] = group
+    end
+    sorted_insert(group, task, view.sort)
+  else
+    sorted_insert(view.top_level, task, view.sort)
+  end
+  view.flat = {}
+end
+
+---@param view overseer.TaskListView
+---@param task overseer.Task
+---@param parent_id? integer
+local function view_remove(view, task, parent_id)
+  if parent_id then
+    local group = view.children[parent_id]
+    if group then
+      util.tbl_remove(group, task)
+      if vim.tbl_isempty(group) then
+        view.children[parent_id] = nil
+      end
+    end
+  else
+    util.tbl_remove(view.top_level, task)
+  end
+  view.flat = {}
+end
+
+---Views are only cached for sort functions that we know compare nothing but the fields in
+---overseer.TaskIndexKey. A view for any other sort function could go stale, and caching one for
+---every closure that is passed to list_tasks would grow without bound.
+---@param sort fun(a: overseer.Task, b: overseer.Task): boolean
+---@return boolean
+local function is_indexed_sort(sort)
+  return sort == M.default_sort
+    or sort == M.sort_newest_first
+    or sort == M.sort_finished_recently
+    or sort == config.get_default_task_list_sort()
+end
+
 ---@param sort? fun(a: overseer.Task, b: overseer.Task): boolean Function that sorts tasks
-local function get_sorted_tasks(sort)
+---@return overseer.TaskListView
+local function get_view(sort)
   if not sort then
     sort = M.sort_newest_first
   end
-  if sorted_cache[sort] then
-    return sorted_cache[sort]
+  local view = views[sort]
+  if view then
+    return view
   end
 
-  local child_groups = {}
-  local top_level = {}
+  view = { sort = sort, top_level = {}, children = {}, flat = {} }
   for _, task in ipairs(tasks) do
-    if task.parent_id then
-      local group = child_groups[task.parent_id]
+    local parent_id = indexed[task.id].parent_id
+    if parent_id then
+      local group = view.children[parent_id]
       if not group then
         group = {}
-        child_groups[task.parent_id] = group
+        view.children[parent_id] = group
       end
       table.insert(group, task)
     else
-      table.insert(top_level, task)
+      table.insert(view.top_level, task)
     end
   end
-
-  table.sort(top_level, sort)
-  for _, children in pairs(child_groups) do
+  table.sort(view.top_level, sort)
+  for _, children in pairs(view.children) do
     table.sort(children, sort)
   end
+  if is_indexed_sort(sort) then
+    views[sort] = view
+  end
+  return view
+end
 
-  local ret = {}
-  for _, task in ipairs(top_level) do
-    table.insert(ret, task)
-    local children = child_groups[task.id]
+---@param view overseer.TaskListView
+---@param wrapped boolean Include tasks that were created by the jobstart/vim.system wrappers
+---@return overseer.TaskListFlat
+local function get_flat(view, wrapped)
+  local flat = view.flat[wrapped]
+  if flat then
+    return flat
+  end
+
+  flat = { tasks = {}, position = {} }
+  local function add(task)
+    if wrapped or not task.source then
+      table.insert(flat.tasks, task)
+      flat.position[task] = #flat.tasks
+    end
+  end
+  for _, task in ipairs(view.top_level) do
+    add(task)
+    local children = view.children[task.id]
     if children then
       for _, child in ipairs(children) do
-        table.insert(ret, child)
+        add(child)
       end
     end
   end
+  view.flat[wrapped] = flat
+  return flat
+end
 
-  sorted_cache[sort] = ret
-  return ret
+---@param task overseer.Task
+---@param key overseer.TaskIndexKey
+local function unindex_task(task, key)
+  by_status[key.status][task.id] = nil
+  local named = by_name[key.name]
+  util.tbl_remove(named, task)
+  if vim.tbl_isempty(named) then
+    by_name[key.name] = nil
+  end
+  for _, view in pairs(views) do
+    view_remove(view, task, key.parent_id)
+  end
+end
+
+---Update the indexes and sorted views for a task, but only if the fields they use have changed
+---@param task overseer.Task
+local function index_task(task)
+  local prev = indexed[task.id]
+  ---@type overseer.TaskIndexKey
+  local key = {
+    status = task.status,
+    name = task.name,
+    parent_id = task.parent_id,
+    wrapped = task.source ~= nil,
+    time_start = task.time_start,
+    time_end = task.time_end,
+  }
+  if prev and vim.deep_equal(prev, key) then
+    return
+  end
+  if prev then
+    unindex_task(task, prev)
+  end
+  indexed[task.id] = key
+
+  local statuses = by_status[key.status]
+  if not statuses then
+    statuses = {}
+    by_status[key.status] = statuses
+  end
+  statuses[task.id] = task
+  local named = by_name[key.name]
+  if not named then
+    named = {}
+    by_name[key.name] = named
+  end
+  sorted_insert(named, task, sort_by_id)
+  for _, view in pairs(views) do
+    view_add(view, task, key.parent_id)
+  end
 end
 
 ---Trigger a re-render without re-sorting the tasks
@@ -69,10 +240,12 @@ M.touch = function(task)
   if not task or task:is_disposed() then
     return
   end
+  task.revision = task.revision + 1
   if not lookup[task.id] then
     lookup[task.id] = task
     table.insert(tasks, task)
   end
+  index_task(task)
   dispatch()
 end
 
@@ -82,13 +255,15 @@ end
 
 ---@param task overseer.Task
 M.remove = function(task)
-  lookup[task.id] = nil
-  for i, t in ipairs(tasks) do
-    if t.id == task.id then
-      table.remove(tasks, i)
-      break
-    end
+  if not lookup[task.id] then
+    return
   end
+  lookup[task.id] = nil
+  util.tbl_remove(tasks, task.id, function(t)
+    return t.id
+  end)
+  unindex_task(task, indexed[task.id])
+  indexed[task.id] = nil
   dispatch()
 end
 
@@ -101,11 +276,8 @@ end
 ---@param name string
 ---@return overseer.Task|nil
 M.get_by_name = function(name)
-  for _, task in ipairs(tasks) do
-    if task.name == name then
-      return task
-    end
-  end
+  local named = by_name[name]
+  return named and named[1]
 end
 
 ---@class (exact) overseer.ListTaskOpts
@@ -129,15 +301,28 @@ M.list_tasks = function(opts)
   vim.validate("filter", opts.filter, "function", true)
   vim.validate("sort", opts.sort, "function", true)
 
-  local status = util.list_to_map(opts.status or {})
+  local flat = get_flat(get_view(opts.sort), opts.wrapped == true)
+  local candidates = flat.tasks
+  if opts.status then
+    -- Use the status index instead of checking every task
+    candidates = {}
+    for status in pairs(util.list_to_map(opts.status)) do
+      for _, task in pairs(by_status[status] or {}) do
+        if flat.position[task] then
+          table.insert(candidates, task)
+        end
+      end
+    end
+    table.sort(candidates, function(a, b)
+      return flat.position[a] < flat.position[b]
+    end)
+  end
+
   local seen = {}
   local ret = {}
-  for _, task in ipairs(get_sorted_tasks(opts.sort)) do
+  for _, task in ipairs(candidates) do
     if
-      (not opts.status or status[task.status])
-      and (opts.include_ephemeral or not task.ephemeral)
-      and (not opts.filter or opts.filter(task))
-      and (opts.wrapped or not task.source)
+      (opts.include_ephemeral or not task.ephemeral) and (not opts.filter or opts.filter(task))
     then
       local idx = seen[task.name]
       if idx and opts.unique then
@@ -158,6 +343,13 @@ M.list_tasks = function(opts)
   return ret
 end
 
+---Used for testing
+---@private
+---@return integer
+M.get_num_views = function()
+  return vim.tbl_count(views)
+end
+
 ---General purpose sort by status and start/end time
 ---@param a overseer.Task
 ---@param b overseer.Task
@@ -3,7 +3,9 @@ local action_util = require("overseer.action_util")
 local config = require("overseer.config")
 local keymap_util = require("overseer.keymap_util")
 local layout = require("overseer.layout")
+local log = require("overseer.log")
 local task_list = require("overseer.task_list")
+local trace = require("overseer.trace")
 local util = require("overseer.util")
 
 local M = {}
@@ -11,11 +13,20 @@ local M = {}
 ---@class overseer.Sidebar
 ---@field bufnr integer
 ---@field private task_lines {[1]: integer, [2]: integer, [3]: overseer.Task}[]
+---@field private task_renders table<integer, overseer.SidebarTaskRender>
+---@field private render_scheduled boolean
 ---@field private preview? overseer.TaskView
 ---@field private focused_task_id? integer
 ---@field private list_task_opts overseer.ListTaskOpts
 local Sidebar = {}
 
+---@class (exact) overseer.SidebarTaskRender
+---@field revision integer The task revision that was rendered
+---@field is_child boolean
+---@field refresh_at? integer Time (os.time()) at which the text will change because it depends on the current time
+---@field lines string[]
+---@field extmarks {[1]: integer, [2]: integer, [3]: vim.api.keyset.set_extmark}[]
+
 local ref
 
 ---@return overseer.Sidebar
@@ -52,6 +63,8 @@ function Sidebar.new()
   local self = setmetatable({
     bufnr = bufnr,
     task_lines = {},
+    task_renders = {},
+    render_scheduled = false,
     preview = nil,
     list_task_opts = { include_ephemeral = true, sort = config.task_list.sort },
   }, { __index = Sidebar })
@@ -88,7 +101,7 @@ function Sidebar:init()
     pattern = "OverseerListUpdate",
     desc = "[Overseer] Update task list when tasks change",
     callback = function()
-      self:render()
+      self:schedule_render()
     end,
   })
 
@@ -170,6 +183,9 @@ function Sidebar:focus_task_id(task_id, offset)
   if not winid then
     return
   end
+  if self.render_scheduled then
+    self:render()
+  end
   offset = offset or 0
   for _, v in ipairs(self.task_lines) do
     local start_line, task = v[1], v[3]
@@ -340,57 +356,210 @@ function Sidebar:toggle_show_wrapped()
   self:render()
 end
 
+local minute_s = 60
+local hour_s = 60 * minute_s
+local day_s = 24 * hour_s
+
+---Get the time when the rendered duration or relative end time of a task will next change
+---@param task overseer.Task
+---@param now integer
+---@return nil|integer
+local function get_refresh_at(task, now)
+  if not task.time_start then
+    return nil
+  elseif not task.time_end then
+    return now + 1
+  end
+  local age = now - task.time_end
+  local unit = day_s
+  if age < minute_s then
+    unit = 1
+  elseif age < hour_s then
+    unit = minute_s
+  elseif age < day_s then
+    unit = hour_s
+  end
+  return task.time_end + (math.floor(age / unit) + 1) * unit
+end
+
+---@param task overseer.Task
+---@param is_child boolean
+---@param now integer
+---@return overseer.SidebarTaskRender
+local function render_task(task, is_child, now)
+  local task_lines = config.task_list.render(task)
+
+  -- Indent subtasks
+  if is_child then
+    local child_indent = { config.task_list.child_indent[1], "OverseerTaskBorder" }
+    for j = 1, #task_lines do
+      table.insert(task_lines[j], 1, child_indent)
+    end
+  end
+
+  local lines, extmarks = util.chunks_to_lines(task_lines)
+  return {
+    revision = task.revision,
+    is_child = is_child,
+    refresh_at = get_refresh_at(task, now),
+    lines = lines,
+    extmarks = extmarks,
+  }
+end
+
+---Get the virtual text lines used to separate a task from the next one
+---@param tasks overseer.Task[]
+---@param i integer
+---@return nil|vim.api.keyset.set_extmark
+local function get_separator(tasks, i)
+  if i >= #tasks then
+    return nil
+  end
+  local border = "OverseerTaskBorder"
+  local tl = config.task_list
+  local prev_is_child = i > 1 and tasks[i - 1].parent_id ~= nil
+  local next_is_child = tasks[i + 1].parent_id ~= nil
+  if next_is_child then
+    return { virt_lines = { { { tl.child_indent[2], border }, { tl.separator, border } } } }
+  elseif prev_is_child then
+    return { virt_lines = { { { tl.child_indent[3], border }, { tl.separator, border } } } }
+  else
+    return { virt_lines = { { { tl.separator, border } } } }
+  end
+end
+
+---Render on the next tick. Multiple calls before then are coalesced into a single render.
+function Sidebar:schedule_render()
+  if self.render_scheduled then
+    return
+  end
+  self.render_scheduled = true
+  vim.schedule(function()
+    if self.render_scheduled then
+      self:render()
+    end
+  end)
+end
+
+---@private
+---@param start integer
+---@param end_ integer
+---@param lines string[]
+---@return boolean
+function Sidebar:set_lines(start, end_, lines)
+  vim.bo[self.bufnr].modifiable = true
+  local success, err = pcall(vim.api.nvim_buf_set_lines, self.bufnr, start, end_, false, lines)
+  vim.bo[self.bufnr].modifiable = false
+  vim.bo[self.bufnr].modified = false
+  if not success then
+    log.warn("Error updating buffer %d: %s", self.bufnr, err)
+  end
+  return success
+end
+
+---@private
+---@param ns integer
+---@param row integer 0-indexed row of the first line of the task
+---@param task_render overseer.SidebarTaskRender
+---@param separator? vim.api.keyset.set_extmark
+function Sidebar:set_task_extmarks(ns, row, task_render, separator)
+  for _, extmark in ipairs(task_render.extmarks) do
+    vim.api.nvim_buf_set_extmark(self.bufnr, ns, row + extmark[1], extmark[2], extmark[3])
+  end
+  if separator and #task_render.lines > 0 then
+    vim.api.nvim_buf_set_extmark(self.bufnr, ns, row + #task_render.lines - 1, 0, separator)
+  end
+end
+
 function Sidebar:render()
   if not vim.api.nvim_buf_is_valid(self.bufnr) then
     return false
   end
+  self.render_scheduled = false
   local tasks = task_list.list_tasks(self.list_task_opts)
+  local span = trace.begin("sidebar_render", "render", { tasks = #tasks })
   local ns = vim.api.nvim_create_namespace("overseer")
-  vim.api.nvim_buf_clear_namespace(self.bufnr, ns, 0, -1)
-
-  local lines = {}
-  local extmarks = {}
-  self.task_lines = {}
-  -- virtual text lines for separating processes
-  local border = "OverseerTaskBorder"
-  local tl = config.task_list
-  local sep_lines = { { { tl.separator, border } } }
-  local child_indent = { tl.child_indent[1], border }
-  local child_sep_1 = { { { tl.child_indent[2], border }, { tl.separator, border } } }
-  local child_sep_2 = { { { tl.child_indent[3], border }, { tl.separator, border } } }
-
-  -- Iterate backwards so we show most recent tasks first
+  local now = os.time()
+
+  -- Only re-render tasks that have changed or whose text depends on the current time. If the tasks
+  -- are in the same order as the last render, we only need to replace the lines that changed.
+  local renders = {}
+  local changed = {}
+  local task_renders = {}
+  local same_layout = #tasks == #self.task_lines
   for i, task in ipairs(tasks) do
-    local line_start = #lines + 1
-    local task_lines = config.task_list.render(task)
-
-    -- Indent subtasks
-    if task.parent_id then
-      for j = 1, #task_lines do
-        table.insert(task_lines[j], 1, child_indent)
+    local is_child = task.parent_id ~= nil
+    local cached = self.task_renders[task.id]
+    local task_render = cached
+    if
+      not cached
+      or cached.revision ~= task.revision
+      or cached.is_child ~= is_child
+      or (cached.refresh_at and cached.refresh_at <= now)
+    then
+      task_render = render_task(task, is_child, now)
+      if
+        not cached
+        or not vim.deep_equal(cached.lines, task_render.lines)
+        or not vim.deep_equal(cached.extmarks, task_render.extmarks)
+      then
+        changed[i] = true
       end
     end
+    ---@cast task_render overseer.SidebarTaskRender
+    renders[i] = task_render
+    task_renders[task.id] = task_render
+
+    local prev = self.task_lines[i]
+    if
+      not prev
+      or prev[3] ~= task
+      or prev[2] < prev[1]
+      or not cached
+      or cached.is_child ~= is_child
+      or #task_render.lines == 0
+    then
+      same_layout = false
+    end
+  end
+  self.task_renders = task_renders
 
-    vim.list_extend(lines, task_lines)
-    table.insert(self.task_lines, { line_start, #lines, task })
-
-    -- task separator
-    if i < #tasks then
-      local prev_is_child = i > 1 and tasks[i - 1].parent_id ~= nil
-      local next_is_child = tasks[i + 1].parent_id ~= nil
-      if next_is_child then
-        table.insert(extmarks, { #lines - 1, 0, { virt_lines = child_sep_1 } })
-      elseif prev_is_child then
-        table.insert(extmarks, { #lines - 1, 0, { virt_lines = child_sep_2 } })
-      else
-        table.insert(extmarks, { #lines - 1, 0, { virt_lines = sep_lines } })
+  if same_layout then
+    if not next(changed) then
+      trace.finish(span, { changed = 0 })
+      return true
+    end
+    -- Iterate backwards so replacing lines doesn't shift the ranges of the tasks still to update
+    for i = #tasks, 1, -1 do
+      if changed[i] then
+        local start_lnum, end_lnum = self.task_lines[i][1], self.task_lines[i][2]
+        vim.api.nvim_buf_clear_namespace(self.bufnr, ns, start_lnum - 1, end_lnum)
+        if self:set_lines(start_lnum - 1, end_lnum, renders[i].lines) then
+          self:set_task_extmarks(ns, start_lnum - 1, renders[i], get_separator(tasks, i))
+        end
+      end
+    end
+  else
+    local lines = {}
+    for _, task_render in ipairs(renders) do
+      vim.list_extend(lines, task_render.lines)
+    end
+    vim.api.nvim_buf_clear_namespace(self.bufnr, ns, 0, -1)
+    if self:set_lines(0, -1, lines) then
+      local row = 0
+      for i, task_render in ipairs(renders) do
+        self:set_task_extmarks(ns, row, task_render, get_separator(tasks, i))
+        row = row + #task_render.lines
       end
     end
   end
 
-  util.render_buf_chunks(self.bufnr, ns, lines)
-  for _, extmark in ipairs(extmarks) do
-    vim.api.nvim_buf_set_extmark(self.bufnr, ns, extmark[1], extmark[2], extmark[3])
+  self.task_lines = {}
+  local lnum = 1
+  for i, task in ipairs(tasks) do
+    local num_lines = #renders[i].lines
+    table.insert(self.task_lines, { lnum, lnum + num_lines - 1, task })
+    lnum = lnum + num_lines
   end
 
   local sidebar_winid = self:get_winid()
@@ -404,6 +573,7 @@ function Sidebar:render()
 
   self:highlight_focused()
 
+  trace.finish(span)
   return true
 end
 
@@ -5,12 +5,16 @@ local files = require("overseer.files")
 local form = require("overseer.form")
 local form_utils = require("overseer.form.utils")
 local log = require("overseer.log")
+local template_cache = require("overseer.template_cache")
+local trace = require("overseer.trace")
 local util = require("overseer.util")
 local M = {}
 
 ---@class (exact) overseer.TemplateFileProvider
 ---@field condition? overseer.SearchCondition simple condition checks for when this provider is available
 ---@field cache_key? fun(opts: overseer.SearchParams): nil|string
+---@field serialize? fun(tmpl: overseer.TemplateDefinition): nil|table convert a template to data that can be stored in the persistent cache
+---@field deserialize? fun(data: table): overseer.TemplateDefinition rebuild a template from the data returned by serialize
 ---@field generator fun(opts: overseer.SearchParams, cb: fun(tmpls_or_err: string|overseer.TemplateDefinition[])) : nil|string|overseer.TemplateDefinition[]
 
 ---@class (exact) overseer.TemplateProvider : overseer.TemplateFileProvider
@@ -47,6 +51,9 @@ local cached_provider_results = {}
 ---@type nil|integer
 local clear_cache_autocmd
 
+---@type table<string, boolean>
+local refreshed_persisted = {}
+
 local hooks = {}
 
 ---@param defn overseer.TemplateProvider
@@ -54,6 +61,8 @@ local function validate_template_provider(defn)
   vim.validate("name", defn.name, "string")
   vim.validate("generator", defn.generator, "function")
   vim.validate("cache_key", defn.cache_key, "function", true)
+  vim.validate("serialize", defn.serialize, "function", true)
+  vim.validate("deserialize", defn.deserialize, "function", true)
 end
 
 ---@param name string
@@ -384,6 +393,14 @@ end
 ---@param callback fun(err: string|nil, task: overseer.TaskDefinition|nil, params: table|nil)
 M.build_task_args = function(tmpl, opts, callback)
   vim.validate("params", opts.params, "table")
+  local span = trace.begin_async(tmpl.name, "build_task")
+  if span then
+    local cb = callback
+    callback = function(...)
+      trace.finish(span)
+      return cb(...)
+    end
+  end
   local param_schema = tmpl.params or {}
   if type(param_schema) == "function" then
     param_schema = param_schema()
@@ -402,7 +419,9 @@ M.build_task_args = function(tmpl, opts, callback)
   for k, v in pairs(param_schema) do
     schema[k] = v
   end
+  local prompt_span = trace.begin_async(tmpl.name, "prompt")
   form.open(tmpl.name, schema, opts.params, function(final_params)
+    trace.finish(prompt_span, { submitted = final_params ~= nil })
     if final_params then
       callback(nil, build_task_args(tmpl, opts.search, final_params, opts.on_build), final_params)
     else
@@ -461,11 +480,57 @@ M.clear_cache = function(opts)
       local cache_key = provider.cache_key(opts)
       if cache_key then
         cached_provider_results[cache_key] = nil
+        template_cache.clear(provider, cache_key)
       end
     end
   end
 end
 
+---@param provider overseer.TemplateProvider
+---@return boolean
+local function should_persist(provider)
+  return config.template_cache_persist and template_cache.can_persist(provider)
+end
+
+---Results from the disk cache may be out of date in ways that the cache_key file doesn't capture
+---(e.g. an included Makefile changed), so re-run the provider once in the background.
+---@param provider overseer.TemplateProvider
+---@param opts overseer.SearchParams
+---@param cache_key string
+local function refresh_persisted(provider, opts, cache_key)
+  local key = provider.name .. "\0" .. cache_key
+  if refreshed_persisted[key] then
+    return
+  end
+  refreshed_persisted[key] = true
+  vim.schedule(function()
+    local done = false
+    ---@param tmpls_or_err string|overseer.TemplateDefinition[]
+    local function on_result(tmpls_or_err)
+      if done then
+        return
+      end
+      done = true
+      if type(tmpls_or_err) == "table" then
+        log.debug("Refreshed %s: [%s] = %d", provider.name, cache_key, #tmpls_or_err)
+        cached_provider_results[cache_key] = tmpls_or_err
+        template_cache.store(provider, cache_key, tmpls_or_err)
+      else
+        -- Don't keep serving results from a provider that no longer works
+        cached_provider_results[cache_key] = nil
+        template_cache.clear(provider, cache_key)
+      end
+    end
+    local ok, tmpls = xpcall(provider.generator, debug.traceback, vim.deepcopy(opts), on_result)
+    if not ok then
+      log.error("Template provider %s: %s", provider.name, tmpls)
+      on_result(vim.split(tmpls, "\n", { plain = true })[1])
+    elseif tmpls then
+      on_result(tmpls)
+    end
+  end)
+end
+
 ---@class (exact) overseer.Report
 ---@field providers table<string, overseer.ProviderReport>
 
@@ -511,24 +576,28 @@ M.list = function(opts, cb)
 
   local finished_iterating = false
   local pending = {}
+  local list_span = trace.begin_async("template.list", "template", { dir = opts.dir })
   local function final_callback()
     -- Don't finish until we've finished iterating and the last pending async generator is completed
     if not finished_iterating or not vim.tbl_isempty(pending) then
       return
     end
 
+    trace.finish(list_span, { num_templates = #ret })
     cb(ret, report)
   end
 
   local start_times = {}
+  local provider_spans = {}
   local timed_out = false
   ---This is the async callback that is passed to generators
   ---@param tmpls_or_err string|overseer.TemplateDefinition[]
-  ---@param provider_name string
-  ---@param module nil|string
+  ---@param provider overseer.TemplateProvider
   ---@param cache_key nil|string
   ---@param from_cache nil|boolean
-  local function handle_tmpls(tmpls_or_err, provider_name, module, cache_key, from_cache)
+  local function handle_tmpls(tmpls_or_err, provider, cache_key, from_cache)
+    local provider_name = provider.name
+    local module = provider.module
     local elapsed_ms = (vim.uv.now() - start_times[provider_name])
     if
       cache_key
@@ -538,6 +607,9 @@ M.list = function(opts, cb)
     then
       log.debug("Caching %s: [%s] = %d", provider_name, cache_key, #tmpls_or_err)
       cached_provider_results[cache_key] = tmpls_or_err
+      if not from_cache and should_persist(provider) then
+        template_cache.store(provider, cache_key, tmpls_or_err)
+      end
     end
     if not pending[provider_name] then
       if not timed_out then
@@ -546,6 +618,10 @@ M.list = function(opts, cb)
       return
     end
     pending[provider_name] = nil
+    trace.finish(provider_spans[provider_name], {
+      from_cache = from_cache == true,
+      error = type(tmpls_or_err) == "string" and tmpls_or_err or nil,
+    })
     local num_available = 0
 
     if type(tmpls_or_err) == "string" then
@@ -588,6 +664,9 @@ M.list = function(opts, cb)
       if not vim.tbl_isempty(pending) then
         timed_out = true
         log.error("Listing templates timed out. Pending providers: %s", vim.tbl_keys(pending))
+        for provider_name in pairs(pending) do
+          trace.finish(provider_spans[provider_name], { timed_out = true })
+        end
         pending = {}
         final_callback()
         -- Make sure that the callback doesn't get called again
@@ -614,19 +693,21 @@ M.list = function(opts, cb)
           )
         else
           provider_done = true
-          handle_tmpls(tmpls_or_err, provider_name, provider.module, cache_key)
+          handle_tmpls(tmpls_or_err, provider, cache_key)
         end
       end
       start_times[provider.name] = vim.uv.now()
+      provider_spans[provider.name] = trace.begin_async(provider.name, "provider")
       pending[provider.name] = true
+      if cache_key and not cached_provider_results[cache_key] and should_persist(provider) then
+        local persisted = template_cache.load(provider, cache_key)
+        if persisted then
+          cached_provider_results[cache_key] = persisted
+          refresh_persisted(provider, opts, cache_key)
+        end
+      end
       if cache_key and cached_provider_results[cache_key] then
-        handle_tmpls(
-          cached_provider_results[cache_key],
-          provider_name,
-          provider.module,
-          cache_key,
-          true
-        )
+        handle_tmpls(cached_provider_results[cache_key], provider, cache_key, true)
       else
         local ok, tmpls = xpcall(provider.generator, debug.traceback, opts, provider_cb)
         if ok then
@@ -1,11 +1,12 @@
+local dir_index = require("overseer.dir_index")
+
 ---@type overseer.TemplateFileProvider
 return {
   generator = function(opts)
     if vim.fn.executable("cargo-make") == 0 then
       return 'Command "cargo-make" not found'
     end
-    local cargo_make_file =
-      vim.fs.find("Makefile.toml", { upward = true, type = "file", path = opts.dir })[1]
+    local cargo_make_file = dir_index.find("Makefile.toml", { type = "file", path = opts.dir })[1]
     if not cargo_make_file then
       return 'No "Makefile.toml" file found'
     end
@@ -1,4 +1,5 @@
 local constants = require("overseer.constants")
+local dir_index = require("overseer.dir_index")
 local json = require("overseer.json")
 local overseer = require("overseer")
 local TAG = constants.TAG
@@ -6,7 +7,7 @@ local TAG = constants.TAG
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function get_cargo_file(opts)
-  return vim.fs.find("Cargo.toml", { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find("Cargo.toml", { type = "file", path = opts.dir })[1]
 end
 
 ---@param cwd string
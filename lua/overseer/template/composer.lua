@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local files = require("overseer.files")
 
 ---@type overseer.TemplateFileProvider
@@ -6,8 +7,7 @@ return {
     if vim.fn.executable("composer") == 0 then
       return "executable composer not found"
     end
-    local package =
-      vim.fs.find("composer.json", { upward = true, type = "file", path = opts.dir })[1]
+    local package = dir_index.find("composer.json", { type = "file", path = opts.dir })[1]
     if not package then
       return "No composer.json file found"
     end
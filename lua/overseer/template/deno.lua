@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local files = require("overseer.files")
 
 ---@type overseer.TemplateFileProvider
@@ -7,7 +8,7 @@ return {
       return "executable deno not found"
     end
     local deno_json = { "deno.json", "deno.jsonc" }
-    local package = vim.fs.find(deno_json, { upward = true, type = "file", path = opts.dir })[1]
+    local package = dir_index.find(deno_json, { type = "file", path = opts.dir })[1]
     if not package then
       return "No deno.{json,jsonc} file found"
     end
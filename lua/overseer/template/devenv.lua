@@ -1,10 +1,11 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
 
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function get_devenv_file(opts)
   local devenv_nix = { "devenv.nix" }
-  return vim.fs.find(devenv_nix, { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find(devenv_nix, { type = "file", path = opts.dir })[1]
 end
 
 return {
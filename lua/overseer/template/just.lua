@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local log = require("overseer.log")
 local overseer = require("overseer")
 
@@ -8,43 +9,66 @@ local function is_justfile(name)
   return name == "justfile" or name == ".justfile"
 end
 
+-- The data needed to rebuild each template from the persistent cache
+---@type table<overseer.TemplateDefinition, table>
+local template_data = setmetatable({}, { __mode = "k" })
+
+---@param cwd string
+---@param recipe table
+---@return overseer.TemplateDefinition
+local function make_template(cwd, recipe)
+  local params_defn = {}
+  for _, param in ipairs(recipe.parameters) do
+    params_defn[param.name] = {
+      default = param.default,
+      type = param.kind == "singular" and "string" or "list",
+      delimiter = " ",
+    }
+  end
+
+  ---@type overseer.TemplateDefinition
+  local tmpl = {
+    name = string.format("just %s", recipe.namepath),
+    desc = recipe.doc,
+    params = params_defn,
+    builder = function(params)
+      local cmd = { "just", recipe.namepath }
+      for _, param in ipairs(recipe.parameters) do
+        local v = params[param.name]
+        if v and v ~= "" then
+          if type(v) == "table" then
+            vim.list_extend(cmd, v)
+          else
+            table.insert(cmd, v)
+          end
+        end
+      end
+      return {
+        cmd = cmd,
+        cwd = cwd,
+      }
+    end,
+  }
+  template_data[tmpl] = {
+    cwd = cwd,
+    recipe = {
+      namepath = recipe.namepath,
+      doc = recipe.doc,
+      parameters = vim.tbl_map(function(param)
+        return { name = param.name, kind = param.kind, default = param.default }
+      end, recipe.parameters),
+    },
+  }
+  return tmpl
+end
+
 ---@param task_list overseer.TemplateDefinition[]
 ---@param cwd string
 ---@param recipes table
 local function add_recipes(task_list, cwd, recipes)
   for _, recipe in pairs(recipes) do
     if not recipe.private then
-      local params_defn = {}
-      for _, param in ipairs(recipe.parameters) do
-        params_defn[param.name] = {
-          default = param.default,
-          type = param.kind == "singular" and "string" or "list",
-          delimiter = " ",
-        }
-      end
-
-      table.insert(task_list, {
-        name = string.format("just %s", recipe.namepath),
-        desc = recipe.doc,
-        params = params_defn,
-        builder = function(params)
-          local cmd = { "just", recipe.namepath }
-          for _, param in ipairs(recipe.parameters) do
-            local v = params[param.name]
-            if v and v ~= "" then
-              if type(v) == "table" then
-                vim.list_extend(cmd, v)
-              else
-                table.insert(cmd, v)
-              end
-            end
-          end
-          return {
-            cmd = cmd,
-            cwd = cwd,
-          }
-        end,
-      })
+      table.insert(task_list, make_template(cwd, recipe))
     end
   end
 end
@@ -107,14 +131,19 @@ end
 ---@type overseer.TemplateFileProvider
 local tmpl = {
   cache_key = function(opts)
-    return vim.fs.find(is_justfile, { upward = true, path = opts.dir })[1]
+    return dir_index.find(is_justfile, { path = opts.dir })[1]
+  end,
+  serialize = function(tmpl)
+    return template_data[tmpl]
+  end,
+  deserialize = function(data)
+    return make_template(data.cwd, data.recipe)
   end,
   generator = function(opts, cb)
     if vim.fn.executable("just") == 0 then
       return 'Command "just" not found'
     end
-    local candidates =
-      vim.fs.find(is_justfile, { upward = true, path = opts.dir, limit = math.huge })
+    local candidates = dir_index.find(is_justfile, { path = opts.dir, limit = math.huge })
     if vim.tbl_isempty(candidates) then
       return "No justfile found"
     end
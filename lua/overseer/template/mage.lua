@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
 -- A make/rake-like build tool using Go
 -- https://magefile.org/
@@ -7,7 +8,7 @@ local overseer = require("overseer")
 local function get_magefile(opts)
   -- mage works with any file names using Go's "mage" build tag.
   -- "magefile.go" is just a common convention.
-  return vim.fs.find("magefile.go", { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find("magefile.go", { type = "file", path = opts.dir })[1]
 end
 
 ---@param opts overseer.SearchParams
@@ -15,7 +16,7 @@ end
 local function get_magedir(opts)
   -- mage works with any directory names specified with `-d` argument.
   -- "magefiles" is inferred if nothing is specified in the command line.
-  return vim.fs.find("magefiles", { upward = true, type = "directory", path = opts.dir })[1]
+  return dir_index.find("magefiles", { type = "directory", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
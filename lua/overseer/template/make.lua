@@ -1,8 +1,10 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
+local template_cache = require("overseer.template_cache")
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function get_makefile(opts)
-  return vim.fs.find("Makefile", { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find("Makefile", { type = "file", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
@@ -10,6 +12,8 @@ return {
   cache_key = function(opts)
     return get_makefile(opts)
   end,
+  serialize = template_cache.serialize_static,
+  deserialize = template_cache.deserialize_static,
   generator = function(opts, cb)
     if vim.fn.executable("make") == 0 then
       return 'Command "make" not found'
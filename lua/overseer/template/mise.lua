@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
 
 ---@param opts overseer.SearchParams
@@ -20,8 +21,8 @@ local function get_mise_file(opts)
       or name == ".config"
   end
 
-  return vim.fs.find(is_mise_file, { type = "file", upward = true, path = opts.dir[1] })[1]
-    or vim.fs.find(is_mise_dir, { type = "directory", upward = true, path = opts.dir[1] })[1]
+  return dir_index.find(is_mise_file, { type = "file", path = opts.dir })[1]
+    or dir_index.find(is_mise_dir, { type = "directory", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
@@ -1,8 +1,9 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function get_mix_file(opts)
-  return vim.fs.find("mix.exs", { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find("mix.exs", { type = "file", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
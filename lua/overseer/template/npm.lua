@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local files = require("overseer.files")
 
 ---@type table<string, string[]>
@@ -15,8 +16,7 @@ local function get_candidate_package_files(opts)
   -- https://stackoverflow.com/questions/51701191/react-native-has-something-to-use-local-folders-as-package-name-what-is-it-ca
   -- To cover that case, we search for package.json files starting from the current file folder, up to the
   -- working directory
-  local matches = vim.fs.find("package.json", {
-    upward = true,
+  local matches = dir_index.find("package.json", {
     type = "file",
     path = opts.dir,
     stop = vim.fn.getcwd() .. "/..",
@@ -28,8 +28,7 @@ local function get_candidate_package_files(opts)
   -- we couldn't find any match up to the working directory.
   -- let's now search for any possible single match without
   -- limiting ourselves to the working directory.
-  return vim.fs.find("package.json", {
-    upward = true,
+  return dir_index.find("package.json", {
     type = "file",
     path = vim.fn.getcwd(),
   })
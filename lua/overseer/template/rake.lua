@@ -1,9 +1,10 @@
+local dir_index = require("overseer.dir_index")
 local overseer = require("overseer")
 
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function get_rakefile(opts)
-  return vim.fs.find("Rakefile", { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find("Rakefile", { type = "file", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
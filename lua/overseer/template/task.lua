@@ -1,5 +1,6 @@
 -- A task runner / simpler Make alternative written in Go
 -- https://taskfile.dev/
+local dir_index = require("overseer.dir_index")
 local log = require("overseer.log")
 local overseer = require("overseer")
 
@@ -13,7 +14,7 @@ local taskfiles = {
 ---@param opts overseer.SearchParams
 ---@return nil|string
 local function find_taskfile(opts)
-  return vim.fs.find(taskfiles, { upward = true, type = "file", path = opts.dir })[1]
+  return dir_index.find(taskfiles, { type = "file", path = opts.dir })[1]
 end
 
 ---@type overseer.TemplateFileProvider
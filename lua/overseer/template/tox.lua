@@ -1,7 +1,9 @@
+local dir_index = require("overseer.dir_index")
+
 ---@type overseer.TemplateFileProvider
 return {
   generator = function(opts)
-    local tox_file = vim.fs.find("tox.ini", { upward = true, type = "file", path = opts.dir })[1]
+    local tox_file = dir_index.find("tox.ini", { type = "file", path = opts.dir })[1]
     if not tox_file then
       return "No tox.ini file found"
     end
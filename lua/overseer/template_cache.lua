@@ -0,0 +1,185 @@
+local files = require("overseer.files")
+local log = require("overseer.log")
+local M = {}
+
+-- Bump this when the format of the cache files changes
+local CACHE_VERSION = 1
+
+---@class (exact) overseer.TemplateCacheFile
+---@field path string
+---@field size integer
+---@field mtime {sec: integer, nsec: integer}
+---@field hash? string
+
+---@class (exact) overseer.TemplateCacheEntry
+---@field version integer
+---@field provider string
+---@field cache_key string
+---@field files overseer.TemplateCacheFile[]
+---@field templates table[]
+
+---@param provider_name string
+---@param cache_key string
+---@return string
+local function get_cache_file(provider_name, cache_key)
+  local hash = vim.fn.sha256(provider_name .. "\0" .. cache_key)
+  return files.get_stdpath_filename("cache", "overseer", "templates", hash .. ".json")
+end
+
+---@param path string
+---@return nil|overseer.TemplateCacheFile
+local function stat_file(path)
+  local stat = vim.uv.fs_stat(path)
+  if not stat then
+    return nil
+  end
+  local ret = {
+    path = path,
+    size = stat.size,
+    mtime = { sec = stat.mtime.sec, nsec = stat.mtime.nsec },
+  }
+  if stat.type == "file" then
+    ret.hash = vim.fn.sha256(files.read_file(path) or "")
+  end
+  return ret
+end
+
+---Check if a file still matches the recorded state. The hash is only computed if the mtime changed.
+---@param file overseer.TemplateCacheFile
+---@return boolean
+local function is_fresh(file)
+  local stat = vim.uv.fs_stat(file.path)
+  if not stat or stat.size ~= file.size then
+    return false
+  end
+  if stat.mtime.sec == file.mtime.sec and stat.mtime.nsec == file.mtime.nsec then
+    return true
+  end
+  if not file.hash or stat.type ~= "file" then
+    return false
+  end
+  return vim.fn.sha256(files.read_file(file.path) or "") == file.hash
+end
+
+---@param provider overseer.TemplateProvider
+---@return boolean
+M.can_persist = function(provider)
+  return provider.serialize ~= nil and provider.deserialize ~= nil
+end
+
+---Load the templates for a provider from the disk cache
+---@param provider overseer.TemplateProvider
+---@param cache_key string
+---@return nil|overseer.TemplateDefinition[]
+M.load = function(provider, cache_key)
+  local cache_file = get_cache_file(provider.name, cache_key)
+  local ok, entry = pcall(files.load_json_file, cache_file)
+  if not ok or type(entry) ~= "table" then
+    return nil
+  end
+  ---@cast entry overseer.TemplateCacheEntry
+  if
+    entry.version ~= CACHE_VERSION
+    or entry.provider ~= provider.name
+    or entry.cache_key ~= cache_key
+  then
+    return nil
+  end
+  for _, file in ipairs(entry.files) do
+    if not is_fresh(file) then
+      log.debug("Template cache for %s is stale: %s changed", provider.name, file.path)
+      files.delete_file(cache_file)
+      return nil
+    end
+  end
+  local ret = {}
+  for _, data in ipairs(entry.templates) do
+    local deserialize_ok, tmpl = pcall(provider.deserialize, data)
+    if not deserialize_ok then
+      log.warn("Template provider %s could not deserialize template: %s", provider.name, tmpl)
+      files.delete_file(cache_file)
+      return nil
+    end
+    table.insert(ret, tmpl)
+  end
+  return ret
+end
+
+---Store the templates for a provider in the disk cache
+---The cache_key must be a file or directory, and the entry is invalidated when it changes.
+---@param provider overseer.TemplateProvider
+---@param cache_key string
+---@param tmpls overseer.TemplateDefinition[]
+M.store = function(provider, cache_key, tmpls)
+  local templates = {}
+  for _, tmpl in ipairs(tmpls) do
+    local ok, data = pcall(provider.serialize, tmpl)
+    if not ok or data == nil then
+      log.debug("Template provider %s cannot serialize template %s", provider.name, tmpl.name)
+      return
+    end
+    table.insert(templates, data)
+  end
+  local file = stat_file(cache_key)
+  if not file then
+    -- Without a file to validate against, we would never know when the entry is stale
+    log.debug("Template provider %s cache_key is not a file: %s", provider.name, cache_key)
+    return
+  end
+  ---@type overseer.TemplateCacheEntry
+  local entry = {
+    version = CACHE_VERSION,
+    provider = provider.name,
+    cache_key = cache_key,
+    files = { file },
+    templates = templates,
+  }
+  local cache_file = get_cache_file(provider.name, cache_key)
+  local ok, err = pcall(files.write_json_file, cache_file, entry)
+  if not ok then
+    log.warn("Could not write template cache for %s: %s", provider.name, err)
+  end
+end
+
+---@param provider overseer.TemplateProvider
+---@param cache_key string
+M.clear = function(provider, cache_key)
+  files.delete_file(get_cache_file(provider.name, cache_key))
+end
+
+---Serialize a template that has no params by storing the task definition that it builds
+---@param tmpl overseer.TemplateDefinition
+---@return nil|table
+M.serialize_static = function(tmpl)
+  if type(tmpl.params) == "function" or not vim.tbl_isempty(tmpl.params or {}) then
+    return nil
+  end
+  return {
+    name = tmpl.name,
+    aliases = tmpl.aliases,
+    desc = tmpl.desc,
+    tags = tmpl.tags,
+    condition = tmpl.condition,
+    hide = tmpl.hide,
+    task = tmpl.builder({}),
+  }
+end
+
+---@param data table
+---@return overseer.TemplateDefinition
+M.deserialize_static = function(data)
+  local task = data.task
+  return {
+    name = data.name,
+    aliases = data.aliases,
+    desc = data.desc,
+    tags = data.tags,
+    condition = data.condition,
+    hide = data.hide,
+    builder = function()
+      return vim.deepcopy(task)
+    end,
+  }
+end
+
+return M
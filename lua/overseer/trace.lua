@@ -0,0 +1,136 @@
+-- Opt-in tracer that records spans and counters in the Chrome trace event format, which can be
+-- loaded in chrome://tracing or https://ui.perfetto.dev. When tracing is off, every function here
+-- returns immediately, so it is cheap to leave the calls in hot code paths.
+local files = require("overseer.files")
+local M = {}
+
+-- Stop recording once we have this many events so that a forgotten trace can't use all the memory
+local MAX_EVENTS = 1000000
+local PID = 1
+local MAIN_TID = 1
+
+---@type boolean
+M.enabled = false
+
+---@type table[]
+local events = {}
+local num_dropped = 0
+local next_async_id = 1
+---@type integer
+local epoch = 0
+
+---@class (exact) overseer.TraceSpan
+---@field name string
+---@field cat string
+---@field ts number Start time in microseconds
+---@field args? table
+---@field id? integer Set for async spans
+
+---@return number
+local function now_us()
+  return (vim.uv.hrtime() - epoch) / 1000
+end
+
+---@param event table
+local function record(event)
+  if #events >= MAX_EVENTS then
+    num_dropped = num_dropped + 1
+    return
+  end
+  table.insert(events, event)
+end
+
+---Start a span that will end before control returns to the event loop
+---@param name string
+---@param cat string Category of the span
+---@param args? table<string, any> Extra data to attach to the span
+---@return nil|overseer.TraceSpan
+M.begin = function(name, cat, args)
+  if not M.enabled then
+    return nil
+  end
+  return { name = name, cat = cat, ts = now_us(), args = args }
+end
+
+---Start a span for an asynchronous operation. These can overlap with other spans.
+---@param name string
+---@param cat string Category of the span
+---@param args? table<string, any> Extra data to attach to the span
+---@return nil|overseer.TraceSpan
+M.begin_async = function(name, cat, args)
+  if not M.enabled then
+    return nil
+  end
+  local id = next_async_id
+  next_async_id = next_async_id + 1
+  return { name = name, cat = cat, ts = now_us(), args = args, id = id }
+end
+
+---@param span nil|false|overseer.TraceSpan
+---@param args? table<string, any> Extra data to attach to the span
+M.finish = function(span, args)
+  if not span or not M.enabled then
+    return
+  end
+  if args then
+    span.args = vim.tbl_extend("force", span.args or {}, args)
+  end
+  local ts = now_us()
+  if span.id then
+    local common = { name = span.name, cat = span.cat, id = span.id, pid = PID, tid = MAIN_TID }
+    record(vim.tbl_extend("force", common, { ph = "b", ts = span.ts, args = span.args }))
+    record(vim.tbl_extend("force", common, { ph = "e", ts = ts }))
+  else
+    record({
+      name = span.name,
+      cat = span.cat,
+      ph = "X",
+      ts = span.ts,
+      dur = ts - span.ts,
+      pid = PID,
+      tid = MAIN_TID,
+      args = span.args,
+    })
+  end
+end
+
+---Record the current value of a counter
+---@param name string
+---@param values table<string, number> Mapping of series name to value
+M.counter = function(name, values)
+  if not M.enabled then
+    return
+  end
+  record({ name = name, ph = "C", ts = now_us(), pid = PID, tid = MAIN_TID, args = values })
+end
+
+---Discard any recorded events and start tracing
+M.start = function()
+  events = {}
+  num_dropped = 0
+  epoch = vim.uv.hrtime()
+  M.enabled = true
+end
+
+M.stop = function()
+  M.enabled = false
+end
+
+---@return integer
+M.num_events = function()
+  return #events
+end
+
+---Write the recorded events to a file in the Chrome trace event format
+---@param filename string
+M.save = function(filename)
+  files.write_json_file(filename, {
+    traceEvents = events,
+    displayTimeUnit = "ms",
+    otherData = {
+      dropped_events = num_dropped,
+    },
+  })
+end
+
+return M
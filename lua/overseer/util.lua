@@ -148,14 +148,11 @@ M.scroll_to_end = function(winid)
   vim.api.nvim_set_option_value("scrolloff", scrolloff, { scope = "local", win = winid })
 end
 
----@param bufnr integer
----@param ns integer
+---Convert lines of text chunks into buffer lines and highlight extmarks
 ---@param lines overseer.TextChunk[][]
-M.render_buf_chunks = function(bufnr, ns, lines)
-  if not bufnr or not vim.api.nvim_buf_is_valid(bufnr) then
-    return
-  end
-  vim.api.nvim_buf_clear_namespace(bufnr, ns, 0, -1)
+---@return string[] lines
+---@return {[1]: integer, [2]: integer, [3]: vim.api.keyset.set_extmark}[] extmarks row, col, opts
+M.chunks_to_lines = function(lines)
   local new_lines = {}
   local extmarks = {}
   for _, chunks in ipairs(lines) do
@@ -174,6 +171,18 @@ M.render_buf_chunks = function(bufnr, ns, lines)
     local line_text = table.concat(line, ""):gsub("\n", " ")
     table.insert(new_lines, line_text)
   end
+  return new_lines, extmarks
+end
+
+---@param bufnr integer
+---@param ns integer
+---@param lines overseer.TextChunk[][]
+M.render_buf_chunks = function(bufnr, ns, lines)
+  if not bufnr or not vim.api.nvim_buf_is_valid(bufnr) then
+    return
+  end
+  vim.api.nvim_buf_clear_namespace(bufnr, ns, 0, -1)
+  local new_lines, extmarks = M.chunks_to_lines(lines)
   vim.bo[bufnr].modifiable = true
   local success, err = pcall(vim.api.nvim_buf_set_lines, bufnr, 0, -1, false, new_lines)
   vim.bo[bufnr].modifiable = false
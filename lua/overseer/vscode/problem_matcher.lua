@@ -455,6 +455,13 @@ local function patterns_to_parser(patterns, opts)
   return {
     parse = function(self, line)
       local item = parse_fns[idx](line)
+      if not item and idx > 1 then
+        -- If we are in the middle of the parse funcs and the match fails, reset and try matching
+        -- again starting from the first function
+        idx = 1
+        pending_item = {}
+        item = parse_fns[idx](line)
+      end
       local is_last_fn = idx == #parse_fns
       if item then
         if is_last_fn then
@@ -467,14 +474,6 @@ local function patterns_to_parser(patterns, opts)
           pending_item = vim.tbl_extend("force", pending_item, item)
           idx = idx + 1
         end
-      else
-        -- If we are in the middle of the parse funcs and the match fails, reset and try matching
-        -- again starting from the first function
-        if idx > 1 then
-          idx = 1
-          pending_item = {}
-          self:parse(line)
-        end
       end
     end,
     get_result = function()
@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local files = require("overseer.files")
 local log = require("overseer.log")
 local M = {}
@@ -31,7 +32,7 @@ M.get_selected_text = function()
 end
 
 local function get_workspace_folder(path)
-  local vscode_dir = vim.fs.find(".vscode", { upward = true, type = "directory", path = path })[1]
+  local vscode_dir = dir_index.find(".vscode", { type = "directory", path = path })[1]
   if vscode_dir then
     return vim.fs.dirname(vscode_dir)
   else
@@ -1,3 +1,4 @@
+local dir_index = require("overseer.dir_index")
 local files = require("overseer.files")
 local M = {}
 
@@ -5,7 +6,7 @@ local M = {}
 ---@return nil|string
 local function find_tasks_file(dir)
   local vscode_dirs =
-    vim.fs.find(".vscode", { upward = true, type = "directory", path = dir, limit = math.huge })
+    dir_index.find(".vscode", { type = "directory", path = dir, limit = math.huge })
   for _, vscode_dir in ipairs(vscode_dirs) do
     local tasks_file = vim.fs.joinpath(vscode_dir, "tasks.json")
     if vim.uv.fs_stat(tasks_file) then
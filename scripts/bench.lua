@@ -0,0 +1,247 @@
+-- Microbenchmarks for overseer hot paths. Driven by scripts/bench.py
+-- Usage: nvim --headless --noplugin -u NONE -i NONE -l scripts/bench.lua <root> <opts json>
+local root = _G.arg[1]
+local opts = vim.json.decode(_G.arg[2] or "{}")
+vim.opt.runtimepath:append(root)
+vim.o.swapfile = false
+
+local uv = vim.uv
+local default_warmup = opts.warmup or 3
+local default_reps = opts.reps or 20
+local sizes = opts.sizes or { 1000, 5000, 10000 }
+
+require("overseer").setup({})
+local parselib = require("overseer.parselib")
+local problem_matcher = require("overseer.vscode.problem_matcher")
+local task_list = require("overseer.task_list")
+
+local results = {}
+
+---@param name string
+---@return boolean
+local function enabled(name)
+  return not opts.filter or name:find(opts.filter) ~= nil
+end
+
+---@param name string
+---@param fn fun()
+---@param bench_opts? {warmup?: integer, reps?: integer, ops?: integer}
+local function bench(name, fn, bench_opts)
+  if not enabled(name) then
+    return
+  end
+  bench_opts = bench_opts or {}
+  local ops = bench_opts.ops or 1
+  for _ = 1, bench_opts.warmup or default_warmup do
+    fn()
+  end
+  collectgarbage("collect")
+  local samples = {}
+  for i = 1, bench_opts.reps or default_reps do
+    local start = uv.hrtime()
+    fn()
+    samples[i] = (uv.hrtime() - start) / 1e6 / ops
+  end
+  table.sort(samples)
+  local total = 0
+  for _, v in ipairs(samples) do
+    total = total + v
+  end
+  local n = #samples
+  results[name] = {
+    reps = n,
+    ops = ops,
+    min_ms = samples[1],
+    median_ms = samples[math.ceil(n / 2)],
+    mean_ms = total / n,
+    p95_ms = samples[math.ceil(n * 0.95)],
+    max_ms = samples[n],
+  }
+  io.stderr:write(string.format("%-50s %10.4f ms\n", name, results[name].median_ms))
+end
+
+---@param lines string[]
+---@param count integer
+---@return string[]
+local function repeat_lines(lines, count)
+  local ret = {}
+  for i = 1, count do
+    ret[i] = lines[(i - 1) % #lines + 1]
+  end
+  return ret
+end
+
+-- Mostly non-matching output with the occasional diagnostic, like a real build log
+local build_log = repeat_lines({
+  "[ 12%] Building CXX object src/CMakeFiles/core.dir/foo.cpp.o",
+  "src/foo.cpp:12:5: error: 'bar' was not declared in this scope",
+  "make[2]: Entering directory '/home/user/project/build'",
+  "src/index.ts(14,7): error TS2322: Type 'string' is not assignable to type 'number'.",
+  "Compiling project v0.1.0 (/home/user/project)",
+  "    at Object.<anonymous> (/home/user/project/test.js:3:9)",
+  "src/baz.c:44:1: warning: control reaches end of non-void function [-Wreturn-type]",
+  "Linking CXX executable bin/app",
+}, 1000)
+
+local function parse_all(parser)
+  parser:reset()
+  for _, line in ipairs(build_log) do
+    parser:parse(line)
+  end
+end
+
+-- problem matchers
+for _, name in ipairs({ "$tsc", "$gcc", "$eslint-stylish", "$msCompile" }) do
+  bench("problem_matcher.get_parser_from_problem_matcher " .. name, function()
+    problem_matcher.get_parser_from_problem_matcher(name)
+  end)
+  local parser = assert(problem_matcher.get_parser_from_problem_matcher(name))
+  bench(string.format("problem_matcher parse %s (per line)", name), function()
+    parse_all(parser)
+  end, { ops = #build_log })
+end
+
+-- parselib
+local lua_match = parselib.make_lua_match_fn("^(%S+):(%d+):(%d+): (%a+): (.+)$")
+local regex_match = parselib.make_regex_match_fn("\\v^(\\S+):(\\d+):(\\d+): (\\a+): (.+)$")
+local fields = { "filename", "lnum", "col", "type", "text" }
+bench("parselib.make_lua_match_fn (per line)", function()
+  for _, line in ipairs(build_log) do
+    lua_match(line)
+  end
+end, { ops = #build_log })
+bench("parselib.make_regex_match_fn (per line)", function()
+  for _, line in ipairs(build_log) do
+    regex_match(line)
+  end
+end, { ops = #build_log })
+bench("parselib.make_parser lua (per line)", function()
+  parse_all(parselib.make_parser(parselib.make_parse_fn(lua_match, fields)))
+end, { ops = #build_log })
+bench("parselib.make_parser regex (per line)", function()
+  parse_all(parselib.make_parser(parselib.make_parse_fn(regex_match, fields)))
+end, { ops = #build_log })
+bench("parselib.parser_from_errorformat (per line)", function()
+  parse_all(parselib.parser_from_errorformat("%f:%l:%c: %t%*[^:]: %m"))
+end, { ops = #build_log, reps = 5 })
+
+-- task list and sidebar
+local statuses = { "PENDING", "RUNNING", "SUCCESS", "FAILURE", "CANCELED" }
+
+---@param count integer
+---@return overseer.Task[]
+local function create_tasks(count)
+  local Task = require("overseer.task")
+  local now = os.time()
+  local ret = {}
+  for i = 1, count do
+    local task = Task.new({
+      cmd = { "echo", tostring(i) },
+      name = string.format("task %d", i % 200),
+      strategy = "test",
+      components = {},
+    })
+    task.status = statuses[i % #statuses + 1]
+    if task.status ~= "PENDING" then
+      task.time_start = now - i
+    end
+    if task:is_complete() then
+      task.time_end = now - i + 1
+    end
+    if i % 10 == 0 then
+      task.parent_id = task.id - 1
+    end
+    task_list.touch(task)
+    table.insert(ret, task)
+  end
+  return ret
+end
+
+local function dispose_tasks(tasks)
+  for _, task in ipairs(tasks) do
+    -- These tasks were never actually started, so don't try to stop them
+    task.status = "CANCELED"
+    task:dispose(true)
+  end
+end
+
+local task_benches = {
+  {
+    "list_tasks",
+    function()
+      task_list.on_task_updated()
+      task_list.list_tasks()
+    end,
+  },
+  {
+    "list_tasks status filter",
+    function()
+      task_list.on_task_updated()
+      task_list.list_tasks({ status = "RUNNING", include_ephemeral = true })
+    end,
+  },
+  {
+    "list_tasks cached sort",
+    function()
+      task_list.list_tasks({ unique = true })
+    end,
+  },
+  {
+    "get_by_name",
+    function()
+      task_list.get_by_name("missing")
+    end,
+  },
+  {
+    "Sidebar:render",
+    function()
+      require("overseer.task_list.sidebar").get_or_create():render()
+    end,
+    { reps = 10 },
+  },
+}
+
+for _, size in ipairs(sizes) do
+  local prefix = string.format("task_list[%d] ", size)
+  local any_enabled = vim.iter(task_benches):any(function(b)
+    return enabled(prefix .. b[1])
+  end)
+  if any_enabled then
+    local tasks = create_tasks(size)
+    for _, b in ipairs(task_benches) do
+      bench(prefix .. b[1], b[2], b[3])
+    end
+    dispose_tasks(tasks)
+    -- Delete the sidebar so it doesn't re-render during the list_tasks benchmarks of the next size
+    local sidebar = require("overseer.task_list.sidebar").get()
+    if sidebar then
+      vim.api.nvim_buf_delete(sidebar.bufnr, { force = true })
+    end
+  end
+end
+
+-- templates
+if enabled("template.list") then
+  local template = require("overseer.template")
+  local function list_templates()
+    local done = false
+    template.list({ dir = root }, function()
+      done = true
+    end)
+    vim.wait(10000, function()
+      return done
+    end, 1)
+  end
+  bench("template.list", function()
+    template.clear_cache({ dir = root })
+    list_templates()
+  end, { warmup = 1, reps = 5 })
+  bench("template.list cached", list_templates, { warmup = 1, reps = 5 })
+end
+
+local outfile = assert(io.open(opts.output, "w"))
+outfile:write(vim.json.encode({
+  nvim = tostring(vim.version()),
+  results = results,
+}))
+outfile:close()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
+BENCH_SCRIPT = os.path.join(HERE, "bench.lua")
+
+
+def run_lua_script(script: str, opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a lua script in headless nvim with overseer on the runtimepath
+
+    The script receives the repo root and a JSON-encoded opts table as arguments, and is expected
+    to write its JSON results to opts.output.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = os.path.join(tmpdir, "results.json")
+        opts = dict(opts, output=output)
+        cmd = ["nvim", "--headless", "--noplugin", "-u", "NONE", "-i", "NONE", "-l"]
+        cmd += [script, ROOT, json.dumps(opts)]
+        proc = subprocess.run(cmd, cwd=ROOT)
+        if proc.returncode != 0 or not os.path.exists(output):
+            raise Exception(
+                f"{os.path.basename(script)} failed (code {proc.returncode})"
+            )
+        with open(output, "r", encoding="utf-8") as ifile:
+            return json.load(ifile)
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Compare the median times of two benchmark runs and return the regressions"""
+    regressions = []
+    base_results = baseline["results"]
+    for name, result in sorted(current["results"].items()):
+        base = base_results.get(name)
+        if base is None or base["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {base['median_ms']:.4f}ms -> {result['median_ms']:.4f}ms "
+                f"({100 * (ratio - 1):+.1f}%)"
+            )
+    return regressions
+
+
+def print_results(current: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    results = current["results"]
+    width = max((len(name) for name in results), default=0)
+    header = f"{'benchmark':<{width}}  {'median':>12}  {'p95':>12}"
+    if baseline is not None:
+        header += f"  {'baseline':>12}  {'change':>8}"
+    print(header)
+    for name, result in sorted(results.items()):
+        line = f"{name:<{width}}  {result['median_ms']:>10.4f}ms  {result['p95_ms']:>10.4f}ms"
+        if baseline is not None:
+            base = baseline["results"].get(name)
+            if base is not None and base["median_ms"] > 0:
+                change = result["median_ms"] / base["median_ms"] - 1
+                line += f"  {base['median_ms']:>10.4f}ms  {100 * change:>+7.1f}%"
+        print(line)
+
+
+def main(argv: List[str]) -> None:
+    """Run the overseer microbenchmarks in headless nvim"""
+    parser = argparse.ArgumentParser(prog="main.py bench", description=main.__doc__)
+    parser.add_argument(
+        "--filter", help="Only run benchmarks matching this lua pattern"
+    )
+    parser.add_argument("--reps", type=int, help="Number of timed repetitions")
+    parser.add_argument("--warmup", type=int, help="Number of untimed warmup runs")
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(n) for n in s.split(",")],
+        help="Comma-separated task counts for the task list benchmarks",
+    )
+    parser.add_argument("-o", "--output", help="Save the results as JSON to this file")
+    parser.add_argument(
+        "--baseline", help="Compare against results saved with --output"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown of the median that counts as a regression (default %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    opts = {
+        k: v
+        for k, v in vars(args).items()
+        if k in ("filter", "reps", "warmup", "sizes") and v is not None
+    }
+    current = run_lua_script(BENCH_SCRIPT, opts)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as ifile:
+            baseline = json.load(ifile)
+    print_results(current, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as ofile:
+            json.dump(current, ofile, indent=2, sort_keys=True)
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
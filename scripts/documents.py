@@ -0,0 +1,217 @@
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+MD_TITLE_PAT = re.compile(r"^(#+)\s+(.*?)\s*$")
+
+
+def md_create_anchor(title: str) -> str:
+    return re.sub(r"[^\w\- ]", "", title.lower()).replace(" ", "-")
+
+
+class Heading(NamedTuple):
+    level: int
+    title: str
+    anchor: str
+
+
+class HeadingIndex:
+    """The headings and link anchors of a markdown document"""
+
+    def __init__(self, lines: List[str]):
+        self.headings: List[Heading] = []
+        self.anchors: Set[str] = set()
+        counts: Dict[str, int] = {}
+        in_code_block = False
+        for line in lines:
+            if line.startswith("```"):
+                in_code_block = not in_code_block
+                continue
+            if in_code_block:
+                continue
+            m = MD_TITLE_PAT.match(line)
+            if m:
+                anchor = md_create_anchor(m[2])
+                self.headings.append(Heading(len(m[1]), m[2], anchor))
+                # Duplicate headings get a numeric suffix, the same as on GitHub
+                count = counts.get(anchor, 0)
+                counts[anchor] = count + 1
+                self.anchors.add(anchor if count == 0 else f"{anchor}-{count}")
+
+    def toc(self, max_level: int = 99) -> List[str]:
+        """Generate a markdown table of contents from the headings"""
+        ret = []
+        for heading in self.headings:
+            level = heading.level - 1
+            if level and level <= max_level:
+                prefix = "  " * (level - 1)
+                ret.append(f"{prefix}- [{heading.title}](#{heading.anchor})\n")
+        return ret
+
+
+class Document:
+    """The in-memory contents of a single file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as ifile:
+                self.original: Optional[str] = ifile.read()
+            self.lines = self.original.splitlines(keepends=True)
+        else:
+            self.original = None
+            self.lines = []
+        # Incremented every time the in-memory contents change
+        self.version = 0
+        self.lock = threading.RLock()
+        self._index: Optional[Tuple[int, HeadingIndex]] = None
+
+    def heading_index(self) -> HeadingIndex:
+        """Get the heading index, rebuilding it only if the contents changed since the last call"""
+        with self.lock:
+            if self._index is None or self._index[0] != self.version:
+                self._index = (self.version, HeadingIndex(self.lines))
+            return self._index[1]
+
+    def text(self) -> str:
+        return "".join(self.lines)
+
+    @property
+    def modified(self) -> bool:
+        return self.text() != self.original
+
+
+class DocumentSet:
+    """Loads each file once and applies all edits in memory
+
+    Nothing touches the disk until flush(), which writes each file once and only if its contents
+    changed.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[str, Document] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Document:
+        path = os.path.abspath(path)
+        with self._lock:
+            doc = self._docs.get(path)
+            if doc is None:
+                doc = Document(path)
+                self._docs[path] = doc
+            return doc
+
+    def read_lines(self, path: str) -> List[str]:
+        doc = self.get(path)
+        with doc.lock:
+            return list(doc.lines)
+
+    def write_lines(self, path: str, lines: List[str]) -> None:
+        doc = self.get(path)
+        with doc.lock:
+            new_lines = "".join(lines).splitlines(keepends=True)
+            if new_lines != doc.lines:
+                doc.lines = new_lines
+                doc.version += 1
+
+    def read_section(
+        self,
+        path: str,
+        start_pat: str,
+        end_pat: Optional[str],
+        inclusive: Tuple[bool, bool] = (False, False),
+    ) -> List[str]:
+        ret = []
+        inside_section = False
+        for line in self.read_lines(path):
+            if inside_section:
+                if end_pat is not None and re.match(end_pat, line):
+                    if inclusive[1]:
+                        ret.append(line)
+                    break
+                ret.append(line)
+            elif re.match(start_pat, line):
+                inside_section = True
+                if inclusive[0]:
+                    ret.append(line)
+        return ret
+
+    def replace_section(
+        self, path: str, start_pat: str, end_pat: Optional[str], lines: List[str]
+    ) -> None:
+        doc = self.get(path)
+        with doc.lock:
+            prefix_lines: List[str] = []
+            postfix_lines: List[str] = []
+            file_lines = prefix_lines
+            found_section = False
+            inside_section = False
+            for line in doc.lines:
+                if inside_section:
+                    if end_pat is not None and re.match(end_pat, line):
+                        inside_section = False
+                        file_lines = postfix_lines
+                        file_lines.append(line)
+                else:
+                    if not found_section and re.match(start_pat, line):
+                        inside_section = True
+                        found_section = True
+                    file_lines.append(line)
+
+            if inside_section and end_pat is not None:
+                raise Exception(f"Could not find end of section {end_pat} in {path}")
+            if not found_section:
+                raise Exception(f"Could not find section {start_pat} in {path}")
+            self.write_lines(path, prefix_lines + lines + postfix_lines)
+
+    def refresh(self, path: str) -> bool:
+        """Reload a document if it was changed on disk by someone else
+
+        Returns True if the document was reloaded.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            doc = self._docs.get(path)
+            if doc is None:
+                return True
+            fresh = Document(path)
+            if fresh.original == doc.original:
+                return False
+            fresh.version = doc.version + 1
+            self._docs[path] = fresh
+            return True
+
+    def versions(self) -> Dict[str, int]:
+        with self._lock:
+            return {path: doc.version for path, doc in self._docs.items()}
+
+    def heading_index(self, path: str) -> HeadingIndex:
+        return self.get(path).heading_index()
+
+    def md_toc(self, path: str, max_level: int = 99) -> List[str]:
+        return self.heading_index(path).toc(max_level)
+
+    def modified(self) -> List[Document]:
+        with self._lock:
+            docs = list(self._docs.values())
+        return [doc for doc in docs if doc.modified]
+
+    def revert(self) -> None:
+        """Discard all in-memory edits"""
+        for doc in self.modified():
+            with doc.lock:
+                doc.lines = (doc.original or "").splitlines(keepends=True)
+                doc.version += 1
+
+    def flush(self) -> List[str]:
+        """Write all modified documents to disk and return their paths"""
+        ret = []
+        for doc in self.modified():
+            with doc.lock:
+                text = doc.text()
+                with open(doc.path, "w", encoding="utf-8") as ofile:
+                    ofile.write(text)
+                doc.original = text
+            ret.append(doc.path)
+        return ret
@@ -1,10 +1,14 @@
+import atexit
 import copy
+import difflib
 import json
 import os
 import re
-import subprocess
-from functools import lru_cache
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from nvim_doc_tools import (
     LuaFunc,
@@ -15,19 +19,18 @@ from nvim_doc_tools import (
     convert_markdown_to_vimdoc,
     dedent,
     format_md_table,
-    generate_md_toc,
     indent,
     leftright,
-    parse_directory,
-    read_section,
     render_md_api2,
     render_md_classes,
     render_vimdoc_api2,
     render_vimdoc_classes,
-    replace_section,
     wrap,
 )
 from nvim_doc_tools.vimdoc import format_vimdoc_params
+from documents import DocumentSet
+from luaparse import LuaParser
+from nvim_export import NvimExportError, NvimSession, format_errors
 
 HERE = os.path.dirname(__file__)
 ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
@@ -38,24 +41,74 @@ VIMDOC = os.path.join(DOC, "overseer.txt")
 MD_BOLD_PAT = re.compile(r"\*\*([^\*]+)\*\*")
 MD_LINE_BREAK_PAT = re.compile(r"\s*\\$")
 
+DOCS = DocumentSet()
+
+
+COMPONENTS_EXPR = 'require("overseer.component").get_all_descriptions()'
+COMPONENT_MANIFEST_EXPR = 'require("overseer.component").get_manifest_entries()'
+COMMANDS_EXPR = 'require("overseer").get_all_commands()'
+HIGHLIGHTS_EXPR = 'require("overseer").get_all_highlights()'
+KEYMAPS_EXPR = 'require("overseer.task_list.keymaps")._get_keymaps()'
+PATTERNS_EXPR = 'require("overseer.vscode.problem_matcher").list_patterns()'
+MATCHERS_EXPR = 'require("overseer.vscode.problem_matcher").list_problem_matchers()'
+NVIM_EXPORTS = [
+    COMPONENTS_EXPR,
+    COMPONENT_MANIFEST_EXPR,
+    COMMANDS_EXPR,
+    HIGHLIGHTS_EXPR,
+    KEYMAPS_EXPR,
+    PATTERNS_EXPR,
+    MATCHERS_EXPR,
+]
+
+_nvim_session: Optional[NvimSession] = None
+_nvim_json_cache: Dict[str, Any] = {}
+
+
+def get_nvim_session() -> NvimSession:
+    global _nvim_session
+    if _nvim_session is None:
+        _nvim_session = NvimSession(ROOT)
+        atexit.register(_nvim_session.close)
+    return _nvim_session
+
+
+def prefetch_nvim_json(exprs: Iterable[str]) -> None:
+    """Fetch all exports from a single nvim round trip
+
+    Failures are reported here, but are only raised when the failing export is actually used.
+    """
+    missing = [expr for expr in exprs if expr not in _nvim_json_cache]
+    results = get_nvim_session().export_batch(missing)
+    _nvim_json_cache.update(results)
+    errors = [v for v in results.values() if isinstance(v, NvimExportError)]
+    if errors:
+        print(f"{len(errors)} export(s) failed:\n{format_errors(errors)}")
+
+
+def invalidate_nvim_json() -> None:
+    """Drop all cached exports and unload overseer modules so they are re-read from disk"""
+    _nvim_json_cache.clear()
+    if _nvim_session is not None:
+        _nvim_session.reload_modules("overseer")
+
 
-@lru_cache(maxsize=100)
 def read_nvim_json(lua: str) -> Any:
-    cmd = f"nvim --headless --noplugin -u /dev/null -c 'set runtimepath+=.' -c 'lua print(vim.json.encode({lua}))' +qall"
-    print(cmd)
-    code, txt = subprocess.getstatusoutput(cmd)
-    if code != 0:
-        raise Exception(f"Error exporting data from overseer: {txt}")
-    try:
-        return json.loads(txt)
-    except json.JSONDecodeError as e:
-        raise Exception(f"Json decode error: {txt}") from e
+    if lua not in _nvim_json_cache:
+        try:
+            _nvim_json_cache[lua] = get_nvim_session().export(lua)
+        except NvimExportError as e:
+            _nvim_json_cache[lua] = e
+    ret = _nvim_json_cache[lua]
+    if isinstance(ret, NvimExportError):
+        raise ret
+    return ret
 
 
 def update_config_options():
     config_file = os.path.join(ROOT, "lua", "overseer", "config.lua")
-    opt_lines = read_section(config_file, r"^local default_config =", r"^}$")
-    replace_section(
+    opt_lines = DOCS.read_section(config_file, r"^local default_config =", r"^}$")
+    DOCS.replace_section(
         os.path.join(DOC, "reference.md"),
         r"^require\(\"overseer\"\).setup\({$",
         r"^}\)$",
@@ -71,7 +124,7 @@ def params_sort_key(item):
 
 
 def update_components_md():
-    components = read_nvim_json('require("overseer.component").get_all_descriptions()')
+    components = read_nvim_json(COMPONENTS_EXPR)
     doc = os.path.join(ROOT, "doc", "components.md")
     lines = ["# Built-in components\n", "\n", "<!-- TOC -->\n", "<!-- /TOC -->\n", "\n"]
     for comp in components:
@@ -131,8 +184,27 @@ def update_components_md():
                     "- **" + param["name"] + ":** " + param["long_desc"] + "\n"
                 )
         lines.append("\n")
-    with open(doc, "w", encoding="utf-8") as ofile:
-        ofile.writelines(lines)
+    DOCS.write_lines(doc, lines)
+
+
+# This must match the version in lua/overseer/component.lua
+COMPONENT_MANIFEST_VERSION = 2
+COMPONENT_MANIFEST = os.path.join(ROOT, "lua", "overseer", "component", "manifest.json")
+
+
+def update_component_manifest():
+    """Write the metadata that lets overseer list components without loading every module"""
+    components = read_nvim_json(COMPONENT_MANIFEST_EXPR)
+    for name, entry in components.items():
+        # Overseer compares this against the file size to detect edits without reading the file
+        # Components in subdirectories have dotted names, e.g. orchestrator.on_status_broadcast
+        source = (
+            os.path.join(os.path.dirname(COMPONENT_MANIFEST), *name.split(".")) + ".lua"
+        )
+        entry["size"] = os.path.getsize(source)
+    manifest = {"version": COMPONENT_MANIFEST_VERSION, "components": components}
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    DOCS.write_lines(COMPONENT_MANIFEST, [text])
 
 
 def get_desc(arg: Dict) -> str:
@@ -153,21 +225,17 @@ def format_example_code(code: str, indentation: int = 0) -> Iterable[str]:
 
 
 def updated_problem_matcher_list(doc: str):
-    patterns = read_nvim_json(
-        'require("overseer.vscode.problem_matcher").list_patterns()'
-    )
+    patterns = read_nvim_json(PATTERNS_EXPR)
     lines = [f"- `{pat}`\n" for pat in patterns]
-    replace_section(
+    DOCS.replace_section(
         doc,
         r"^<!-- problem_matcher_patterns -->$",
         r"^<!-- /problem_matcher_patterns -->$",
         ["\n"] + lines,
     )
-    matchers = read_nvim_json(
-        'require("overseer.vscode.problem_matcher").list_problem_matchers()'
-    )
+    matchers = read_nvim_json(MATCHERS_EXPR)
     lines = [f"- `{matcher}`\n" for matcher in matchers]
-    replace_section(
+    DOCS.replace_section(
         doc,
         r"^<!-- problem_matchers -->$",
         r"^<!-- /problem_matchers -->$",
@@ -181,7 +249,7 @@ def update_parsers_md():
     types = parse_lua()
     funcs = types.files["overseer/parselib.lua"].functions
     lines = ["\n"] + render_md_api2(funcs, types, level=2) + ["\n"]
-    replace_section(
+    DOCS.replace_section(
         doc,
         r"^<!-- parselib.API -->$",
         r"^<!-- /parselib.API -->$",
@@ -195,7 +263,7 @@ def update_rendering_md():
     types = parse_lua()
     funcs = types.files["overseer/render.lua"].functions
     lines = ["\n"] + render_md_api2(funcs, types, level=2) + ["\n"]
-    replace_section(
+    DOCS.replace_section(
         doc,
         r"^<!-- render.API -->$",
         r"^<!-- /render.API -->$",
@@ -205,7 +273,7 @@ def update_rendering_md():
 
 
 def update_commands_md():
-    commands = read_nvim_json('require("overseer").get_all_commands()')
+    commands = read_nvim_json(COMMANDS_EXPR)
     lines = ["\n"]
     rows = []
     for command in commands:
@@ -221,7 +289,7 @@ def update_commands_md():
         )
     lines.extend(format_md_table(rows, ["Command", "Args", "Description"]))
     lines.append("\n")
-    replace_section(
+    DOCS.replace_section(
         os.path.join(DOC, "reference.md"),
         r"^## Commands",
         r"^#",
@@ -230,7 +298,7 @@ def update_commands_md():
 
 
 def update_highlights_md():
-    highlights = read_nvim_json('require("overseer").get_all_highlights()')
+    highlights = read_nvim_json(HIGHLIGHTS_EXPR)
     lines = [
         "\n",
         "Overseer defines the following highlights. Override them to customize the colors.\n",
@@ -250,7 +318,7 @@ def update_highlights_md():
         )
     lines.extend(format_md_table(rows, ["Group", "Description"]))
     lines.append("\n")
-    replace_section(
+    DOCS.replace_section(
         os.path.join(DOC, "reference.md"),
         r"^## Highlight groups",
         r"^#",
@@ -258,12 +326,30 @@ def update_highlights_md():
     )
 
 
+LUA_PARSER = LuaParser()
+
+
+_parse_lock = threading.Lock()
+
+
 @lru_cache(maxsize=100)
-def parse_lua() -> LuaTypes:
-    types = parse_directory(os.path.join(ROOT, "lua"))
+def _parse_lua() -> LuaTypes:
+    types = LUA_PARSER.parse_directory(os.path.join(ROOT, "lua"))
+    print(LUA_PARSER.stats)
     return types
 
 
+def parse_lua() -> LuaTypes:
+    # Generators may run on multiple threads. Make sure only one of them does the parsing.
+    with _parse_lock:
+        return _parse_lua()
+
+
+def invalidate_lua_types() -> None:
+    with _parse_lock:
+        _parse_lua.cache_clear()
+
+
 def get_strategy_funcs() -> List[LuaFunc]:
     strategy_dir = os.path.join(ROOT, "lua", "overseer", "strategy")
     types = parse_lua()
@@ -284,7 +370,7 @@ def update_strategies_md():
     types = parse_lua()
     new_funcs = get_strategy_funcs()
     lines = ["\n"] + render_md_api2(new_funcs, types, level=2) + ["\n"]
-    replace_section(
+    DOCS.replace_section(
         os.path.join(DOC, "strategies.md"),
         r"^<!-- API -->$",
         r"^<!-- /API -->$",
@@ -294,7 +380,7 @@ def update_strategies_md():
 
 def get_commands_vimdoc() -> "VimdocSection":
     section = VimdocSection("Commands", "overseer-commands", ["\n"])
-    commands = read_nvim_json('require("overseer").get_all_commands()')
+    commands = read_nvim_json(COMMANDS_EXPR)
     for command in commands:
         cmd = command["cmd"]
         if command["def"].get("bang"):
@@ -310,7 +396,7 @@ def get_commands_vimdoc() -> "VimdocSection":
 def get_options_vimdoc() -> "VimdocSection":
     section = VimdocSection("options", "overseer-options")
     config_file = os.path.join(ROOT, "lua", "overseer", "config.lua")
-    opt_lines = read_section(config_file, r"^local default_config =", r"^}$")
+    opt_lines = DOCS.read_section(config_file, r"^local default_config =", r"^}$")
     lines = ["\n", ">lua\n", '    require("overseer").setup({\n']
     lines.extend(indent(opt_lines, 4))
     lines.extend(["    })\n", "<\n"])
@@ -320,7 +406,7 @@ def get_options_vimdoc() -> "VimdocSection":
 
 def get_highlights_vimdoc() -> "VimdocSection":
     section = VimdocSection("Highlights", "overseer-highlights", ["\n"])
-    highlights = read_nvim_json('require("overseer").get_all_highlights()')
+    highlights = read_nvim_json(HIGHLIGHTS_EXPR)
     for hl in highlights:
         name = hl["name"]
         desc = hl.get("desc")
@@ -400,7 +486,7 @@ using all the same parameters as |vim.keymap.set|.
         )
     )
     section.body.append("\n")
-    keymaps = read_nvim_json('require("overseer.task_list.keymaps")._get_keymaps()')
+    keymaps = read_nvim_json(KEYMAPS_EXPR)
     keymaps.sort(key=lambda a: a["name"])
     for keymap in keymaps:
         if keymap.get("deprecated"):
@@ -423,7 +509,7 @@ using all the same parameters as |vim.keymap.set|.
 
 def get_components_vimdoc() -> "VimdocSection":
     section = VimdocSection("Components", "overseer-components", ["\n"])
-    components = read_nvim_json('require("overseer.component").get_all_descriptions()')
+    components = read_nvim_json(COMPONENTS_EXPR)
     for comp in components:
         section.body.append(leftright(comp["name"], f"*{comp['name']}*"))
         if "desc" in comp:
@@ -479,7 +565,7 @@ def convert_md_section(
     section_tag: str,
     inclusive: Tuple[bool, bool] = (False, False),
 ) -> VimdocSection:
-    lines = read_section(filename, start_pat, end_pat, inclusive)
+    lines = DOCS.read_section(filename, start_pat, end_pat, inclusive)
     lines = convert_markdown_to_vimdoc(lines)
     return VimdocSection(section_name, section_tag, lines)
 
@@ -512,15 +598,14 @@ def generate_vimdoc():
     )
 
     # TODO check for missing tags
-    with open(VIMDOC, "w", encoding="utf-8") as ofile:
-        ofile.writelines(doc.render())
+    DOCS.write_lines(VIMDOC, doc.render())
 
 
 def update_md_api():
     types = parse_lua()
     funcs = types.files["overseer/init.lua"].functions
     lines = ["\n"] + render_md_api2(funcs, types) + ["\n"]
-    replace_section(
+    DOCS.replace_section(
         os.path.join(DOC, "reference.md"),
         r"^<!-- API -->$",
         r"^<!-- /API -->$",
@@ -536,7 +621,7 @@ def update_md_api():
     funcs.pop(0)
     lines.extend(render_md_api2(funcs, types, level=4))
     lines.append("\n")
-    replace_section(
+    DOCS.replace_section(
         os.path.join(DOC, "reference.md"),
         r"^<!-- Task API -->$",
         r"^<!-- /Task API -->$",
@@ -545,8 +630,8 @@ def update_md_api():
 
 
 def update_md_toc(filename: str, max_level: int = 99):
-    toc = ["\n"] + generate_md_toc(filename, max_level) + ["\n"]
-    replace_section(
+    toc = ["\n"] + DOCS.md_toc(filename, max_level) + ["\n"]
+    DOCS.replace_section(
         filename,
         r"^<!-- TOC -->$",
         r"^<!-- /TOC -->$",
@@ -562,10 +647,10 @@ def add_md_link_path(path: str, lines: List[str]) -> List[str]:
 
 
 def update_readme_toc():
-    toc = generate_md_toc(README)
+    toc = DOCS.md_toc(README)
 
     def get_toc(filename: str) -> List[str]:
-        subtoc = generate_md_toc(os.path.join(DOC, filename))
+        subtoc = DOCS.md_toc(os.path.join(DOC, filename))
         return add_md_link_path("doc/" + filename, subtoc)
 
     tutorials_toc = get_toc("tutorials.md")
@@ -593,43 +678,43 @@ def update_readme_toc():
     add_subtoc("Recipes", recipes_toc)
     add_subtoc("Reference", reference_toc)
 
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Tutorials$",
         r"^#",
         ["\n"] + tutorials_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Guides$",
         r"^#",
         ["\n"] + guides_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Reference$",
         r"^#",
         ["\n"] + reference_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Explanation$",
         r"^#",
         ["\n"] + explanation_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Third-party integrations$",
         r"^#",
         ["\n"] + third_party_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^## Recipes$",
         r"^#",
         ["\n"] + recipes_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         README,
         r"^<!-- TOC -->$",
         r"^<!-- /TOC -->$",
@@ -642,30 +727,30 @@ def update_reference_md():
     update_md_api()
     update_highlights_md()
     components_toc = add_md_link_path(
-        "components.md", generate_md_toc(os.path.join(DOC, "components.md"))
+        "components.md", DOCS.md_toc(os.path.join(DOC, "components.md"))
     )
     strategies_toc = add_md_link_path(
-        "strategies.md", generate_md_toc(os.path.join(DOC, "strategies.md"))
+        "strategies.md", DOCS.md_toc(os.path.join(DOC, "strategies.md"))
     )
     reference_doc = os.path.join(DOC, "reference.md")
-    toc = ["\n"] + generate_md_toc(reference_doc) + ["\n"]
+    toc = ["\n"] + DOCS.md_toc(reference_doc) + ["\n"]
     idx = toc.index("- [Components](#components)\n")
     toc[idx + 1 : idx + 1] = ["  " + line for line in components_toc]
     idx = toc.index("- [Strategies](#strategies)\n")
     toc[idx + 1 : idx + 1] = ["  " + line for line in strategies_toc]
-    replace_section(
+    DOCS.replace_section(
         reference_doc,
         r"^<!-- TOC -->$",
         r"^<!-- /TOC -->$",
         toc,
     )
-    replace_section(
+    DOCS.replace_section(
         reference_doc,
         r"^<!-- TOC.components -->$",
         r"^<!-- /TOC.components -->$",
         ["\n"] + components_toc + ["\n"],
     )
-    replace_section(
+    DOCS.replace_section(
         reference_doc,
         r"^<!-- TOC.strategies -->$",
         r"^<!-- /TOC.strategies -->$",
@@ -673,20 +758,220 @@ def update_reference_md():
     )
 
 
-def main() -> None:
+class Step(NamedTuple):
+    """A single doc generator, the files it reads (globs relative to ROOT), and the docs it writes"""
+
+    name: str
+    func: Callable[[], None]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+def toc_step(filename: str, max_level: int = 99) -> Step:
+    return Step(
+        f"update_md_toc({filename})",
+        partial(update_md_toc, os.path.join(DOC, filename), max_level),
+        ("doc/" + filename,),
+        ("doc/" + filename,),
+    )
+
+
+COMPONENT_INPUTS = ("lua/overseer/component.lua", "lua/overseer/component/**/*.lua")
+API_INPUTS = (
+    "lua/overseer/init.lua",
+    "lua/overseer/commands.lua",
+    "lua/overseer/task.lua",
+)
+
+# Steps are listed in the order they must run. A step that writes a doc will cause all later steps
+# that list that doc as an input to run as well.
+STEPS = [
+    Step(
+        "update_config_options",
+        update_config_options,
+        ("lua/overseer/config.lua",),
+        ("doc/reference.md",),
+    ),
+    Step(
+        "update_strategies_md",
+        update_strategies_md,
+        ("lua/overseer/strategy/*.lua", "doc/strategies.md"),
+        ("doc/strategies.md",),
+    ),
+    toc_step("strategies.md", 2),
+    Step(
+        "update_parsers_md",
+        update_parsers_md,
+        (
+            "lua/overseer/parselib.lua",
+            "lua/overseer/vscode/problem_matcher.lua",
+            "doc/parsers.md",
+        ),
+        ("doc/parsers.md",),
+    ),
+    Step(
+        "update_rendering_md",
+        update_rendering_md,
+        ("lua/overseer/render.lua", "doc/rendering.md"),
+        ("doc/rendering.md",),
+    ),
+    Step(
+        "update_components_md",
+        update_components_md,
+        COMPONENT_INPUTS,
+        ("doc/components.md",),
+    ),
+    toc_step("components.md"),
+    Step(
+        "update_component_manifest",
+        update_component_manifest,
+        COMPONENT_INPUTS,
+        ("lua/overseer/component/manifest.json",),
+    ),
+    Step(
+        "update_reference_md",
+        update_reference_md,
+        API_INPUTS + ("doc/reference.md", "doc/components.md", "doc/strategies.md"),
+        ("doc/reference.md",),
+    ),
+    toc_step("tutorials.md"),
+    toc_step("guides.md"),
+    toc_step("explanation.md"),
+    toc_step("third_party.md"),
+    toc_step("recipes.md"),
+    Step(
+        "update_readme_toc",
+        update_readme_toc,
+        ("README.md", "doc/*.md"),
+        ("README.md",),
+    ),
+    Step(
+        "generate_vimdoc",
+        generate_vimdoc,
+        API_INPUTS
+        + COMPONENT_INPUTS
+        + (
+            "lua/overseer/config.lua",
+            "lua/overseer/task_list/*.lua",
+            "doc/reference.md",
+            "doc/guides.md",
+        ),
+        ("doc/overseer.txt",),
+    ),
+]
+
+
+def glob_to_regex(pattern: str) -> "re.Pattern":
+    """Convert a glob to a regex. '*' does not match '/', and '**/' matches any number of dirs"""
+    pieces = []
+    for part in re.split(r"(\*\*/|\*)", pattern):
+        if part == "**/":
+            pieces.append("(?:.*/)?")
+        elif part == "*":
+            pieces.append("[^/]*")
+        else:
+            pieces.append(re.escape(part))
+    return re.compile("^" + "".join(pieces) + "$")
+
+
+@lru_cache(maxsize=None)
+def _step_patterns(step: Step) -> List["re.Pattern"]:
+    return [glob_to_regex(pattern) for pattern in step.inputs]
+
+
+def _reads(step: Step, path: str) -> bool:
+    return any(pat.match(path) for pat in _step_patterns(step))
+
+
+def steps_for_paths(paths: Iterable[str]) -> List[Step]:
+    """Get the steps that directly read any of the given paths (relative to ROOT)"""
+    paths = list(paths)
+    return [step for step in STEPS if any(_reads(step, path) for path in paths)]
+
+
+def step_dependencies(step: Step) -> List[Step]:
+    """Earlier steps that must finish first because they write a file this step reads or writes"""
+    idx = STEPS.index(step)
+    return [
+        prev
+        for prev in STEPS[:idx]
+        if any(_reads(step, out) or out in step.outputs for out in prev.outputs)
+    ]
+
+
+def run_steps(changed: Optional[Set[str]] = None) -> None:
+    """Run the doc generators in order
+
+    If changed is None, run all of them. Otherwise only run the steps affected by the changed paths
+    (relative to ROOT), including steps that read docs modified by an earlier step.
+    """
+    changed = None if changed is None else set(changed)
+    for step in STEPS:
+        if changed is not None and step not in steps_for_paths(changed):
+            continue
+        before = DOCS.versions()
+        step.func()
+        if changed is not None:
+            for path, version in DOCS.versions().items():
+                if before.get(path) != version:
+                    changed.add(os.path.relpath(path, ROOT))
+
+
+def run_steps_parallel(jobs: int) -> None:
+    """Run all doc generators on a thread pool, respecting the dependencies between them"""
+
+    def run_after(deps: List["Future[None]"], step: Step) -> None:
+        for dep in deps:
+            dep.result()
+        step.func()
+
+    # Steps are submitted in order and the pool is FIFO, so every dependency has already been
+    # picked up by a worker by the time a step starts waiting on it.
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures: Dict[Step, "Future[None]"] = {}
+        for step in STEPS:
+            deps = [futures[dep] for dep in step_dependencies(step)]
+            futures[step] = executor.submit(run_after, deps, step)
+        for future in futures.values():
+            future.result()
+
+
+def flush_docs() -> None:
+    for filename in DOCS.flush():
+        print(f"Wrote {os.path.relpath(filename, ROOT)}")
+
+
+def main(use_cache: bool = True, jobs: int = 1) -> None:
     """Update the README"""
-    update_config_options()
-    update_strategies_md()
-    update_md_toc(os.path.join(DOC, "strategies.md"), 2)
-    update_parsers_md()
-    update_rendering_md()
-    update_components_md()
-    update_md_toc(os.path.join(DOC, "components.md"))
-    update_reference_md()
-    update_md_toc(os.path.join(DOC, "tutorials.md"))
-    update_md_toc(os.path.join(DOC, "guides.md"))
-    update_md_toc(os.path.join(DOC, "explanation.md"))
-    update_md_toc(os.path.join(DOC, "third_party.md"))
-    update_md_toc(os.path.join(DOC, "recipes.md"))
-    update_readme_toc()
-    generate_vimdoc()
+    LUA_PARSER.use_cache = use_cache
+    LUA_PARSER.jobs = jobs
+    prefetch_nvim_json(NVIM_EXPORTS)
+    run_steps_parallel(jobs)
+    flush_docs()
+
+
+def check(use_cache: bool = True, jobs: int = 1) -> bool:
+    """Verify that the generated docs are up to date without writing anything
+
+    Prints a diff of every stale file and returns False if any were found.
+    """
+    LUA_PARSER.use_cache = use_cache
+    LUA_PARSER.jobs = jobs
+    prefetch_nvim_json(NVIM_EXPORTS)
+    run_steps_parallel(jobs)
+    stale = DOCS.modified()
+    for doc in stale:
+        relpath = os.path.relpath(doc.path, ROOT)
+        if doc.original is None:
+            print(f"{relpath} is missing")
+        sys.stdout.writelines(
+            difflib.unified_diff(
+                (doc.original or "").splitlines(keepends=True),
+                doc.lines,
+                fromfile="a/" + relpath,
+                tofile="b/" + relpath,
+            )
+        )
+    if stale:
+        print(f"{len(stale)} generated file(s) are out of date. Run 'make doc' to fix.")
+    return not stale
@@ -0,0 +1,122 @@
+import hashlib
+import inspect
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from nvim_doc_tools import LuaTypes, apidoc
+from nvim_doc_tools.apidoc import LuaFile, parse_file
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
+CACHE_DIR = os.path.join(ROOT, ".cache", "luaparse")
+# Bump this to invalidate all cached parse results
+CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """Hash of the parser source, so that upgrading nvim_doc_tools invalidates the cache"""
+    hasher = hashlib.sha256(str(CACHE_VERSION).encode("utf-8"))
+    source = inspect.getsourcefile(apidoc)
+    if source is not None:
+        with open(source, "rb") as ifile:
+            hasher.update(ifile.read())
+    return hasher.hexdigest()
+
+
+def list_lua_files(root: str) -> List[str]:
+    """Sorted list of all lua files under root, relative to root"""
+    ret = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".lua"):
+                ret.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    return ret
+
+
+class ParseStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self) -> str:
+        return f"Lua parse cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+
+class LuaParser:
+    """Parses a directory of lua files, caching the result for each file by content hash"""
+
+    def __init__(
+        self, cache_dir: str = CACHE_DIR, use_cache: bool = True, jobs: int = 1
+    ):
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.jobs = jobs
+        self.stats = ParseStats()
+
+    def _cache_file(self, relpath: str, content: bytes) -> str:
+        hasher = hashlib.sha256(parser_fingerprint().encode("utf-8"))
+        hasher.update(relpath.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(content)
+        return os.path.join(self.cache_dir, hasher.hexdigest() + ".pickle")
+
+    def _load(self, cache_file: str) -> Optional[LuaFile]:
+        try:
+            with open(cache_file, "rb") as ifile:
+                return pickle.load(ifile)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring corrupt cache entry {cache_file}: {e}")
+            return None
+
+    def _store(self, cache_file: str, lua_file: LuaFile) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmpfile = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmpfile, "wb") as ofile:
+            pickle.dump(lua_file, ofile)
+        os.replace(tmpfile, cache_file)
+
+    def parse_directory(self, root: str) -> LuaTypes:
+        """Parse all lua files in a directory
+
+        Files that miss the cache are parsed in a process pool when jobs > 1. Results are always
+        merged in sorted path order, so the output does not depend on the number of jobs.
+        """
+        relpaths = list_lua_files(root)
+        parsed: Dict[str, LuaFile] = {}
+        misses: Dict[str, Optional[str]] = {}
+        for relpath in relpaths:
+            if not self.use_cache:
+                misses[relpath] = None
+                continue
+            with open(os.path.join(root, relpath), "rb") as ifile:
+                cache_file = self._cache_file(relpath, ifile.read())
+            lua_file = self._load(cache_file)
+            if lua_file is None:
+                misses[relpath] = cache_file
+            else:
+                parsed[relpath] = lua_file
+        self.stats.hits += len(parsed)
+        self.stats.misses += len(misses)
+
+        filepaths = [os.path.join(root, relpath) for relpath in misses]
+        if self.jobs > 1 and len(filepaths) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(executor.map(parse_file, filepaths, chunksize=4))
+        else:
+            results = [parse_file(filepath) for filepath in filepaths]
+        for (relpath, miss_cache_file), lua_file in zip(misses.items(), results):
+            parsed[relpath] = lua_file
+            if miss_cache_file is not None:
+                self._store(miss_cache_file, lua_file)
+
+        types = LuaTypes()
+        for relpath in relpaths:
+            types.add_file(relpath, parsed[relpath])
+        return types
@@ -12,19 +12,60 @@ def main() -> None:
     """Generate docs"""
     sys.path.append(HERE)
     parser = argparse.ArgumentParser(description=main.__doc__)
-    parser.add_argument("command", choices=["generate", "lint"])
+    parser.add_argument(
+        "command",
+        choices=["generate", "check", "lint", "watch", "bench", "replay", "trace"],
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the on-disk cache of parsed Lua files",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of parallel jobs for parsing and generating (default %(default)s)",
+    )
+    if sys.argv[1:2] == ["bench"]:
+        # The bench command has its own arguments
+        import bench
+
+        bench.main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["replay"]:
+        import replay
+
+        replay.main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["trace"]:
+        import trace_summary
+
+        trace_summary.main(sys.argv[2:])
+        return
     args = parser.parse_args()
     if args.command == "generate":
         import generate
 
-        generate.main()
+        generate.main(use_cache=not args.no_cache, jobs=args.jobs)
+    elif args.command == "check":
+        import generate
+
+        if not generate.check(use_cache=not args.no_cache, jobs=args.jobs):
+            sys.exit(1)
+    elif args.command == "watch":
+        import watch
+
+        watch.main(use_cache=not args.no_cache, jobs=args.jobs)
     elif args.command == "lint":
-        from nvim_doc_tools import lint_md_links
+        import md_links
 
         files = [os.path.join(ROOT, "README.md")] + [
             os.path.join(DOC, file) for file in os.listdir(DOC) if file.endswith(".md")
         ]
-        lint_md_links.main(ROOT, files)
+        if not md_links.main(ROOT, files):
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+import os
+import re
+from typing import List, Optional
+
+from documents import DocumentSet
+
+MD_LINK_PAT = re.compile(r"\[[^\]]*\]\(([^)\s]+)\)")
+MD_CODE_SPAN_PAT = re.compile(r"`[^`]*`")
+
+
+def lint_file(docs: DocumentSet, root: str, filename: str) -> List[str]:
+    """Check that all relative links in a markdown file point to existing files and anchors"""
+    errors = []
+    relpath = os.path.relpath(filename, root)
+    dirname = os.path.dirname(filename)
+    in_code_block = False
+    for lnum, line in enumerate(docs.read_lines(filename), 1):
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block:
+            continue
+        for match in MD_LINK_PAT.finditer(MD_CODE_SPAN_PAT.sub("", line)):
+            dest = match[1]
+            if re.match(r"^\w+:", dest):
+                continue
+            path, _, anchor = dest.partition("#")
+            target = os.path.normpath(os.path.join(dirname, path)) if path else filename
+            if not os.path.exists(target):
+                errors.append(f"{relpath}:{lnum}: link to missing file {dest}")
+                continue
+            if anchor and target.endswith(".md"):
+                if anchor not in docs.heading_index(target).anchors:
+                    errors.append(f"{relpath}:{lnum}: link to missing anchor {dest}")
+    return errors
+
+
+def main(root: str, files: List[str], docs: Optional[DocumentSet] = None) -> bool:
+    """Lint the links in markdown files. Returns False if any broken links were found."""
+    if docs is None:
+        docs = DocumentSet()
+    errors = []
+    for filename in files:
+        errors.extend(lint_file(docs, root, filename))
+    for error in errors:
+        print(error)
+    return not errors
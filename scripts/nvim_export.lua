@@ -0,0 +1,38 @@
+-- Export server used by scripts/nvim_export.py
+-- Reads one JSON request per line from stdin and writes one JSON response per line to stdout.
+--   request:  {"id": 1, "expr": "require('overseer').get_all_commands()"}
+--   response: {"id": 1, "ok": true, "result": "<json>"} or {"id": 1, "ok": false, "error": "..."}
+local root = _G.arg[1]
+vim.opt.runtimepath:append(root)
+
+local function eval(expr)
+  local fn, err = loadstring("return " .. expr, expr)
+  if not fn then
+    error(err, 0)
+  end
+  -- Encode here so that values that can't be serialized are reported as errors for this request
+  return vim.json.encode(fn())
+end
+
+local function respond(resp)
+  io.stdout:write(vim.json.encode(resp) .. "\n")
+  io.stdout:flush()
+end
+
+while true do
+  local line = io.stdin:read("*l")
+  if not line then
+    break
+  end
+  local ok_decode, req = pcall(vim.json.decode, line)
+  if not ok_decode or type(req) ~= "table" then
+    respond({ id = vim.NIL, ok = false, error = "Invalid request: " .. line })
+  else
+    local ok, result = xpcall(eval, debug.traceback, req.expr)
+    if ok then
+      respond({ id = req.id, ok = true, result = result })
+    else
+      respond({ id = req.id, ok = false, error = tostring(result) })
+    end
+  end
+end
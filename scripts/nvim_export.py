@@ -0,0 +1,136 @@
+import json
+import os
+import subprocess
+import threading
+from typing import IO, Any, Dict, Iterable, List, Optional, Union
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
+SERVER = os.path.join(HERE, "nvim_export.lua")
+
+
+class NvimExportError(Exception):
+    """Raised when a single export expression fails inside nvim"""
+
+    def __init__(self, expr: str, message: str):
+        super().__init__(f"Error exporting data from overseer ({expr}): {message}")
+        self.expr = expr
+        self.message = message
+
+
+class NvimSession:
+    """A single long-lived headless nvim that evaluates Lua expressions and returns them as JSON"""
+
+    def __init__(self, root: str = ROOT):
+        self.root = root
+        self._proc: Optional[subprocess.Popen] = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            return
+        cmd = ["nvim", "--headless", "--noplugin", "-u", "NONE", "-i", "NONE"]
+        cmd += ["-l", SERVER, self.root]
+        print(" ".join(cmd))
+        self._proc = subprocess.Popen(
+            cmd,
+            cwd=self.root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def close(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        if proc.stdin is not None:
+            proc.stdin.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def __enter__(self) -> "NvimSession":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _send(self, stdin: IO[str], expr: str) -> int:
+        self._next_id += 1
+        stdin.write(json.dumps({"id": self._next_id, "expr": expr}) + "\n")
+        return self._next_id
+
+    def _recv(self, stdout: IO[str]) -> Dict[str, Any]:
+        line = stdout.readline()
+        if not line:
+            code = self._proc.wait() if self._proc is not None else None
+            self._proc = None
+            raise Exception(f"nvim export server exited unexpectedly (code {code})")
+        return json.loads(line)
+
+    def export_batch(
+        self, exprs: Iterable[str]
+    ) -> Dict[str, Union[Any, NvimExportError]]:
+        """Evaluate many expressions in one round trip
+
+        A failing expression does not affect the others. Its value in the returned dict is the
+        NvimExportError describing the failure.
+        """
+        exprs = list(dict.fromkeys(exprs))
+        ret: Dict[str, Union[Any, NvimExportError]] = {}
+        if not exprs:
+            return ret
+        with self._lock:
+            self.start()
+            assert self._proc is not None
+            stdin, stdout = self._proc.stdin, self._proc.stdout
+            assert stdin is not None and stdout is not None
+            ids: Dict[int, str] = {}
+            for expr in exprs:
+                ids[self._send(stdin, expr)] = expr
+            stdin.flush()
+            for _ in exprs:
+                resp = self._recv(stdout)
+                resp_expr = ids.get(resp["id"])
+                if resp_expr is None:
+                    raise Exception(f"Unexpected response from export server: {resp}")
+                expr = resp_expr
+                if not resp["ok"]:
+                    ret[expr] = NvimExportError(expr, resp["error"])
+                    continue
+                try:
+                    ret[expr] = json.loads(resp["result"])
+                except json.JSONDecodeError as e:
+                    err = NvimExportError(expr, f"Json decode error: {resp['result']}")
+                    err.__cause__ = e
+                    ret[expr] = err
+        return ret
+
+    def export(self, expr: str) -> Any:
+        """Evaluate a single Lua expression and return the decoded JSON value"""
+        result = self.export_batch([expr])[expr]
+        if isinstance(result, NvimExportError):
+            raise result
+        return result
+
+    def reload_modules(self, prefix: str = "overseer") -> None:
+        """Unload all lua modules matching a prefix so they are re-required from disk"""
+        if self._proc is None:
+            return
+        pattern = "^" + prefix.replace(".", "%.")
+        self.export(
+            "(function() for k in pairs(package.loaded) do "
+            f"if k:match({json.dumps(pattern)}) then package.loaded[k] = nil end "
+            "end return true end)()"
+        )
+
+
+def format_errors(errors: List[NvimExportError]) -> str:
+    return "\n".join(f"  {err.expr}: {err.message}" for err in errors)
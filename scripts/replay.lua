@@ -0,0 +1,154 @@
+-- Replays large build logs through overseer's output parsers. Driven by scripts/replay.py
+-- Usage: nvim --headless --noplugin -u NONE -i NONE -l scripts/replay.lua <root> <opts json>
+local root = _G.arg[1]
+local opts = vim.json.decode(_G.arg[2] or "{}")
+vim.opt.runtimepath:append(root)
+vim.o.swapfile = false
+
+require("overseer").setup({})
+local problem_matcher = require("overseer.vscode.problem_matcher")
+local util = require("overseer.util")
+
+local uv = vim.uv
+local chunk_size = opts.chunk_size or 4096
+
+---@param filename string
+---@return string
+local function read_file(filename)
+  local fd = assert(io.open(filename, "rb"))
+  local data = fd:read("*a")
+  fd:close()
+  return data
+end
+
+---Split the log into chunks the same way jobstart would deliver them, and convert each chunk into
+---complete lines using the same line iterator as the strategies
+---@param data string
+---@return string[][]
+local function chunk_lines(data)
+  local iter = util.get_stdout_line_iter()
+  local ret = {}
+  for i = 1, #data, chunk_size do
+    local chunk = data:sub(i, i + chunk_size - 1)
+    local lines = iter(vim.split(chunk, "\n", { plain = true }))
+    if not vim.tbl_isempty(lines) then
+      table.insert(ret, lines)
+    end
+  end
+  -- Flush the last line
+  local lines = iter({ "" })
+  if not vim.tbl_isempty(lines) then
+    table.insert(ret, lines)
+  end
+  return ret
+end
+
+---@param batches string[][]
+---@param feed fun(lines: string[])
+---@return {elapsed_s: number, peak_kb: number}
+local function measure(batches, feed)
+  collectgarbage("collect")
+  local base_kb = collectgarbage("count")
+  local peak_kb = base_kb
+  local start = uv.hrtime()
+  for _, lines in ipairs(batches) do
+    feed(lines)
+    local kb = collectgarbage("count")
+    if kb > peak_kb then
+      peak_kb = kb
+    end
+  end
+  return {
+    elapsed_s = (uv.hrtime() - start) / 1e9,
+    peak_kb = peak_kb - base_kb,
+  }
+end
+
+---@param scenario table
+---@param batches string[][]
+---@return table
+local function replay_problem_matcher(scenario, batches)
+  local parser = assert(problem_matcher.get_parser_from_problem_matcher(scenario.problem_matcher))
+  local stats = measure(batches, function(lines)
+    for _, line in ipairs(lines) do
+      parser:parse(line)
+    end
+  end)
+  stats.results = #(parser:get_result().diagnostics or {})
+  return stats
+end
+
+---@param scenario table
+---@param batches string[][]
+---@param tail boolean
+---@return table
+local function replay_quickfix(scenario, batches, tail)
+  local task = require("overseer.task").new({
+    cmd = { "replay" },
+    name = scenario.name,
+    cwd = root,
+    strategy = "test",
+    components = {
+      {
+        "on_output_quickfix",
+        errorformat = scenario.errorformat,
+        items_only = true,
+        tail = tail,
+      },
+      "on_exit_set_status",
+    },
+  })
+  task:start()
+  local strategy = task.strategy ---@diagnostic disable-line: invisible
+  ---@cast strategy overseer.TestStrategy
+  local stats = measure(batches, function(lines)
+    strategy:send_output(lines)
+  end)
+  -- Completion is where the non-tail path does all of its work, so include it in the timing
+  local start = uv.hrtime()
+  strategy:send_exit(0)
+  stats.elapsed_s = stats.elapsed_s + (uv.hrtime() - start) / 1e9
+  stats.results = vim.fn.getqflist({ context = 0, size = 0 }).size
+  task:dispose(true)
+  return stats
+end
+
+local results = {}
+for _, scenario in ipairs(opts.scenarios) do
+  local batches = chunk_lines(read_file(scenario.file))
+  local num_lines = 0
+  for _, lines in ipairs(batches) do
+    num_lines = num_lines + #lines
+  end
+  local runs = {}
+  if scenario.problem_matcher then
+    runs.problem_matcher = replay_problem_matcher(scenario, batches)
+  end
+  if scenario.errorformat then
+    runs.quickfix_tail = replay_quickfix(scenario, batches, true)
+    runs.quickfix = replay_quickfix(scenario, batches, false)
+  end
+  for path, stats in pairs(runs) do
+    local name = string.format("%s %s", scenario.name, path)
+    stats.lines = num_lines
+    stats.lines_per_sec = num_lines / stats.elapsed_s
+    results[name] = stats
+    io.stderr:write(
+      string.format(
+        "%-40s %12.0f lines/s %10.0f KB %8d results\n",
+        name,
+        stats.lines_per_sec,
+        stats.peak_kb,
+        stats.results
+      )
+    )
+  end
+end
+
+local outfile = assert(io.open(opts.output, "w"))
+outfile:write(vim.json.encode({
+  nvim = tostring(vim.version()),
+  chunk_size = chunk_size,
+  results = results,
+}))
+outfile:close()
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from bench import run_lua_script
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
+REPLAY_SCRIPT = os.path.join(HERE, "replay.lua")
+CORPUS_DIR = os.path.join(ROOT, ".cache", "replay")
+# Bump this when the generators change so that stale logs are regenerated
+CORPUS_VERSION = 1
+
+NOISE = [
+    "[{pct:3d}%] Building CXX object src/CMakeFiles/core.dir/{name}.cpp.o",
+    "make[2]: Entering directory '/home/user/project/build/{name}'",
+    "   Compiling {name} v0.{pct}.0 (/home/user/project/{name})",
+    "{name}: ok ({pct}ms)",
+    "    at Object.<anonymous> (/home/user/project/{name}.js:{pct}:9)",
+    "",
+]
+WORDS = ["parser", "render", "task", "widget", "config", "server", "util", "index"]
+
+
+def noise(rng: random.Random) -> str:
+    return rng.choice(NOISE).format(pct=rng.randint(0, 100), name=rng.choice(WORDS))
+
+
+def gen_gcc(rng: random.Random) -> Iterator[str]:
+    while True:
+        if rng.random() < 0.05:
+            kind = rng.choice(["error", "warning"])
+            name = rng.choice(WORDS)
+            yield (
+                f"src/{name}.cpp:{rng.randint(1, 2000)}:{rng.randint(1, 80)}: {kind}: "
+                f"'{name}' was not declared in this scope"
+            )
+        else:
+            yield noise(rng)
+
+
+def gen_tsc(rng: random.Random) -> Iterator[str]:
+    while True:
+        if rng.random() < 0.05:
+            name = rng.choice(WORDS)
+            yield (
+                f"src/{name}.ts({rng.randint(1, 2000)},{rng.randint(1, 80)}): error "
+                f"TS{rng.randint(1000, 9999)}: Type 'string' is not assignable to type 'number'."
+            )
+        else:
+            yield noise(rng)
+
+
+def gen_eslint_stylish(rng: random.Random) -> Iterator[str]:
+    while True:
+        if rng.random() < 0.1:
+            yield f"/home/user/project/src/{rng.choice(WORDS)}.js"
+            for _ in range(rng.randint(1, 8)):
+                kind = rng.choice(["error", "warning"])
+                yield (
+                    f"  {rng.randint(1, 2000)}:{rng.randint(1, 80)}  {kind}  "
+                    f"'{rng.choice(WORDS)}' is defined but never used  no-unused-vars"
+                )
+            yield ""
+        else:
+            yield noise(rng)
+
+
+def gen_cargo(rng: random.Random) -> Iterator[str]:
+    while True:
+        if rng.random() < 0.05:
+            kind = rng.choice(["error", "warning"])
+            yield f"{kind}[E{rng.randint(0, 999):04d}]: mismatched types"
+            yield f"  --> src/{rng.choice(WORDS)}.rs:{rng.randint(1, 2000)}:{rng.randint(1, 80)}"
+            yield "   |"
+            yield '12 |     let x: u32 = "hello";'
+            yield "   |                  ^^^^^^^ expected `u32`, found `&str`"
+            yield ""
+        else:
+            yield noise(rng)
+
+
+class Scenario(NamedTuple):
+    name: str
+    generate: Callable[[random.Random], Iterator[str]]
+    problem_matcher: Any
+    errorformat: Optional[str]
+
+
+CARGO_MATCHER = {
+    "fileLocation": "relative",
+    "pattern": [
+        {
+            "regexp": "^(warning|error)(?:\\[(\\w+)\\])?: (.*)$",
+            "vim_regexp": "\\v^(warning|error)%(\\[(\\w+)\\])?: (.*)$",
+            "severity": 1,
+            "code": 2,
+            "message": 3,
+        },
+        {
+            "regexp": "^\\s+-->\\s+(.*):(\\d+):(\\d+)$",
+            "vim_regexp": "\\v^\\s+--\\>\\s+(.*):(\\d+):(\\d+)$",
+            "file": 1,
+            "line": 2,
+            "column": 3,
+        },
+    ],
+}
+
+SCENARIOS = [
+    Scenario("gcc", gen_gcc, "$gcc", "%f:%l:%c: %t%*[^:]: %m,%-G%.%#"),
+    Scenario("tsc", gen_tsc, "$tsc", "%f(%l\\,%c): %t%*[^ ] TS%n: %m,%-G%.%#"),
+    Scenario(
+        "eslint-stylish",
+        gen_eslint_stylish,
+        "$eslint-stylish",
+        "%-P%f,%\\s%#%l:%c %#%trror %#%m,%\\s%#%l:%c %#%tarning %#%m,%-Q,%-G%.%#",
+    ),
+    Scenario(
+        "cargo",
+        gen_cargo,
+        CARGO_MATCHER,
+        "%E%trror[%.%#]: %m,%W%tarning[%.%#]: %m,%Z%\\s%#--> %f:%l:%c,%-G%.%#",
+    ),
+]
+
+
+def corpus_file(scenario: Scenario, num_lines: int, corpus_dir: str) -> str:
+    """Get the path to the log for a scenario, generating it if it doesn't exist"""
+    filename = os.path.join(
+        corpus_dir, f"{scenario.name}-{num_lines}-v{CORPUS_VERSION}.log"
+    )
+    if os.path.exists(filename):
+        return filename
+    os.makedirs(corpus_dir, exist_ok=True)
+    # Seed with the scenario name so the corpus is reproducible
+    rng = random.Random(scenario.name)
+    lines = scenario.generate(rng)
+    tmpfile = filename + ".tmp"
+    with open(tmpfile, "w", encoding="utf-8") as ofile:
+        for _ in range(num_lines):
+            ofile.write(next(lines) + "\n")
+    os.replace(tmpfile, filename)
+    return filename
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Compare throughput of two runs and return the regressions"""
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+        if base is None or base["lines_per_sec"] <= 0:
+            continue
+        ratio = result["lines_per_sec"] / base["lines_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{name}: {base['lines_per_sec']:.0f} -> {result['lines_per_sec']:.0f} "
+                f"lines/s ({100 * (ratio - 1):+.1f}%)"
+            )
+    return regressions
+
+
+def main(argv: List[str]) -> None:
+    """Replay large build logs through the output parsers and measure throughput"""
+    parser = argparse.ArgumentParser(prog="main.py replay", description=main.__doc__)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.name for s in SCENARIOS],
+        help="Only run this scenario (may be repeated)",
+    )
+    parser.add_argument(
+        "--lines",
+        type=int,
+        default=200000,
+        help="Number of lines in each generated log (default %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4096,
+        help="Bytes per simulated output chunk (default %(default)s)",
+    )
+    parser.add_argument(
+        "--corpus",
+        default=CORPUS_DIR,
+        help="Directory for the logs. Existing files are reused. (default %(default)s)",
+    )
+    parser.add_argument("-o", "--output", help="Save the results as JSON to this file")
+    parser.add_argument(
+        "--baseline", help="Compare against results saved with --output"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative throughput drop that counts as a regression (default %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    opts = {
+        "chunk_size": args.chunk_size,
+        "scenarios": [
+            {
+                "name": s.name,
+                "file": corpus_file(s, args.lines, args.corpus),
+                "problem_matcher": s.problem_matcher,
+                "errorformat": s.errorformat,
+            }
+            for s in scenarios
+        ],
+    }
+    current = run_lua_script(REPLAY_SCRIPT, opts)
+
+    results = current["results"]
+    width = max((len(name) for name in results), default=0)
+    print(
+        f"{'scenario':<{width}}  {'lines':>8}  {'lines/s':>10}  {'peak KB':>9}  {'results':>8}"
+    )
+    for name, result in sorted(results.items()):
+        print(
+            f"{name:<{width}}  {result['lines']:>8}  {result['lines_per_sec']:>10.0f}  "
+            f"{result['peak_kb']:>9.0f}  {result['results']:>8}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as ofile:
+            json.dump(current, ofile, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as ifile:
+            baseline = json.load(ifile)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
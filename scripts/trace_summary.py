@@ -0,0 +1,151 @@
+import argparse
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+
+class Span(NamedTuple):
+    name: str
+    cat: str
+    ts: float
+    dur: float
+    args: Dict[str, Any]
+
+
+class Stats(NamedTuple):
+    name: str
+    calls: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+
+
+def load_events(filename: str) -> List[Dict[str, Any]]:
+    with open(filename, "r", encoding="utf-8") as ifile:
+        data = json.load(ifile)
+    # Both the object format and the bare array format are valid trace files
+    if isinstance(data, list):
+        return data
+    dropped = data.get("otherData", {}).get("dropped_events", 0)
+    if dropped:
+        print(f"Warning: {dropped} events were dropped while recording")
+    events = data.get("traceEvents", [])
+    # An empty lua table is encoded as a JSON object
+    return events if isinstance(events, list) else []
+
+
+def collect_spans(events: List[Dict[str, Any]]) -> List[Span]:
+    """Convert complete events and pairs of async begin/end events into spans"""
+    spans = []
+    open_async: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for event in sorted(events, key=lambda e: e.get("ts", 0)):
+        ph = event.get("ph")
+        cat = event.get("cat", "")
+        if ph == "X":
+            spans.append(
+                Span(
+                    event["name"],
+                    cat,
+                    event["ts"],
+                    event.get("dur", 0),
+                    event.get("args") or {},
+                )
+            )
+        elif ph == "b":
+            open_async[(cat, event.get("id"))] = event
+        elif ph == "e":
+            begin = open_async.pop((cat, event.get("id")), None)
+            if begin is not None:
+                spans.append(
+                    Span(
+                        begin["name"],
+                        cat,
+                        begin["ts"],
+                        event["ts"] - begin["ts"],
+                        begin.get("args") or {},
+                    )
+                )
+    return spans
+
+
+def aggregate(spans: List[Span], cat: str) -> List[Stats]:
+    """Group the spans of a category by name, sorted by total time"""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        if span.cat == cat:
+            durations[span.name].append(span.dur / 1000)
+    stats = [
+        Stats(name, len(times), sum(times), sum(times) / len(times), max(times))
+        for name, times in durations.items()
+    ]
+    stats.sort(key=lambda s: s.total_ms, reverse=True)
+    return stats
+
+
+def output_rates(events: List[Dict[str, Any]]) -> List[Tuple[str, int, float]]:
+    """Compute the output lines/sec of each task from the output_lines counter"""
+    samples: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    for event in events:
+        if event.get("ph") == "C" and event.get("name") == "output_lines":
+            for task, value in (event.get("args") or {}).items():
+                samples[task].append((event["ts"], value))
+    rates = []
+    for task, points in samples.items():
+        points.sort()
+        lines = points[-1][1] - points[0][1]
+        elapsed = (points[-1][0] - points[0][0]) / 1e6
+        rate = lines / elapsed if elapsed > 0 else 0.0
+        rates.append((task, int(points[-1][1]), rate))
+    rates.sort(key=lambda r: r[2], reverse=True)
+    return rates
+
+
+def print_stats(title: str, stats: List[Stats], limit: int) -> None:
+    print(title)
+    if not stats:
+        print("  (none)\n")
+        return
+    stats = stats[:limit]
+    width = max(len(s.name) for s in stats)
+    print(f"  {'name':<{width}}  {'calls':>7}  {'total':>12}  {'avg':>12}  {'max':>12}")
+    for s in stats:
+        print(
+            f"  {s.name:<{width}}  {s.calls:>7}  {s.total_ms:>10.3f}ms  {s.avg_ms:>10.3f}ms"
+            f"  {s.max_ms:>10.3f}ms"
+        )
+    print()
+
+
+def print_rates(rates: List[Tuple[str, int, float]], limit: int) -> None:
+    print("Task output")
+    if not rates:
+        print("  (none)\n")
+        return
+    rates = rates[:limit]
+    width = max(len(r[0]) for r in rates)
+    print(f"  {'task':<{width}}  {'lines':>9}  {'lines/sec':>12}")
+    for task, lines, rate in rates:
+        print(f"  {task:<{width}}  {lines:>9}  {rate:>12.1f}")
+    print()
+
+
+def main(argv: List[str]) -> None:
+    """Summarize a trace recorded with :OverseerProfile"""
+    parser = argparse.ArgumentParser(prog="main.py trace", description=main.__doc__)
+    parser.add_argument("file", help="Trace file written by :OverseerProfile save")
+    parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=10,
+        help="Number of rows to show in each table (default %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    events = load_events(args.file)
+    spans = collect_spans(events)
+    print_stats("Providers by latency", aggregate(spans, "provider"), args.limit)
+    print_stats("Slowest components", aggregate(spans, "component"), args.limit)
+    print_stats("Output parsing", aggregate(spans, "parser"), args.limit)
+    print_stats("Rendering", aggregate(spans, "render"), args.limit)
+    print_rates(output_rates(events), args.limit)
@@ -0,0 +1,191 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+import traceback
+from typing import Dict, Iterable, List, Set
+
+import generate
+
+HERE = os.path.dirname(__file__)
+ROOT = os.path.abspath(os.path.join(HERE, os.path.pardir))
+WATCH_DIRS = [os.path.join(ROOT, "lua", "overseer"), os.path.join(ROOT, "doc")]
+WATCH_FILES = [os.path.join(ROOT, "README.md")]
+# How long to wait for more events after the first one before regenerating
+DEBOUNCE_S = 0.05
+POLL_INTERVAL_S = 0.5
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal inotify wrapper using ctypes"""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("Could not find libc")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add_watch(self, path: str, recursive: bool = False) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+        if recursive:
+            for entry in os.scandir(path):
+                if entry.is_dir():
+                    self.add_watch(entry.path, True)
+
+    def read(self, timeout: float) -> List[str]:
+        """Wait up to timeout seconds and return the paths of changed files"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        buf = os.read(self.fd, 64 * 1024)
+        ret = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset : offset + length].rstrip(b"\0")
+            offset += length
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                    self.add_watch(path, True)
+                continue
+            ret.append(path)
+        return ret
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Poller:
+    """Fallback for platforms without inotify. Compares mtimes on an interval."""
+
+    def __init__(self) -> None:
+        self._roots: List[str] = []
+        self._mtimes: Dict[str, float] = {}
+
+    def add_watch(self, path: str, recursive: bool = False) -> None:
+        self._roots.append(path)
+        self._mtimes = self._scan()
+
+    def _scan(self) -> Dict[str, float]:
+        ret = {}
+        for path in WATCH_FILES:
+            if os.path.exists(path):
+                ret[path] = os.path.getmtime(path)
+        for root in self._roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    ret[path] = os.path.getmtime(path)
+        return ret
+
+    def read(self, timeout: float) -> List[str]:
+        time.sleep(min(timeout, POLL_INTERVAL_S))
+        mtimes = self._scan()
+        changed = [
+            path
+            for path in set(mtimes) | set(self._mtimes)
+            if mtimes.get(path) != self._mtimes.get(path)
+        ]
+        self._mtimes = mtimes
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def is_input(relpath: str) -> bool:
+    if relpath == "README.md":
+        return True
+    if relpath.startswith("doc" + os.sep):
+        return relpath.endswith(".md")
+    return relpath.startswith("lua" + os.sep) and relpath.endswith(".lua")
+
+
+def regenerate(paths: Iterable[str]) -> None:
+    changed: Set[str] = set()
+    lua_changed = False
+    for path in paths:
+        relpath = os.path.relpath(path, ROOT)
+        if not is_input(relpath):
+            continue
+        if relpath.endswith(".lua"):
+            lua_changed = True
+            changed.add(relpath)
+        elif generate.DOCS.refresh(path):
+            # Docs are only considered changed if someone other than us edited them
+            changed.add(relpath)
+    if not changed:
+        return
+    start = time.perf_counter()
+    if lua_changed:
+        generate.invalidate_lua_types()
+        generate.invalidate_nvim_json()
+    steps = [step.name for step in generate.steps_for_paths(changed)]
+    print(f"Changed: {', '.join(sorted(changed))} -> {', '.join(steps)}")
+    try:
+        generate.run_steps(changed)
+    except Exception:
+        traceback.print_exc()
+        # Discard the partially-applied edits
+        generate.DOCS.revert()
+        return
+    generate.flush_docs()
+    print(f"Regenerated in {1000 * (time.perf_counter() - start):.0f}ms")
+
+
+def main(use_cache: bool = True, jobs: int = 1) -> None:
+    """Watch the sources and incrementally regenerate the docs that depend on them"""
+    generate.main(use_cache=use_cache, jobs=jobs)
+    watcher: "Inotify | Poller"
+    try:
+        watcher = Inotify()
+    except OSError as e:
+        print(f"inotify unavailable ({e}), falling back to polling")
+        watcher = Poller()
+    for path in WATCH_DIRS:
+        watcher.add_watch(path, True)
+    if isinstance(watcher, Inotify):
+        watcher.add_watch(ROOT)
+    print("Watching for changes...")
+    try:
+        while True:
+            paths = watcher.read(60)
+            if not paths:
+                continue
+            # Collect the rest of a burst of events (e.g. a git checkout) into one run
+            while True:
+                more = watcher.read(DEBOUNCE_S)
+                if not more:
+                    break
+                paths.extend(more)
+            regenerate(dict.fromkeys(paths))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
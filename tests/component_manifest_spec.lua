@@ -0,0 +1,40 @@
+local component = require("overseer.component")
+local files = require("overseer.files")
+
+---@return string
+local function get_manifest_file()
+  local manifest_file =
+    vim.api.nvim_get_runtime_file("lua/overseer/component/manifest.json", false)[1]
+  assert.truthy(manifest_file, "manifest.json is missing. Run 'make doc'")
+  return manifest_file
+end
+
+describe("component manifest", function()
+  it("includes components in subdirectories", function()
+    -- A fresh checkout may give the components a newer mtime than the manifest
+    local manifest_file = get_manifest_file()
+    local now = os.time()
+    vim.uv.fs_utime(manifest_file, now, now)
+    local info = component.get_info("orchestrator.on_status_broadcast")
+    assert.truthy(info)
+    assert.equals("Broadcast this task when the status changes", info.desc)
+    component.list_editable()
+    assert.is_nil(package.loaded["overseer.component.orchestrator.on_status_broadcast"])
+    assert.is_nil(package.loaded["overseer.component.dependencies.on_success_complete_dependency"])
+  end)
+
+  it("matches the component definitions", function()
+    local manifest_file = get_manifest_file()
+    local data = files.load_json_file(manifest_file)
+    for name, entry in pairs(data.components) do
+      local relpath = name:gsub("%.", "/") .. ".lua"
+      local abspath = vim.fs.joinpath(vim.fs.dirname(manifest_file), relpath)
+      assert.equals(vim.uv.fs_stat(abspath).size, entry.size, name)
+      entry.size = nil
+    end
+    assert.truthy(data.components["orchestrator.on_status_broadcast"])
+    -- Round-trip through JSON so that the comparison is not affected by how the manifest is encoded
+    local expected = vim.json.decode(vim.json.encode(component.get_manifest_entries()))
+    assert.same(expected, data.components)
+  end)
+end)
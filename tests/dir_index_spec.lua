@@ -0,0 +1,66 @@
+local dir_index = require("overseer.dir_index")
+local files = require("overseer.files")
+
+describe("dir_index", function()
+  local root
+  before_each(function()
+    root = vim.fs.normalize(vim.fn.tempname())
+    files.mkdir(vim.fs.joinpath(root, "a", "b", "c"))
+    files.mkdir(vim.fs.joinpath(root, "a", "Makefile.d"))
+    files.write_file(vim.fs.joinpath(root, "Makefile"), "")
+    files.write_file(vim.fs.joinpath(root, "a", "b", "Makefile"), "")
+    files.write_file(vim.fs.joinpath(root, "a", "b", "justfile"), "")
+    dir_index.clear()
+  end)
+  after_each(function()
+    vim.fn.delete(root, "rf")
+  end)
+
+  it("finds the nearest match", function()
+    local ret = dir_index.find("Makefile", { path = vim.fs.joinpath(root, "a", "b", "c") })
+    assert.are.same({ vim.fs.joinpath(root, "a", "b", "Makefile") }, ret)
+  end)
+
+  it("finds multiple matches up to the limit", function()
+    local ret = dir_index.find(
+      "Makefile",
+      { path = vim.fs.joinpath(root, "a", "b", "c"), limit = math.huge }
+    )
+    assert.are.same({
+      vim.fs.joinpath(root, "a", "b", "Makefile"),
+      vim.fs.joinpath(root, "Makefile"),
+    }, ret)
+  end)
+
+  it("filters by type", function()
+    local ret = dir_index.find("b", { path = vim.fs.joinpath(root, "a"), type = "file" })
+    assert.are.same({}, ret)
+    ret = dir_index.find("Makefile.d", { path = vim.fs.joinpath(root, "a"), type = "directory" })
+    assert.are.same({ vim.fs.joinpath(root, "a", "Makefile.d") }, ret)
+  end)
+
+  it("matches with a function", function()
+    local ret = dir_index.find(function(name)
+      return name:lower() == "justfile"
+    end, { path = vim.fs.joinpath(root, "a", "b", "c") })
+    assert.are.same({ vim.fs.joinpath(root, "a", "b", "justfile") }, ret)
+  end)
+
+  it("does not search the stop directory", function()
+    local ret = dir_index.find("Makefile", {
+      path = vim.fs.joinpath(root, "a"),
+      stop = root,
+      limit = math.huge,
+    })
+    assert.are.same({}, ret)
+  end)
+
+  it("sees new files after clearing", function()
+    local dir = vim.fs.joinpath(root, "a", "b", "c")
+    assert.are.same({}, dir_index.find("Cargo.toml", { path = dir }))
+    files.write_file(vim.fs.joinpath(dir, "Cargo.toml"), "")
+    dir_index.clear(dir)
+    local ret = dir_index.find("Cargo.toml", { path = dir })
+    assert.are.same({ vim.fs.joinpath(dir, "Cargo.toml") }, ret)
+  end)
+end)
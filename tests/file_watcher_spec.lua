@@ -0,0 +1,65 @@
+local file_watcher = require("overseer.file_watcher")
+local files = require("overseer.files")
+
+describe("file_watcher", function()
+  local root
+  local watch_ids
+  before_each(function()
+    root = vim.fs.normalize(vim.fn.tempname())
+    files.mkdir(vim.fs.joinpath(root, "a", "b"))
+    files.mkdir(vim.fs.joinpath(root, "c"))
+    watch_ids = {}
+  end)
+  after_each(function()
+    for _, id in ipairs(watch_ids) do
+      file_watcher.unwatch(id)
+    end
+    vim.cmd.bwipeout({ bang = true })
+    vim.fn.delete(root, "rf")
+  end)
+
+  ---@param paths? string[]
+  ---@return table counter
+  local function watch(paths)
+    local counter = { calls = 0 }
+    local id = file_watcher.watch({ paths = paths, mode = "autocmd" }, function()
+      counter.calls = counter.calls + 1
+    end)
+    table.insert(watch_ids, id)
+    return counter
+  end
+
+  ---@param path string
+  local function write(path)
+    vim.cmd.edit({ args = { path } })
+    vim.api.nvim_buf_set_lines(0, 0, -1, true, { "foo" })
+    vim.cmd.write()
+  end
+
+  it("notifies only watchers of matching paths", function()
+    local parent = watch({ vim.fs.joinpath(root, "a") })
+    local child = watch({ vim.fs.joinpath(root, "a", "b") })
+    local sibling = watch({ vim.fs.joinpath(root, "c") })
+    local all = watch()
+    write(vim.fs.joinpath(root, "a", "b", "foo.txt"))
+    vim.wait(1000, function()
+      return all.calls > 0
+    end)
+    assert.equals(1, parent.calls)
+    assert.equals(1, child.calls)
+    assert.equals(0, sibling.calls)
+    assert.equals(1, all.calls)
+  end)
+
+  it("stops notifying after unwatch", function()
+    local counter = watch({ root })
+    local other = watch({ root })
+    file_watcher.unwatch(table.remove(watch_ids, 1))
+    write(vim.fs.joinpath(root, "foo.txt"))
+    vim.wait(1000, function()
+      return other.calls > 0
+    end)
+    assert.equals(0, counter.calls)
+    assert.equals(1, other.calls)
+  end)
+end)
@@ -0,0 +1,57 @@
+local file_writer = require("overseer.file_writer")
+local files = require("overseer.files")
+
+---@param writer overseer.FileWriter
+local function close_and_wait(writer)
+  local closed = false
+  writer:close(function()
+    closed = true
+  end)
+  vim.wait(1000, function()
+    return closed
+  end)
+end
+
+describe("file_writer", function()
+  local root
+  before_each(function()
+    root = vim.fs.normalize(vim.fn.tempname())
+    files.mkdir(root)
+  end)
+  after_each(function()
+    vim.fn.delete(root, "rf")
+  end)
+
+  it("writes buffered data on close", function()
+    local filename = vim.fs.joinpath(root, "out.log")
+    local writer = file_writer.new(filename)
+    writer:write("foo")
+    writer:write("bar\n")
+    close_and_wait(writer)
+    assert.equals("foobar\n", files.read_file(filename))
+  end)
+
+  it("discards data on truncate", function()
+    local filename = vim.fs.joinpath(root, "out.log")
+    local writer = file_writer.new(filename, { flush_bytes = 1 })
+    writer:write("foo")
+    writer:truncate()
+    writer:write("bar")
+    close_and_wait(writer)
+    assert.equals("bar", files.read_file(filename))
+  end)
+
+  it("rotates files", function()
+    local filename = vim.fs.joinpath(root, "out.log")
+    local writer = file_writer.new(filename, { flush_bytes = 1, max_size = 4, max_files = 2 })
+    writer:write("aaaa")
+    writer:write("bbbb")
+    writer:write("cccc")
+    writer:write("dd")
+    close_and_wait(writer)
+    assert.equals("dd", files.read_file(filename))
+    assert.equals("cccc", files.read_file(filename .. ".1"))
+    assert.equals("bbbb", files.read_file(filename .. ".2"))
+    assert.is_false(files.exists(filename .. ".3"))
+  end)
+end)
@@ -46,4 +46,42 @@ describe("json", function()
     local ret = json.decode([[{"foo": null}]])
     assert.are.same({}, ret)
   end)
+
+  it("parses json with block comments", function()
+    local ret = json.decode([[{"foo": /* comment */ "bar",
+    /* multi
+       line comment */
+    "baz": 3}]])
+    assert.are.same({ foo = "bar", baz = 3 }, ret)
+  end)
+
+  it("parses json with trailing commas followed by comments", function()
+    local ret = json.decode([[{"foo": ["bar", "baz", // comment
+    /* comment */ ], "qux": 3, /* comment */ }]])
+    assert.are.same({ foo = { "bar", "baz" }, qux = 3 }, ret)
+  end)
+
+  it("does not strip comment markers or commas inside strings", function()
+    local ret = json.decode([[{"foo": "http://example.com/*", "bar": ",]", "baz": "\"//"}]])
+    assert.are.same({ foo = "http://example.com/*", bar = ",]", baz = '"//' }, ret)
+  end)
+
+  it("preserves offsets when stripping", function()
+    local content = '{"foo": 1, // comment\n/* a\nb */ "bar": [1,],}'
+    local stripped = json.strip(content)
+    assert.equals(content:len(), stripped:len())
+    assert.equals(select(2, content:gsub("\n", "")), select(2, stripped:gsub("\n", "")))
+  end)
+
+  it("reports the line and column of errors", function()
+    local ok, err = pcall(json.decode, '{"foo": 1,\n  // comment\n  "bar": }')
+    assert.falsy(ok)
+    assert.truthy(err:match("%(line 3, column %d+%)$"))
+  end)
+
+  it("reports unterminated block comments", function()
+    local ok, err = pcall(json.decode, '{"foo": 1,\n /* comment')
+    assert.falsy(ok)
+    assert.equals("Unterminated block comment (line 2, column 2)", err)
+  end)
 end)
@@ -0,0 +1,198 @@
+local OrchestratorStrategy = require("overseer.strategy.orchestrator")
+local config = require("overseer.config")
+local overseer = require("overseer")
+local scheduler = require("overseer.scheduler")
+local task_list = require("overseer.task_list")
+
+---@param name string
+---@param cmd string[]
+---@return table
+local function subtask(name, cmd)
+  return { name = name, cmd = cmd, strategy = { "jobstart", use_terminal = false } }
+end
+
+---@param tasks table
+---@param max_parallel? integer
+---@return overseer.Task
+local function start_orchestrator(tasks, max_parallel)
+  local task = overseer.new_task({
+    name = "orchestrator",
+    strategy = { "orchestrator", tasks = tasks, max_parallel = max_parallel },
+  })
+  task:start()
+  return task
+end
+
+---@param name string
+---@return overseer.Task
+local function get_task(name)
+  return task_list.list_tasks({
+    include_ephemeral = true,
+    filter = function(task)
+      return task.name == name
+    end,
+  })[1]
+end
+
+---@return integer
+local function num_running_jobs()
+  local running = task_list.list_tasks({ include_ephemeral = true, status = "RUNNING" })
+  return #vim.tbl_filter(function(task)
+    return task.strategy.name ~= "orchestrator"
+  end, running)
+end
+
+---Wait for the tasks to complete, recording the highest number of jobs running at the same time
+---@param tasks overseer.Task[]
+---@return integer
+local function wait_complete(tasks)
+  local max_running = 0
+  local done = vim.wait(10000, function()
+    max_running = math.max(max_running, num_running_jobs())
+    return vim.iter(tasks):all(function(task)
+      return task:is_complete()
+    end)
+  end, 5)
+  assert.truthy(done, "Timed out waiting for tasks to complete")
+  return max_running
+end
+
+describe("orchestrator", function()
+  before_each(function()
+    config.setup({ max_parallel = 0 })
+  end)
+  after_each(function()
+    for _, task in ipairs(task_list.list_tasks({ include_ephemeral = true })) do
+      task:dispose(true)
+    end
+    config.setup({})
+  end)
+
+  it("prioritizes the tasks on the longest chain", function()
+    local strategy = OrchestratorStrategy.new({
+      tasks = {
+        { { task = subtask("a", { "true" }), id = "a" }, subtask("b", { "true" }) },
+        { { task = subtask("c", { "true" }), after = { "a" } } },
+        subtask("d", { "true" }),
+      },
+    })
+    local priorities = vim.tbl_map(function(node)
+      return node.priority
+    end, strategy.nodes)
+    assert.same({ 3, 1, 2, 1 }, priorities)
+    strategy:dispose()
+  end)
+
+  it("rejects a max_parallel less than 1", function()
+    assert.has_error(function()
+      OrchestratorStrategy.new({ tasks = { subtask("a", { "true" }) }, max_parallel = 0 })
+    end)
+  end)
+
+  it("starts tasks as soon as the tasks in 'after' succeed", function()
+    local task = start_orchestrator({
+      { { task = subtask("a", { "true" }), id = "a" }, subtask("b", { "sleep", "2" }) },
+      { { task = subtask("c", { "true" }), after = { "a" } } },
+    })
+    local done = vim.wait(5000, function()
+      local c = get_task("c")
+      return c ~= nil and c:is_complete()
+    end, 5)
+    assert.truthy(done)
+    assert.equals("SUCCESS", get_task("c").status)
+    assert.equals("RUNNING", get_task("b").status)
+    wait_complete({ task })
+    assert.equals("SUCCESS", task.status)
+  end)
+
+  it("limits the number of tasks running in an orchestrator", function()
+    local task = start_orchestrator({
+      {
+        subtask("a", { "sleep", "0.1" }),
+        subtask("b", { "sleep", "0.1" }),
+        subtask("c", { "sleep", "0.1" }),
+        subtask("d", { "sleep", "0.1" }),
+      },
+    }, 2)
+    assert.equals(2, wait_complete({ task }))
+    assert.equals("SUCCESS", task.status)
+  end)
+
+  it("limits the number of tasks running across orchestrators", function()
+    config.max_parallel = 1
+    local task1 = start_orchestrator({
+      { subtask("a", { "sleep", "0.1" }), subtask("b", { "sleep", "0.1" }) },
+    })
+    local task2 = start_orchestrator({
+      { subtask("c", { "sleep", "0.1" }), subtask("d", { "sleep", "0.1" }) },
+    })
+    assert.equals(1, wait_complete({ task1, task2 }))
+    assert.equals("SUCCESS", task1.status)
+    assert.equals("SUCCESS", task2.status)
+  end)
+
+  it("does not deadlock with nested orchestrators", function()
+    config.max_parallel = 1
+    local nested = {
+      name = "nested",
+      strategy = {
+        "orchestrator",
+        tasks = { { subtask("a", { "sleep", "0.1" }), subtask("b", { "sleep", "0.1" }) } },
+      },
+    }
+    local task = start_orchestrator({ { nested, subtask("c", { "sleep", "0.1" }) } })
+    assert.equals(1, wait_complete({ task }))
+    assert.equals("SUCCESS", task.status)
+  end)
+
+  it("cancels queued tasks when a task fails", function()
+    config.max_parallel = 1
+    local task = start_orchestrator({
+      { subtask("fail", { "false" }), subtask("queued", { "true" }) },
+    })
+    wait_complete({ task })
+    assert.equals("FAILURE", task.status)
+    local queued = get_task("queued")
+    assert.equals("PENDING", queued.status)
+    assert.falsy(scheduler.is_queued(queued.id))
+    -- Make sure that the queue doesn't start it later
+    vim.wait(100)
+    assert.equals("PENDING", queued.status)
+  end)
+
+  it("can be reset and run again", function()
+    config.max_parallel = 1
+    local task = start_orchestrator({
+      { subtask("a", { "sleep", "0.5" }), subtask("b", { "sleep", "0.5" }) },
+    })
+    assert.truthy(vim.wait(5000, function()
+      return num_running_jobs() == 1
+    end, 5))
+    task:stop()
+    task:reset()
+    for _, name in ipairs({ "a", "b" }) do
+      local sub = get_task(name)
+      assert.equals("PENDING", sub.status)
+      assert.falsy(scheduler.is_queued(sub.id))
+    end
+    task:start()
+    wait_complete({ task })
+    assert.equals("SUCCESS", task.status)
+  end)
+
+  it("disposes the tasks it started", function()
+    config.max_parallel = 1
+    local task = start_orchestrator({
+      { subtask("a", { "sleep", "0.5" }), subtask("b", { "sleep", "0.5" }) },
+    })
+    assert.truthy(vim.wait(5000, function()
+      return num_running_jobs() == 1
+    end, 5))
+    local subtasks = { get_task("a"), get_task("b") }
+    task:dispose(true)
+    for _, sub in ipairs(subtasks) do
+      assert.truthy(sub:is_disposed())
+      assert.falsy(scheduler.is_queued(sub.id))
+    end
+  end)
+end)
@@ -0,0 +1,34 @@
+local output_batcher = require("overseer.output_batcher")
+
+describe("output_batcher", function()
+  it("merges jobstart output chunks", function()
+    local ret = output_batcher.merge_job_data({ { "foo" }, { "bar", "baz" }, { "", "qux" } })
+    assert.are.same({ "foobar", "baz", "qux" }, ret)
+  end)
+
+  it("flushes all collected chunks at once", function()
+    local flushed = {}
+    local batcher = output_batcher.new(function(chunks)
+      table.insert(flushed, chunks)
+    end)
+    batcher:push("foo", 3)
+    batcher:push("bar\n", 4)
+    assert.are.same({}, flushed)
+    batcher:flush()
+    assert.are.same({ { "foo", "bar\n" } }, flushed)
+    batcher:flush()
+    assert.are.same({ { "foo", "bar\n" } }, flushed)
+  end)
+
+  it("flushes after a delay", function()
+    local flushed = {}
+    local batcher = output_batcher.new(function(chunks)
+      vim.list_extend(flushed, chunks)
+    end)
+    batcher:push("foo", 3)
+    vim.wait(1000, function()
+      return not vim.tbl_isempty(flushed)
+    end)
+    assert.are.same({ "foo" }, flushed)
+  end)
+end)
@@ -0,0 +1,77 @@
+local output_pager = require("overseer.output_pager")
+local output_store = require("overseer.output_store")
+
+---@param n integer
+---@return string[]
+local function make_lines(n)
+  local ret = {}
+  for i = 1, n do
+    table.insert(ret, tostring(i))
+  end
+  return ret
+end
+
+describe("output_pager", function()
+  local bufnr, store
+  before_each(function()
+    bufnr = vim.api.nvim_create_buf(false, true)
+    store = output_store.new(10)
+  end)
+  after_each(function()
+    store:clear()
+    vim.api.nvim_buf_delete(bufnr, { force = true })
+  end)
+
+  ---@param lines string[]
+  local function append(lines)
+    store:append(lines)
+    vim.api.nvim_buf_set_lines(bufnr, 0, -1, true, vim.list_extend({}, lines))
+  end
+
+  it("trims lines from the top of the buffer", function()
+    local pager = output_pager.new(bufnr, store, 5)
+    append(make_lines(20))
+    pager:trim()
+    assert.same({ "16", "17", "18", "19", "20" }, vim.api.nvim_buf_get_lines(bufnr, 0, -1, true))
+    assert.equals(15, pager:get_num_hidden())
+  end)
+
+  it("loads earlier lines from the store", function()
+    local pager = output_pager.new(bufnr, store, 5)
+    append(make_lines(20))
+    pager:trim()
+    pager:load_earlier()
+    assert.same(make_lines(20), vim.api.nvim_buf_get_lines(bufnr, 0, -1, true))
+    assert.equals(0, pager:get_num_hidden())
+  end)
+
+  it("does not load lines that the store lost", function()
+    local tempname = vim.fn.tempname
+    vim.fn.tempname = function()
+      return "/nonexistent/overseer/spill"
+    end
+    local ok, err = pcall(function()
+      local pager = output_pager.new(bufnr, store, 5)
+      append(make_lines(20))
+      pager:trim()
+      pager:load_earlier()
+      assert.same(
+        vim.list_slice(make_lines(20), 11, 20),
+        vim.api.nvim_buf_get_lines(bufnr, 0, -1, true)
+      )
+      assert.equals(10, pager:get_num_hidden())
+    end)
+    vim.fn.tempname = tempname
+    assert(ok, err)
+  end)
+
+  it("does not trim lines that are visible in a window", function()
+    local pager = output_pager.new(bufnr, store, 5)
+    append(make_lines(20))
+    vim.api.nvim_win_set_buf(0, bufnr)
+    vim.api.nvim_win_set_cursor(0, { 1, 0 })
+    pager:trim()
+    assert.equals(20, vim.api.nvim_buf_line_count(bufnr))
+    assert.equals(0, pager:get_num_hidden())
+  end)
+end)
@@ -0,0 +1,92 @@
+local output_store = require("overseer.output_store")
+
+---@param n integer
+---@return string[]
+local function make_lines(n)
+  local lines = {}
+  for i = 1, n do
+    table.insert(lines, string.format("line %d", i))
+  end
+  return lines
+end
+
+---@param store overseer.OutputStore
+---@return string[]
+local function collect(store)
+  local ret = {}
+  for line in store:iter() do
+    table.insert(ret, line)
+  end
+  return ret
+end
+
+describe("output_store", function()
+  it("keeps lines in memory up to the limit", function()
+    local store = output_store.new(10)
+    store:append(make_lines(5))
+    assert.equals(5, store:line_count())
+    assert.are.same(make_lines(5), store:get_lines(0, -1))
+    assert.are.same(make_lines(5), collect(store))
+  end)
+
+  it("spills older lines to disk", function()
+    local store = output_store.new(10)
+    local lines = make_lines(3000)
+    for i = 1, #lines, 7 do
+      store:append(vim.list_slice(lines, i, i + 6))
+    end
+    assert.equals(3000, store:line_count())
+    assert.are.same(lines, store:get_lines(0, -1))
+    assert.are.same(lines, collect(store))
+    assert.are.same(vim.list_slice(lines, 1500, 2995), store:get_lines(1499, 2995))
+    assert.are.same({ "line 2991", "line 2992" }, store:get_lines(2990, 2992))
+    store:clear()
+  end)
+
+  it("iterates over lines in chunks", function()
+    local store = output_store.new(10)
+    local lines = make_lines(25)
+    store:append(lines)
+    local chunks = {}
+    for chunk in store:iter_chunks(10) do
+      table.insert(chunks, chunk)
+    end
+    assert.are.same({
+      vim.list_slice(lines, 1, 10),
+      vim.list_slice(lines, 11, 20),
+      vim.list_slice(lines, 21, 25),
+    }, chunks)
+    store:clear()
+  end)
+
+  it("keeps line numbers stable when the spill file can't be opened", function()
+    local tempname = vim.fn.tempname
+    local num_calls = 0
+    vim.fn.tempname = function()
+      num_calls = num_calls + 1
+      return "/nonexistent/overseer/spill"
+    end
+    local store = output_store.new(10)
+    local ok, err = pcall(store.append, store, make_lines(25))
+    vim.fn.tempname = tempname
+    assert(ok, err)
+    assert.equals(1, num_calls)
+    assert.equals(25, store:line_count())
+    assert.equals(15, store:first_line())
+    assert.are.same(vim.list_slice(make_lines(25), 16, 25), store:get_lines(0, -1))
+    assert.are.same({ "line 18", "line 19" }, store:get_lines(17, 19))
+    assert.are.same(vim.list_slice(make_lines(25), 16, 25), collect(store))
+    store:clear()
+    assert.equals(0, store:first_line())
+  end)
+
+  it("clears all lines", function()
+    local store = output_store.new(10)
+    store:append(make_lines(50))
+    store:clear()
+    assert.equals(0, store:line_count())
+    assert.are.same({}, collect(store))
+    store:append({ "foo" })
+    assert.are.same({ "foo" }, store:get_lines(0, -1))
+  end)
+end)
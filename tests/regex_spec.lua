@@ -0,0 +1,108 @@
+local parselib = require("overseer.parselib")
+local regex = require("overseer.regex")
+
+describe("regex", function()
+  describe("vim_regex_literals", function()
+    it("extracts required literals", function()
+      local ret = regex.vim_regex_literals(
+        "\\v^([^[:space:]].*)[\\(:](\\d+)[,:](\\d+)%(\\):\\s+|\\s+-\\s+)(error|warning|info)\\s+TS(\\d+)\\s*:\\s*(.*)$"
+      )
+      assert.are.same({ "TS", ":" }, ret)
+    end)
+
+    it("drops optional characters", function()
+      assert.are.same({ "warnin", ": " }, regex.vim_regex_literals("\\vwarning?: (.*)"))
+      assert.are.same({ "ab", "c" }, regex.vim_regex_literals("\\vab+c"))
+    end)
+
+    it("returns nothing for top-level alternation", function()
+      assert.are.same({}, regex.vim_regex_literals("\\verror: (.*)|warning: (.*)"))
+    end)
+
+    it("returns nothing for \\_ atoms", function()
+      assert.are.same({}, regex.vim_regex_literals("\\v^foo\\_s+bar"))
+      assert.is_nil(regex.vim_regex_to_lua("\\v^(foo)\\_s+bar"))
+    end)
+
+    it("returns nothing for regexes that aren't very magic", function()
+      assert.are.same({}, regex.vim_regex_literals("^error: \\(.*\\)"))
+    end)
+  end)
+
+  describe("lua_pattern_literals", function()
+    it("extracts required literals", function()
+      assert.are.same(
+        { "File change detected. Starting incremental compilation..." },
+        regex.lua_pattern_literals("File change detected%. Starting incremental compilation%.%.%.$")
+      )
+      assert.are.same({ ":", ": " }, regex.lua_pattern_literals("^(%S+):(%d+):(%d+): (.+)$"))
+    end)
+  end)
+
+  describe("vim_regex_to_lua", function()
+    it("translates simple regexes", function()
+      assert.equals(
+        "^([^ \t]+)%:(%d+)%:(%d+)%: (.+)$",
+        regex.vim_regex_to_lua("\\v^(\\S+):(\\d+):(\\d+): (.+)$")
+      )
+      assert.equals("^(.-)%:(.*)$", regex.vim_regex_to_lua("\\v^(.{-}):(.*)$"))
+    end)
+
+    it("does not translate unsupported regexes", function()
+      assert.is_nil(regex.vim_regex_to_lua("\\v^(error|warning): (.*)$"))
+      assert.is_nil(regex.vim_regex_to_lua("\\v^(\\d+)?: (.*)$"))
+      assert.is_nil(regex.vim_regex_to_lua("\\v^error: .*$"))
+      assert.is_nil(regex.vim_regex_to_lua("\\v<(\\w+)>"))
+    end)
+  end)
+
+  describe("make_regex_match_fn", function()
+    it("matches the same as matchlist", function()
+      local pattern = "\\v^(\\S+):(\\d+):(\\d+): (.+)$"
+      local match = parselib.make_regex_match_fn(pattern)
+      for _, line in ipairs({
+        "foo.c:12:3: error: bad thing",
+        "foo.c:12: error: bad thing",
+        "   compiling foo.c",
+        "",
+      }) do
+        local expected = vim.fn.matchlist(line, pattern)
+        if vim.tbl_isempty(expected) then
+          assert.is_nil(match(line))
+        else
+          assert.are.same(vim.list_slice(expected, 2, 5), match(line))
+        end
+      end
+    end)
+
+    it("matches the same as matchlist with \\_ atoms", function()
+      for _, pattern in ipairs({ "\\v^foo\\_s+bar", "\\v^(foo)\\_s+(bar)" }) do
+        local match = parselib.make_regex_match_fn(pattern)
+        for _, line in ipairs({ "foo bar", "foo_s bar", "foobar" }) do
+          local expected = vim.fn.matchlist(line, pattern)
+          if vim.tbl_isempty(expected) then
+            assert.is_nil(match(line))
+          else
+            assert.is_not_nil(match(line))
+          end
+        end
+      end
+      local match = parselib.make_regex_match_fn("\\v^(foo)\\_s+(bar)")
+      assert.are.same({ "foo", "bar" }, match("foo \tbar"))
+    end)
+
+    it("matches non-ASCII literals in any case with 'ignorecase'", function()
+      local ignorecase = vim.o.ignorecase
+      vim.o.ignorecase = true
+      local pattern = "\\v^Ошибка: (.*)$"
+      local match = parselib.make_regex_match_fn(pattern)
+      local line = "ОШИБКА: file not found"
+      local ok, err = pcall(function()
+        assert.are.same({ "file not found" }, vim.list_slice(vim.fn.matchlist(line, pattern), 2, 2))
+        assert.are.same({ "file not found" }, match(line))
+      end)
+      vim.o.ignorecase = ignorecase
+      assert(ok, err)
+    end)
+  end)
+end)
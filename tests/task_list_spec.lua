@@ -0,0 +1,50 @@
+local Task = require("overseer.task")
+local task_list = require("overseer.task_list")
+
+describe("task_list", function()
+  local tasks
+  before_each(function()
+    tasks = {}
+    for i = 1, 3 do
+      local task = Task.new({ name = "task" .. i, cmd = { "true" } })
+      task_list.touch(task)
+      table.insert(tasks, task)
+    end
+  end)
+  after_each(function()
+    for _, task in ipairs(tasks) do
+      task:dispose(true)
+    end
+  end)
+
+  it("does not keep views for custom sort functions", function()
+    task_list.list_tasks()
+    local num_views = task_list.get_num_views()
+    for _ = 1, 100 do
+      task_list.list_tasks({
+        sort = function(a, b)
+          return a.id > b.id
+        end,
+      })
+    end
+    assert.equals(num_views, task_list.get_num_views())
+  end)
+
+  it("sorts with custom sort functions on demand", function()
+    local rank = { [tasks[1].id] = 3, [tasks[2].id] = 1, [tasks[3].id] = 2 }
+    local function sort(a, b)
+      return rank[a.id] < rank[b.id]
+    end
+    local names = vim.tbl_map(function(task)
+      return task.name
+    end, task_list.list_tasks({ sort = sort }))
+    assert.same({ "task2", "task3", "task1" }, names)
+
+    -- The sort reads data that the task list doesn't know about, so it must re-sort every time
+    rank[tasks[1].id] = 0
+    names = vim.tbl_map(function(task)
+      return task.name
+    end, task_list.list_tasks({ sort = sort }))
+    assert.same({ "task1", "task2", "task3" }, names)
+  end)
+end)
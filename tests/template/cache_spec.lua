@@ -0,0 +1,72 @@
+local files = require("overseer.files")
+local template_cache = require("overseer.template_cache")
+
+---@param name string
+---@return overseer.TemplateProvider
+local function make_provider(name)
+  return {
+    name = name,
+    generator = function()
+      return {}
+    end,
+    serialize = template_cache.serialize_static,
+    deserialize = template_cache.deserialize_static,
+  }
+end
+
+describe("template cache", function()
+  local cache_key
+  before_each(function()
+    cache_key = vim.fn.tempname()
+    files.write_file(cache_key, "all:\n\techo hi\n")
+  end)
+  after_each(function()
+    files.delete_file(cache_key)
+  end)
+
+  it("restores templates from disk", function()
+    local provider = make_provider("cache_test_restore")
+    template_cache.store(provider, cache_key, {
+      {
+        name = "make all",
+        builder = function()
+          return { cmd = { "make", "all" }, cwd = "/tmp" }
+        end,
+      },
+    })
+    local tmpls = assert(template_cache.load(provider, cache_key))
+    assert.equals(1, #tmpls)
+    assert.equals("make all", tmpls[1].name)
+    assert.are.same({ cmd = { "make", "all" }, cwd = "/tmp" }, tmpls[1].builder({}))
+    template_cache.clear(provider, cache_key)
+    assert.is_nil(template_cache.load(provider, cache_key))
+  end)
+
+  it("discards entries when the cache_key file changes", function()
+    local provider = make_provider("cache_test_stale")
+    template_cache.store(provider, cache_key, {
+      {
+        name = "make all",
+        builder = function()
+          return { cmd = { "make", "all" } }
+        end,
+      },
+    })
+    files.write_file(cache_key, "all:\n\techo hello\n")
+    assert.is_nil(template_cache.load(provider, cache_key))
+  end)
+
+  it("does not store templates that cannot be serialized", function()
+    local provider = make_provider("cache_test_params")
+    template_cache.store(provider, cache_key, {
+      {
+        name = "make all",
+        params = { target = { type = "string" } },
+        builder = function(params)
+          return { cmd = { "make", params.target } }
+        end,
+      },
+    })
+    assert.is_nil(template_cache.load(provider, cache_key))
+  end)
+end)
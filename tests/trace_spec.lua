@@ -0,0 +1,81 @@
+local files = require("overseer.files")
+local trace = require("overseer.trace")
+
+---@return table
+local function save()
+  local filename = vim.fn.tempname()
+  trace.save(filename)
+  local data = files.load_json_file(filename)
+  vim.uv.fs_unlink(filename)
+  return data
+end
+
+describe("trace", function()
+  before_each(function()
+    trace.start()
+  end)
+  after_each(function()
+    trace.stop()
+  end)
+
+  it("does nothing when disabled", function()
+    trace.stop()
+    assert.is_nil(trace.begin("span", "test"))
+    assert.is_nil(trace.begin_async("span", "test"))
+    trace.finish(trace.begin("span", "test"))
+    trace.counter("counter", { value = 1 })
+    assert.equals(0, trace.num_events())
+  end)
+
+  it("records spans as complete events", function()
+    local span = trace.begin("span", "test", { a = 1 })
+    trace.finish(span, { b = 2 })
+    local events = save().traceEvents
+    assert.equals(1, #events)
+    local event = events[1]
+    assert.equals("X", event.ph)
+    assert.equals("span", event.name)
+    assert.equals("test", event.cat)
+    assert.truthy(event.dur >= 0)
+    assert.same({ a = 1, b = 2 }, event.args)
+  end)
+
+  it("records async spans as begin/end pairs", function()
+    local span1 = trace.begin_async("span1", "test")
+    local span2 = trace.begin_async("span2", "test")
+    trace.finish(span2)
+    trace.finish(span1, { done = true })
+    local events = save().traceEvents
+    assert.equals(4, #events)
+    assert.same(
+      { "b", "e", "b", "e" },
+      vim.tbl_map(function(event)
+        return event.ph
+      end, events)
+    )
+    assert.equals("span2", events[1].name)
+    assert.equals(events[1].id, events[2].id)
+    assert.equals("span1", events[3].name)
+    assert.equals(events[3].id, events[4].id)
+    assert.are_not.equal(events[1].id, events[3].id)
+    assert.same({ done = true }, events[3].args)
+    assert.truthy(events[4].ts >= events[3].ts)
+  end)
+
+  it("records counters", function()
+    trace.counter("output_lines", { task = 10 })
+    local data = save()
+    assert.equals(1, #data.traceEvents)
+    local event = data.traceEvents[1]
+    assert.equals("C", event.ph)
+    assert.equals("output_lines", event.name)
+    assert.same({ task = 10 }, event.args)
+    assert.equals(0, data.otherData.dropped_events)
+  end)
+
+  it("discards events when restarted", function()
+    trace.counter("counter", { value = 1 })
+    trace.start()
+    assert.equals(0, trace.num_events())
+  end)
+end)